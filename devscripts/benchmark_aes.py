@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compare the throughput of the AES-CBC decryption backends with the pure Python implementation
+"""
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import contextlib
+import random
+import timeit
+
+from yt_dlp.aes import _CBC_DECRYPT_BACKENDS, _tbox_cbc_decrypt, aes_cbc_decrypt, aes_cbc_decrypt_bytes
+
+
+def throughput(func, size, repeat):
+    data, key, iv = random.randbytes(size), random.randbytes(16), random.randbytes(16)
+    best = min(timeit.repeat(lambda: func(data, key, iv), number=1, repeat=repeat))
+    return size / best / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs of each backend (default: %(default)s)')
+    args = parser.parse_args()
+
+    # The slower implementations decrypt less data, so that the benchmark stays short
+    backends = [
+        ('reference', lambda *args: aes_cbc_decrypt(*map(list, args)), 16 * 256),
+        ('tbox', _tbox_cbc_decrypt, 16 * 4096),
+    ]
+    for name, get_backend in _CBC_DECRYPT_BACKENDS.items():
+        with contextlib.suppress(Exception):
+            if backend := get_backend():
+                backends.append((name, backend, 16 * 65536))
+    backends.append(('selected', aes_cbc_decrypt_bytes, 16 * 65536))
+
+    for name, func, size in backends:
+        print(f'{name:>12}: {throughput(func, size, args.repeat):10.2f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
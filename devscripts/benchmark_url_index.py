@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare finding the extractor for a URL by trying every extractor in turn
+with going through the URL index, over the URLs of the extractor tests
+
+Run with YTDLP_NO_LAZY_EXTRACTORS=1 to include the cost of deriving the index from the regexes
+"""
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import time
+
+from test.helper import gettestcases
+from yt_dlp.extractor import gen_extractor_classes
+from yt_dlp.extractor._url_index import URLIndex
+from yt_dlp.globals import LAZY_EXTRACTORS
+
+
+def linear_match(ies, url):
+    return next(ie_key for ie_key, ie in ies.items() if ie.suitable(url))
+
+
+def indexed_match(ies, index, url):
+    return next(ie_key for ie_key in index.candidates(url) if ies[ie_key].suitable(url))
+
+
+def timed(func, urls):
+    start = time.perf_counter()
+    for url in urls:
+        func(url)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='Number of passes over the URLs (default: %(default)s)')
+    parser.add_argument('--generic', type=int, default=1000,
+                        help='Number of URLs of unknown sites added to the corpus (default: %(default)s)')
+    args = parser.parse_args()
+
+    ies = {ie.ie_key(): ie for ie in gen_extractor_classes()}
+    urls = [tc['url'] for tc in gettestcases(include_onlymatching=True)]
+    urls += [f'https://cdn{i}.example.com/media/{i}.mp4' for i in range(args.generic)]
+    print(f'{len(ies)} extractors, {len(urls)} URLs, lazy extractors: {bool(LAZY_EXTRACTORS.value)}')
+
+    # Compiling the regexes is a one-time cost of the linear scan, keep it out of the measurement
+    timed(lambda url: linear_match(ies, url), urls[:1] + urls[-1:])
+
+    start = time.perf_counter()
+    index = URLIndex(ies)
+    print(f'Index built in {(time.perf_counter() - start) * 1000:.1f}ms')
+
+    mismatches = [url for url in urls if linear_match(ies, url) != indexed_match(ies, index, url)]
+    if mismatches:
+        sys.exit('The index selects a different extractor for:\n' + '\n'.join(mismatches))
+
+    for name, func in (
+        ('linear', lambda url: linear_match(ies, url)),
+        ('indexed', lambda url: indexed_match(ies, index, url)),
+    ):
+        best = min(timed(func, urls) for _ in range(args.repeat))
+        print(f'{name:>8}: {best / len(urls) * 1e6:8.1f}us per URL')
+
+
+if __name__ == '__main__':
+    main()
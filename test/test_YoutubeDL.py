@@ -13,19 +13,26 @@
 
 import contextlib
 import copy
+import io
 import json
+import tempfile
+import threading
+import time
 
 from test.helper import FakeYDL, assertRegexpMatches, try_rm
 from yt_dlp import YoutubeDL
 from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.networking.exceptions import TransportError
 from yt_dlp.postprocessor.common import PostProcessor
 from yt_dlp.utils import (
+    ExistingVideoReached,
     ExtractorError,
     LazyList,
     OnDemandPagedList,
     int_or_none,
     match_filter_func,
 )
+from yt_dlp.utils.progress import CombinedProgress
 from yt_dlp.utils.traversal import traverse_obj
 
 TEST_URL = 'http://localhost/sample.mp4'
@@ -60,6 +67,52 @@ def _make_result(formats, **kwargs):
     return res
 
 
+class ConcurrencyYDL(FakeYDL):
+    """Records how many tasks run at the same time and whether the post-processors ran"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = self.max_running = 0
+        self.lock = threading.Lock()
+        self.postprocessed = False
+
+    @classmethod
+    def create(cls, extractors=(), **params):
+        ydl = cls({
+            'outtmpl': 'testfile.%(ext)s',
+            'overwrites': True,
+            'writeinfojson': False,
+            **params,
+        })
+        for ie in extractors:
+            ydl.add_info_extractor(ie(ydl))
+        ydl.add_post_processor(RecordingPP(ydl))
+        return ydl
+
+    def to_screen(self, *args, **kwargs):
+        pass
+
+    @contextlib.contextmanager
+    def running_task(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def record_postprocessing(self, info):
+        self.postprocessed = True
+
+
+class RecordingPP(PostProcessor):
+    def run(self, info):
+        self._downloader.record_postprocessing(info)
+        return [], info
+
+
 class TestFormatSelection(unittest.TestCase):
     def test_prefer_free_formats(self):
         # Same resolution => download webm
@@ -1099,6 +1152,51 @@ def test_selection(params, expected_ids, evaluate_all=False):
         test_selection({'playlist_items': '-15::2'}, INDICES[1::2], True)
         test_selection({'playlist_items': '-15::15'}, [], True)
 
+    def test_sync_playlists(self):
+        PAGE_SIZE = 3
+
+        def get_downloaded_ids(cachedir, ids, **params):
+            pages = []
+
+            def page_func(n):
+                pages.append(n)
+                for i in ids[PAGE_SIZE * n: PAGE_SIZE * (n + 1)]:
+                    yield {'id': str(i), 'title': str(i), 'url': TEST_URL}
+
+            ydl = YDL({'cachedir': cachedir, 'sync_playlists': True, **params})
+            ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'test',
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+                'entries': OnDemandPagedList(page_func, PAGE_SIZE),
+            })
+            return [int(info['id']) for info in ydl.downloaded_info_dicts], pages
+
+        with tempfile.TemporaryDirectory() as cachedir:
+            self.assertEqual(get_downloaded_ids(cachedir, range(10, 0, -1)), (list(range(10, 0, -1)), [0, 1, 2, 3]))
+            # An unchanged playlist costs a single page
+            self.assertEqual(get_downloaded_ids(cachedir, range(10, 0, -1)), ([], [0]))
+            self.assertEqual(get_downloaded_ids(cachedir, range(14, 0, -1)), ([14, 13, 12, 11], [0, 1]))
+            # The entry that was removed is not the only one remembered
+            self.assertEqual(get_downloaded_ids(cachedir, [15, *range(13, 0, -1)]), ([15], [0]))
+
+            # Entries that were not processed are not remembered
+            self.assertEqual(get_downloaded_ids(cachedir, range(18, 0, -1), playlistend=2), ([18, 17], [0]))
+            self.assertEqual(get_downloaded_ids(cachedir, range(18, 0, -1)), ([18, 17, 16], [0, 1]))
+
+            # Entries rejected by the archive or the filters are remembered
+            self.assertEqual(get_downloaded_ids(
+                cachedir, range(20, 0, -1), match_filter=match_filter_func('id != 20'),
+                download_archive={'test:playlist 19'}), ([], [0]))
+            self.assertEqual(get_downloaded_ids(cachedir, range(20, 0, -1)), ([], [0]))
+            # Including when the rest of the playlist is skipped
+            with self.assertRaises(ExistingVideoReached):
+                get_downloaded_ids(
+                    cachedir, range(24, 0, -1), download_archive={'test:playlist 22'}, break_on_existing=True)
+            self.assertEqual(get_downloaded_ids(cachedir, range(24, 0, -1)), ([], [0]))
+
     def test_do_not_override_ie_key_in_url_transparent(self):
         ydl = YDL()
 
@@ -1362,6 +1460,210 @@ def close_hook_two():
         self.assertTrue(close_hook_called, 'Close hook was not called')
         self.assertTrue(close_hook_two_called, 'Close hook two was not called')
 
+    def test_concurrent_entries(self):
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                with self._downloader.running_task():
+                    # Later entries are extracted faster, so that they finish out of order
+                    time.sleep((10 - int(video_id)) * 0.02)
+                if video_id in ('3', '5'):
+                    raise ExtractorError('foo', expected=True)
+                return {'id': video_id, 'title': f'Video {video_id}', 'url': TEST_URL, 'ext': 'mp4'}
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    (self.url_result(f'video:{n}', VideoIE) for n in range(10)), 'pl', 'Playlist')
+
+        class _YDL(ConcurrencyYDL):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.filenames, self.errors = [], []
+
+            trouble = YoutubeDL.trouble
+
+            def to_stderr(self, message, *args, **kwargs):
+                if message.startswith('ERROR:'):
+                    self.errors.append(message)
+
+            def process_info(self, info_dict):
+                try:
+                    return super().process_info(info_dict)
+                finally:
+                    if '_filename' in info_dict:
+                        self.filenames.append(info_dict['_filename'])
+
+        def run(workers, **params):
+            ydl = _YDL.create(
+                (VideoIE, PlaylistIE), simulate=True, ignoreerrors=True, concurrent_entries=workers,
+                outtmpl='%(autonumber)s-%(video_autonumber)s-%(id)s.%(ext)s', **params)
+            try:
+                info = ydl.extract_info('playlist:')
+            except Exception as e:
+                info = type(e).__name__
+            else:
+                info = [entry and entry.get('id') for entry in info['entries']]
+            # Downloads overlap, the autonumber tells the order in which they were counted
+            return (info, sorted(ydl.filenames), len(ydl.errors)), ydl.max_running
+
+        for params in (
+            {},
+            {'max_downloads': 3},
+            {'max_downloads': 4, 'playlist_items': '3-'},
+            {'skip_playlist_after_errors': 2},
+            {'download_archive': {'video 7'}},
+            {'download_archive': {'video 7'}, 'break_on_existing': True},
+            {'match_filter': match_filter_func('id != 6')},
+        ):
+            with self.subTest(**params):
+                expected, max_running = run(1, **params)
+                self.assertEqual(max_running, 1)
+                result, max_running = run(4, **params)
+                self.assertEqual(result, expected)
+                self.assertGreater(max_running, 1)
+
+        self.assertEqual(run(4)[0], (
+            ['0', '1', '2', None, '4', None, '6', '7', '8', '9'],
+            ['00001-1-0.mp4', '00002-2-1.mp4', '00003-3-2.mp4', '00004-4-4.mp4',
+             '00005-5-6.mp4', '00006-6-7.mp4', '00007-7-8.mp4', '00008-8-9.mp4'],
+            2))
+
+
+    def test_concurrent_formats(self):
+        class _YDL(ConcurrencyYDL):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.statuses = []
+
+            def dl(self, name, info, *args, progress_hooks=(), **kwargs):
+                hooks = (*self._progress_hooks, *progress_hooks)
+                with self.running_task():
+                    for downloaded in (0, 50, 100):
+                        if downloaded and info['format_id'] == self.params.get('raising_format'):
+                            raise ValueError(f'Format {info["format_id"]} is broken')
+                        for hook in hooks:
+                            hook({'status': 'downloading', 'downloaded_bytes': downloaded, 'total_bytes': 100})
+                        time.sleep(0.05)
+                if info['format_id'] == self.params.get('failing_format'):
+                    return False, True
+                with open(name, 'wb') as f:
+                    f.write(b'\0' * 100)
+                for hook in hooks:
+                    hook({'status': 'finished', 'downloaded_bytes': 100, 'total_bytes': 100, 'filename': name})
+                return True, True
+
+            def record_status(self, status):
+                self.statuses.append(status['status'])
+
+        def run(**params):
+            ydl = _YDL.create(format='v+a', allow_unplayable_formats=True, **params)
+            ydl.add_progress_hook(ydl.record_status)
+            ydl.process_ie_result(_make_result([
+                {'format_id': 'v', 'url': TEST_URL, 'ext': 'mp4', 'vcodec': 'avc1', 'acodec': 'none'},
+                {'format_id': 'a', 'url': TEST_URL, 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a'},
+            ]))
+            return ydl
+
+        try:
+            ydl = run()
+            self.assertEqual(ydl.max_running, 1)
+            self.assertTrue(ydl.postprocessed)
+            ydl = run(concurrent_formats=True)
+            self.assertEqual(ydl.max_running, 2)
+            self.assertTrue(ydl.postprocessed)
+            # The progress hooks still get the status of each format
+            self.assertEqual(ydl.statuses.count('finished'), 2)
+
+            # A failed format does not stop the other one, but nothing is post-processed
+            try_rm('testfile.fv.mp4')
+            ydl = run(concurrent_formats=True, failing_format='a')
+            self.assertTrue(os.path.exists('testfile.fv.mp4'))
+            self.assertFalse(ydl.postprocessed)
+
+            # An error stops the other format, and is raised rather than the cancellation
+            with self.assertRaisesRegex(ValueError, 'Format a is broken'):
+                run(concurrent_formats=True, raising_format='a')
+        finally:
+            for fn in ('testfile.fv.mp4', 'testfile.fa.m4a'):
+                try_rm(fn)
+
+        statuses = []
+        progress = CombinedProgress(2, statuses.append)
+        progress.hook(0)({'status': 'downloading', 'downloaded_bytes': 10, 'total_bytes': 100, 'speed': 5, 'eta': 18})
+        progress.hook(1)({'status': 'downloading', 'downloaded_bytes': 20, 'total_bytes_estimate': 50, 'speed': 10, 'eta': 3})
+        progress.hook(0)({'status': 'finished', 'total_bytes': 100})
+        progress.hook(1)({'status': 'finished', 'downloaded_bytes': 50, 'total_bytes': 50})
+        self.assertEqual([{k: v for k, v in status.items() if k != 'elapsed'} for status in statuses], [
+            {'status': 'downloading', 'downloaded_bytes': 10, 'total_bytes': None,
+             'total_bytes_estimate': None, 'speed': 5, 'eta': None},
+            {'status': 'downloading', 'downloaded_bytes': 30, 'total_bytes': None,
+             'total_bytes_estimate': 150, 'speed': 15, 'eta': 18},
+            {'status': 'downloading', 'downloaded_bytes': 120, 'total_bytes': None,
+             'total_bytes_estimate': 150, 'speed': 10, 'eta': 3},
+            {'status': 'finished', 'downloaded_bytes': 150, 'total_bytes': 150,
+             'total_bytes_estimate': 150, 'speed': None, 'eta': None},
+        ])
+
+    def test_concurrent_side_downloads(self):
+        class _YDL(ConcurrencyYDL):
+            def side_download(self, url):
+                with self.running_task():
+                    time.sleep(0.2)
+                if 'missing' in url:
+                    raise TransportError('missing')
+
+            def dl(self, name, info, subtitle=False, *args, **kwargs):
+                if subtitle:
+                    self.side_download(info['url'])
+                else:
+                    self.overlapped = self.running > 0
+                with open(name, 'wb') as f:
+                    f.write(b'\0')
+                return True, True
+
+            def urlopen(self, req):
+                self.side_download(req.url)
+                return io.BytesIO(b'\0')
+
+            def record_postprocessing(self, info):
+                # The files are there for the postprocessors
+                self.postprocessed_files = sorted(
+                    os.path.basename(item['filepath']) for item in (
+                        *info['requested_subtitles'].values(), *info['thumbnails'])
+                    if os.path.exists(item['filepath']))
+
+        def run(**params):
+            ydl = _YDL.create(writesubtitles=True, subtitleslangs=['all'], write_all_thumbnails=True, **params)
+            ydl.expect_warning('Unable to download video thumbnail missing')
+            ydl.process_ie_result(_make_result(
+                [{'format_id': 'v', 'url': TEST_URL, 'ext': 'mp4'}],
+                subtitles={lang: [{'url': f'http://localhost/{lang}.vtt', 'ext': 'vtt'}] for lang in ('en', 'fr', 'de')},
+                thumbnails=[{'url': f'http://localhost/{i}.jpg', 'id': i} for i in ('1', 'missing', '2')]))
+            self.assertEqual(ydl.postprocessed_files, [
+                'testfile.1.jpg', 'testfile.2.jpg', 'testfile.de.vtt', 'testfile.en.vtt', 'testfile.fr.vtt'])
+            return ydl
+
+        try:
+            ydl = run()
+            self.assertEqual(ydl.max_running, 1)
+            self.assertFalse(ydl.overlapped)
+            ydl = run(concurrent_side_downloads=3)
+            self.assertEqual(ydl.max_running, 3)
+            self.assertTrue(ydl.overlapped)
+            # The info json records which thumbnails could be downloaded
+            ydl = run(concurrent_side_downloads=3, writeinfojson=True)
+            self.assertEqual(ydl.max_running, 3)
+            self.assertFalse(ydl.overlapped)
+        finally:
+            for fn in ('testfile.mp4', 'testfile.info.json', 'testfile.1.jpg', 'testfile.2.jpg',
+                       'testfile.de.vtt', 'testfile.en.vtt', 'testfile.fr.vtt'):
+                try_rm(fn)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -9,8 +9,12 @@
 
 
 import base64
+import contextlib
+import random
 
 from yt_dlp.aes import (
+    _CBC_DECRYPT_BACKENDS,
+    _tbox_cbc_decrypt,
     aes_cbc_decrypt,
     aes_cbc_decrypt_bytes,
     aes_cbc_encrypt,
@@ -47,9 +51,22 @@ def test_cbc_decrypt(self):
         data = b'\x97\x92+\xe5\x0b\xc3\x18\x91ky9m&\xb3\xb5@\xe6\x27\xc2\x96.\xc8u\x88\xab9-[\x9e|\xf1\xcd'
         decrypted = bytes(aes_cbc_decrypt(list(data), self.key, self.iv))
         self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
-        if Cryptodome.AES:
-            decrypted = aes_cbc_decrypt_bytes(data, bytes(self.key), bytes(self.iv))
-            self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
+        decrypted = aes_cbc_decrypt_bytes(data, bytes(self.key), bytes(self.iv))
+        self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
+
+    def test_cbc_decrypt_backends(self):
+        data, iv = random.randbytes(16 * 64), random.randbytes(16)
+        backends = {'tbox': _tbox_cbc_decrypt}
+        for name, get_backend in _CBC_DECRYPT_BACKENDS.items():
+            with contextlib.suppress(Exception):
+                backends[name] = get_backend()
+        for key_size in (16, 24, 32):
+            key = random.randbytes(key_size)
+            expected = bytes(aes_cbc_decrypt(list(data), list(key), list(iv)))
+            for name, backend in backends.items():
+                if backend:
+                    self.assertEqual(backend(data, key, iv), expected, f'{name} with a {key_size}-byte key')
+            self.assertEqual(aes_cbc_decrypt_bytes(data, key, iv), expected)
 
     def test_cbc_encrypt(self):
         data = list(self.secret_msg)
@@ -12,6 +12,7 @@
 
 from test.helper import gettestcases
 from yt_dlp.extractor import FacebookIE, YoutubeIE, gen_extractors
+from yt_dlp.extractor._url_index import URLIndex, url_keys, valid_url_keys
 
 
 class TestAllURLsMatching(unittest.TestCase):
@@ -108,6 +109,33 @@ def test_pbs(self):
         self.assertMatch('http://video.pbs.org/viralplayer/2365173446/', ['pbs'])
         self.assertMatch('http://video.pbs.org/widget/partnerplayer/980042464/', ['pbs'])
 
+    def test_url_index_keys(self):
+        self.assertEqual(valid_url_keys(r'https?://(?:www\.)?example\.(?:com|org)/(?P<id>\d+)'), ('example.com', 'example.org'))
+        self.assertEqual(valid_url_keys(r'https?://(?:[\w-]+\.)+example\.com(?::\d+)?/'), ('example.com',))
+        self.assertEqual(valid_url_keys(r'https?://video\.example\.com$'), ('video.example.com',))
+        self.assertEqual(valid_url_keys([r'example:(?P<id>\d+)', r'ex(?:ab|cd)\d+']), ('^exab', '^example:', '^excd'))
+        self.assertEqual(valid_url_keys(False), ())
+        # The host is not delimited or may be anything
+        self.assertEqual(valid_url_keys(r'https?://example\.com'), ('^http:', '^https:'))
+        self.assertEqual(valid_url_keys(r'https?://[^/]+/video'), ('^http:', '^https:'))
+        self.assertEqual(valid_url_keys(r'(?:https?://)?example\.com/'), ('^example.com/', 'example.com'))
+        self.assertIsNone(valid_url_keys(r'(?:https?://)?[^/]+\.example\.com/'))
+        self.assertIsNone(valid_url_keys(r'.*'))
+
+        self.assertEqual(
+            url_keys('HTTPS://www.Example.com:8080/video?x=1'),
+            {'^h', '^ht', '^htt', '^http', '^https', '^https:', 'www.example.com:8080', 'example.com:8080',
+             'com:8080', 'www.example.com', 'example.com', 'com'})
+
+    def test_url_index(self):
+        index = URLIndex({ie.ie_key(): ie for ie in self.ies})
+        for tc in gettestcases(include_onlymatching=True):
+            self.assertIn(tc['name'], index.candidates(tc['url']), f'{tc["name"]} is not a candidate for {tc["url"]!r}')
+        ie_keys = list(index.candidates('https://www.youtube.com/watch?v=BaW_jenozKc'))
+        self.assertEqual(ie_keys, sorted(ie_keys, key=[ie.ie_key() for ie in self.ies].index))
+        self.assertLess(len(ie_keys), len(self.ies) / 5)
+        self.assertEqual(ie_keys[-1], 'Generic')
+
     def test_no_duplicated_ie_names(self):
         name_accu = collections.defaultdict(list)
         for ie in self.ies:
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import concurrent.futures
+import shutil
+import subprocess
+import time
+
+from test.helper import FakeYDL
+from yt_dlp.archive import SQLiteArchive, TextArchive, is_sqlite_archive, open_download_archive
+from yt_dlp.dependencies import sqlite3
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+        self.test_dir = os.path.join(TEST_DIR, 'testdata', 'archive_test')
+        self.tearDown()
+        os.makedirs(self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def path(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def write_text_archive(self, name, *lines):
+        with open(self.path(name), 'w', encoding='utf-8') as f:
+            f.writelines(f'{line}\n' for line in lines)
+        return self.path(name)
+
+    def test_text_archive(self):
+        fn = self.write_text_archive('archive.txt', 'youtube a', 'youtube b')
+        archive = open_download_archive(fn)
+        self.assertIsInstance(archive, TextArchive)
+        self.assertIn('youtube a', archive)
+        self.assertNotIn('youtube c', archive)
+        archive.add('youtube c')
+        archive.update(['youtube a', 'youtube d', 'youtube d'])
+        archive.close()
+        with open(fn, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), ['youtube a', 'youtube b', 'youtube c', 'youtube d'])
+
+    def test_text_archive_shared(self):
+        fn = self.write_text_archive('archive.txt', 'youtube a')
+        archive, other = TextArchive(fn), TextArchive(fn)
+        other.add('youtube b')
+        self.assertIn('youtube b', archive)
+        # A line that is still being written is not read yet
+        with open(fn, 'a', encoding='utf-8') as f:
+            f.write('youtube c\nyoutube d')
+        self.assertIn('youtube c', archive)
+        self.assertNotIn('youtube d', archive)
+        with open(fn, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertIn('youtube d', archive)
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_archive(self):
+        fn = self.path('archive.sqlite')
+        self.assertTrue(is_sqlite_archive(fn))
+        archive = open_download_archive(fn)
+        self.assertIsInstance(archive, SQLiteArchive)
+        self.assertTrue(archive)
+        self.assertNotIn('youtube a', archive)
+        for vid_id in ('youtube a', 'youtube b', 'youtube c'):
+            archive.add(vid_id)
+        # Committed right away, without waiting for the archive to be closed
+        self.assertIn('youtube c', archive)
+        self.assertEqual(set(SQLiteArchive(fn)), {'youtube a', 'youtube b', 'youtube c'})
+        archive.close()
+        archive = SQLiteArchive(fn)
+        self.assertEqual(len(archive), 3)
+        self.assertIn('youtube b', archive)
+        archive.close()
+
+        # Recognised by the content whatever the extension
+        os.rename(fn, self.path('archive.txt'))
+        self.assertTrue(is_sqlite_archive(self.path('archive.txt')))
+        self.assertFalse(is_sqlite_archive(self.write_text_archive('archive.db', 'youtube a')))
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_archive_claims(self):
+        fn = self.path('archive.sqlite')
+        archive, other = SQLiteArchive(fn), SQLiteArchive(fn)
+        self.assertTrue(archive.claim('youtube a'))
+        self.assertTrue(archive.claim('youtube a'))
+        self.assertFalse(other.claim('youtube a'))
+        archive.release('youtube a')
+        self.assertTrue(other.claim('youtube a'))
+        other.add('youtube a')
+        self.assertFalse(archive.claim('youtube a'))
+
+        self.assertTrue(archive.claim('youtube b'))
+        archive.close()
+        self.assertTrue(other.claim('youtube b'))
+        other.close()
+
+        # Claims of dead processes on the same host are taken over
+        archive = SQLiteArchive(fn)
+        dead = subprocess.Popen([sys.executable, '-c', ''])
+        dead.wait()
+        with archive._transaction():
+            archive._conn.execute(
+                'INSERT INTO claims (id, owner, host, pid, claimed) VALUES (?, ?, ?, ?, ?)',
+                ('youtube c', 'dead', archive._host, dead.pid, time.time()))
+        self.assertTrue(archive.claim('youtube c'))
+        archive.close()
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_archive_claims_concurrent(self):
+        fn = self.path('archive.sqlite')
+        SQLiteArchive(fn).close()
+        archives = [SQLiteArchive(fn) for _ in range(4)]
+        vid_ids = [f'youtube {i}' for i in range(50)]
+
+        def claim_all(archive):
+            return [vid_id for vid_id in vid_ids if archive.claim(vid_id)]
+
+        with concurrent.futures.ThreadPoolExecutor(len(archives)) as pool:
+            claimed = [vid_id for result in pool.map(claim_all, archives) for vid_id in result]
+        self.assertEqual(sorted(claimed), sorted(vid_ids))
+        for archive in archives:
+            archive.close()
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_import_download_archive(self):
+        text_fn = self.write_text_archive('archive.txt', 'youtube a', '', 'youtube b', 'youtube a')
+        fn = self.path('archive.db')
+        with FakeYDL({'download_archive': fn}) as ydl:
+            ydl.import_download_archive(text_fn)
+            self.assertTrue(ydl.in_download_archive({'id': 'b', 'extractor_key': 'Youtube'}))
+            self.assertFalse(ydl.in_download_archive({'id': 'c', 'extractor_key': 'Youtube'}))
+            ydl.record_download_archive({'id': 'c', 'extractor_key': 'Youtube'})
+
+        with FakeYDL({'download_archive': fn, 'claim_downloads': True}) as ydl, \
+                FakeYDL({'download_archive': fn, 'claim_downloads': True}) as other:
+            self.assertTrue(ydl.claim_download_archive({'id': 'd', 'extractor_key': 'Youtube'}))
+            self.assertFalse(other.claim_download_archive({'id': 'd', 'extractor_key': 'Youtube'}))
+            self.assertFalse(other.claim_download_archive({'id': 'c', 'extractor_key': 'Youtube'}))
+            ydl.release_download_archive_claim({'id': 'd', 'extractor_key': 'Youtube'})
+            self.assertTrue(other.claim_download_archive({'id': 'd', 'extractor_key': 'Youtube'}))
+        archive = SQLiteArchive(fn)
+        self.assertEqual(sorted(archive), ['youtube a', 'youtube b', 'youtube c'])
+        archive.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@
 
 
 import shutil
+import time
 
 from test.helper import FakeYDL
 from yt_dlp.cache import Cache
@@ -52,6 +53,61 @@ def test_cache(self):
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
 
+    def test_cache_memory(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+        })
+        c, other = Cache(ydl), Cache(ydl)
+        c.store('test_cache', 'k', {'x': 1})
+        data = c.load('test_cache', 'k')
+        data['x'] = 2
+        self.assertEqual(c.load('test_cache', 'k'), {'x': 1})
+        self.assertEqual(c._stats['test_cache']['hits'], 2)
+
+        # Replaced by another process
+        other.store('test_cache', 'k', {'x': 3})
+        self.assertEqual(c.load('test_cache', 'k'), {'x': 3})
+        self.assertEqual(c._stats['test_cache']['disk hits'], 1)
+        os.remove(c._get_cache_fn('test_cache', 'k', 'json'))
+        self.assertEqual(c.load('test_cache', 'k'), None)
+        self.assertEqual(c._stats['test_cache']['misses'], 1)
+
+        # Storing unchanged data doesn't rewrite the file
+        c.store('test_cache', 'k', {'x': 4})
+        fn = c._get_cache_fn('test_cache', 'k', 'json')
+        mtime = os.stat(fn).st_mtime_ns
+        c.store('test_cache', 'k', {'x': 4})
+        self.assertEqual(os.stat(fn).st_mtime_ns, mtime)
+        self.assertEqual(c._stats['test_cache']['stores'], 2)
+
+    def test_cache_ttl(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+        })
+        c = Cache(ydl)
+        c.store('test_cache', 'fresh', 1, ttl=60)
+        c.store('test_cache', 'expired', 1, ttl=-1)
+        self.assertEqual(c.load('test_cache', 'fresh'), 1)
+        self.assertEqual(c.load('test_cache', 'expired', default=0), 0)
+        self.assertFalse(os.path.exists(c._get_cache_fn('test_cache', 'expired', 'json')))
+
+    def test_cache_eviction(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+        })
+        c = Cache(ydl)
+        c._SECTION_SIZE_LIMIT = 1000
+        for i in range(4):
+            c.store('test_cache', f'k{i}', 'x' * 200)
+            os.utime(c._get_cache_fn('test_cache', f'k{i}', 'json'), (time.time() - c._TOUCH_INTERVAL - 10 + i,) * 2)
+        # Marks k0 as recently used
+        self.assertEqual(c.load('test_cache', 'k0'), 'x' * 200)
+        c.store('test_cache', 'k4', 'x' * 200)
+        c.store('test_cache', 'k5', 'x' * 200)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.test_dir, 'test_cache'))), ['k0.json', 'k3.json', 'k4.json', 'k5.json'])
+        self.assertEqual(c._stats['test_cache']['evictions'], 2)
+
 
 if __name__ == '__main__':
     unittest.main()
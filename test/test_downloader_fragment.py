@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import contextlib
+import glob
+import http.server
+import json
+import re
+import threading
+import time
+from unittest.mock import patch
+
+from test.helper import http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.aes import aes_cbc_encrypt_bytes
+from yt_dlp.downloader.dash import DashSegmentsFD
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+FRAGMENT_COUNT = 12
+FRAGMENT_SIZE = 4 * 1024
+KEY, IV = bytes(range(16)), bytes(range(16, 32))
+
+
+def fragment_content(index):
+    return bytes([index % 256]) * FRAGMENT_SIZE
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    stalled = set()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mobj = re.fullmatch(r'/(stall)?(enc)?frag(\d+)', self.path)
+        assert mobj
+        content = fragment_content(int(mobj.group(3)))
+        if mobj.group(2):
+            # The fragments are a multiple of the block size, so the PKCS#7 padding is a whole block
+            content = aes_cbc_encrypt_bytes(content + bytes([16]) * 16, KEY, IV)
+        if mobj.group(1) and self.path not in self.stalled:
+            # Only the first request for this fragment stalls
+            self.stalled.add(self.path)
+            time.sleep(5)
+        self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class CheckpointCountingFD(DashSegmentsFD):
+    YTDL_CHECKPOINT_FRAGMENTS = 5
+    YTDL_CHECKPOINT_INTERVAL = 3600
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkpoints = []
+
+    def _write_ytdl_file(self, ctx, fragment_index=None, dest_length=None):
+        self.checkpoints.append((fragment_index, dest_length))
+        return super()._write_ytdl_file(ctx, fragment_index, dest_length)
+
+
+class EncryptedFD(DashSegmentsFD):
+    def _get_fragments(self, *args, **kwargs):
+        for fragment in super()._get_fragments(*args, **kwargs):
+            fragment['url'] = fragment['url'].replace('/frag', '/encfrag')
+            fragment['decrypt_info'] = {'METHOD': 'AES-128', 'KEY': KEY, 'IV': IV}
+            yield fragment
+
+
+class TestFragmentFD(unittest.TestCase):
+    def setUp(self):
+        self.httpd = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def download(self, params, filename='testfile.mp4', stall=(), fd=DashSegmentsFD, resume=False):
+        params['logger'] = FakeLogger()
+        ydl = YoutubeDL(params)
+        self.downloader = downloader = fd(ydl, params)
+        if not resume:
+            try_rm(filename)
+        self.assertTrue(downloader.real_download(filename, {
+            'protocol': 'http_dash_segments',
+            'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+            'fragments': [
+                {'path': f'stallfrag{i}' if i in stall else f'frag{i}'} for i in range(FRAGMENT_COUNT)],
+        }))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), b''.join(map(fragment_content, range(FRAGMENT_COUNT))))
+        self.assertFalse(os.path.exists(f'{filename}.ytdl'))
+        return filename
+
+    def fragment_files(self, filename):
+        return glob.glob(glob.escape(filename) + '*-Frag*')
+
+    def assert_no_fragment_files(self, filename):
+        self.assertEqual(self.fragment_files(filename), [])
+
+    def test_sequential(self):
+        filename = self.download({})
+        self.assert_no_fragment_files(filename)
+        try_rm(filename)
+
+    def test_concurrent(self):
+        filename = self.download({'concurrent_fragment_downloads': 4})
+        self.assert_no_fragment_files(filename)
+        try_rm(filename)
+
+    def test_hedged_request(self):
+        HTTPTestRequestHandler.stalled.clear()
+        start = time.monotonic()
+        filename = self.download({'concurrent_fragment_downloads': 4}, stall=(7,))
+        # The stalled request is re-issued instead of holding up the download
+        self.assertLess(time.monotonic() - start, 4)
+        self.assert_no_fragment_files(filename)
+        try_rm(filename)
+
+    def test_decrypt(self):
+        for params in ({}, {'concurrent_fragment_downloads': 4}):
+            with self.subTest(params=params):
+                try_rm(self.download(params, fd=EncryptedFD))
+
+    @patch('yt_dlp.downloader.fragment.aes_cbc_decrypt_is_native', lambda: True)
+    def test_decryption_processes(self):
+        try_rm(self.download({'concurrent_fragment_downloads': 4, 'decryption_processes': 2}, fd=EncryptedFD))
+
+    def test_checkpoint(self):
+        filename = self.download({}, fd=CheckpointCountingFD)
+        # Fresh state, then one checkpoint every 5 fragments; nothing is left to save at the end
+        self.assertEqual(self.downloader.checkpoints, [
+            (None, 0), (5, 5 * FRAGMENT_SIZE), (10, 10 * FRAGMENT_SIZE)])
+        try_rm(filename)
+
+    def write_partial(self, filename, frags, dest_length):
+        with open(f'{filename}.part', 'wb') as f:
+            f.write(b''.join(map(fragment_content, range(frags))))
+        with open(f'{filename}.ytdl', 'w') as f:
+            json.dump({'downloader': {
+                'current_fragment': {'index': dest_length // FRAGMENT_SIZE},
+                'dest_length': dest_length,
+            }}, f)
+
+    def test_resume_after_checkpoint(self):
+        filename = 'testfile.mp4'
+        # Fragments 5 and 6 were appended after the last checkpoint
+        self.write_partial(filename, 6, 4 * FRAGMENT_SIZE)
+        filename = self.download({}, filename, fd=CheckpointCountingFD, resume=True)
+        self.assertEqual(self.downloader.checkpoints, [(9, 9 * FRAGMENT_SIZE)])
+        try_rm(filename)
+
+    def test_resume_inconsistent(self):
+        filename = 'testfile.mp4'
+        self.write_partial(filename, 2, 4 * FRAGMENT_SIZE)
+        filename = self.download({}, filename, fd=CheckpointCountingFD, resume=True)
+        self.assertEqual(self.downloader.checkpoints[0], (None, 0))
+        try_rm(filename)
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), 'named pipes are not supported')
+    def test_pipe(self):
+        filename = 'testfile.mp4'
+        for params in ({}, {'concurrent_fragment_downloads': 4}):
+            with self.subTest(params=params):
+                try_rm(filename)
+                os.mkfifo(filename)
+                received = []
+
+                def read():
+                    with open(filename, 'rb') as f:
+                        received.append(f.read())
+
+                reader = threading.Thread(target=read)
+                reader.start()
+                try:
+                    downloader = DashSegmentsFD(YoutubeDL({'logger': FakeLogger()}), params)
+                    self.assertTrue(downloader.download(filename, {
+                        'protocol': 'http_dash_segments',
+                        'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+                        'fragments': [{'path': f'frag{i}'} for i in range(FRAGMENT_COUNT)],
+                    })[0])
+                finally:
+                    with contextlib.suppress(OSError):
+                        # Unblocks the reader if the download never opened the pipe
+                        os.close(os.open(filename, os.O_WRONLY | os.O_NONBLOCK))
+                    reader.join()
+                    # Neither a part file nor a resume state is written for a pipe
+                    self.assertEqual(glob.glob('testfile.mp4?*'), [])
+                    try_rm(filename)
+                self.assertEqual(received, [b''.join(map(fragment_content, range(FRAGMENT_COUNT)))])
+
+    def test_keep_fragments(self):
+        filename = self.download({'keep_fragments': True})
+        fragment_files = self.fragment_files(filename)
+        self.assertEqual(len(fragment_files), FRAGMENT_COUNT)
+        for fragment_file in fragment_files:
+            try_rm(fragment_file)
+        try_rm(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,8 +9,10 @@
 
 
 import http.server
+import json
 import re
 import threading
+import time
 
 from test.helper import http_server_port, try_rm
 from yt_dlp import YoutubeDL
@@ -101,5 +103,105 @@ def test_chunked(self):
         })
 
 
+SEGMENTED_SIZE = 1024 * 1024
+SEGMENTED_CONTENT = bytes(range(256)) * (SEGMENTED_SIZE // 256)
+
+
+class SegmentedRequestHandler(http.server.BaseHTTPRequestHandler):
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mobj = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range') or '')
+        if not mobj or self.path == '/no-range':
+            self.send_response(200)
+            self.send_header('Content-Length', str(SEGMENTED_SIZE))
+            self.end_headers()
+            self.wfile.write(SEGMENTED_CONTENT)
+            return
+        start, end = int(mobj.group(1)), int(mobj.group(2))
+        self.requests.append((start, end))
+        self.send_response(206)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{SEGMENTED_SIZE}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        try:
+            for pos in range(start, end + 1, 16 * 1024):
+                if self.path == '/slow-start' and pos < SEGMENTED_SIZE // 4:
+                    time.sleep(0.05)
+                self.wfile.write(SEGMENTED_CONTENT[pos:min(pos + 16 * 1024, end + 1)])
+        except ConnectionError:
+            pass
+
+
+class SegmentedHttpFD(HttpFD):
+    MIN_RANGE_SIZE = 32 * 1024
+
+
+class TestSegmentedHttpFD(unittest.TestCase):
+    def setUp(self):
+        SegmentedRequestHandler.requests = []
+        self.httpd = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), SegmentedRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def download(self, ep, filename='testfile.mp4', resume=False, params=None, info_dict=None):
+        params = {'logger': FakeLogger(), 'http_connections': 4, **(params or {})}
+        downloader = SegmentedHttpFD(YoutubeDL(params), params)
+        downloaded_bytes = []
+        downloader.add_progress_hook(lambda d: downloaded_bytes.append(d['downloaded_bytes']))
+        if not resume:
+            try_rm(filename)
+        self.assertTrue(downloader.real_download(filename, {
+            'url': f'http://127.0.0.1:{self.port}/{ep}',
+            **(info_dict or {}),
+        }))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), SEGMENTED_CONTENT)
+        self.assertFalse(os.path.exists(f'{filename}.ytdl'))
+        self.assertLessEqual(max(downloaded_bytes), SEGMENTED_SIZE)
+        try_rm(filename)
+
+    def test_segmented(self):
+        self.download('regular')
+        starts = {start for start, _ in SegmentedRequestHandler.requests}
+        self.assertLessEqual({0, SEGMENTED_SIZE // 4, SEGMENTED_SIZE // 2, SEGMENTED_SIZE * 3 // 4}, starts)
+
+    def test_work_stealing(self):
+        self.download('slow-start')
+        # Idle connections took over parts of the slow first range
+        self.assertTrue(any(0 < start < SEGMENTED_SIZE // 4 for start, _ in SegmentedRequestHandler.requests))
+
+    def test_work_stealing_inside_block(self):
+        # The reads are larger than the part of the range that is taken over
+        self.download('slow-start', params={'buffersize': 256 * 1024, 'noresizebuffer': True})
+
+    def test_small_file(self):
+        self.download('regular', info_dict={'filesize': 1024})
+        self.assertEqual(SegmentedRequestHandler.requests, [])
+
+    def test_no_range(self):
+        self.download('no-range')
+
+    def test_resume(self):
+        filename = 'testfile.mp4'
+        half = SEGMENTED_SIZE // 2
+        with open(f'{filename}.part', 'wb') as f:
+            f.write(SEGMENTED_CONTENT[:half] + bytes(half))
+        with open(f'{filename}.ytdl', 'w') as f:
+            json.dump({'downloader': {'total_bytes': SEGMENTED_SIZE, 'ranges': [[half, SEGMENTED_SIZE]]}}, f)
+        self.download('regular', filename, resume=True)
+        self.assertTrue(all(start >= half for start, _ in SegmentedRequestHandler.requests))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -34,6 +34,29 @@ def test_import(self):
     def test_module_exec(self):
         self.run_yt_dlp(exe=(sys.executable, '-m', 'yt_dlp'))
 
+    def test_deferred_imports(self):
+        stdout, _ = self.run_yt_dlp(exe=(sys.executable, '-c', '\n'.join((
+            'import sys, yt_dlp',
+            'print(*sorted({"asyncio", "sqlite3", "yt_dlp.extractor.afreecatv",',
+            '               "yt_dlp.postprocessor.embedthumbnail"} & set(sys.modules)))',
+        ))))
+        self.assertEqual(stdout, '')
+
+    def test_profile_startup(self):
+        _, stderr = self.run_yt_dlp(opts=('--no-update', '--profile-startup'))
+        self.assertRegex(stderr, r'^\[startup\] Ready after [\d.]+ms, \d+ modules imported')
+        self.assertIn('yt_dlp.YoutubeDL', stderr)
+
+    def test_profile_startup_embedded(self):
+        # Only yt-dlp itself is profiled, not the programs that embed it
+        stdout, _ = self.run_yt_dlp(exe=(sys.executable, '-c', '\n'.join((
+            'import sys',
+            'sys.argv.append("--profile-startup")',
+            'from yt_dlp._import_profiler import import_profiler',
+            'print(import_profiler.started)',
+        ))))
+        self.assertEqual(stdout, 'None')
+
     def test_cmdline_umlauts(self):
         _, stderr = self.run_yt_dlp(opts=('ä', '--version'))
         self.assertFalse(stderr)
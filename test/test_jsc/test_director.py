@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from yt_dlp.extractor.youtube.jsc._director import JsChallengeBatcher
+from yt_dlp.extractor.youtube.jsc.provider import (
+    JsChallengeRequest,
+    JsChallengeResponse,
+    JsChallengeType,
+    NChallengeInput,
+    NChallengeOutput,
+    SigChallengeInput,
+    SigChallengeOutput,
+)
+
+
+class FakeDirector:
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def bulk_solve(self, requests):
+        self.calls.append(requests)
+        self.started.set()
+        self.release.wait()
+        return [(request, JsChallengeResponse(request.type, (
+            NChallengeOutput if request.type is JsChallengeType.N else SigChallengeOutput)(
+                {challenge: challenge[::-1] for challenge in request.input.challenges if challenge != 'fail'})))
+            for request in requests]
+
+
+def n_request(player_url, *challenges, video_id='id'):
+    return JsChallengeRequest(JsChallengeType.N, NChallengeInput(player_url, list(challenges)), video_id)
+
+
+class TestJsChallengeBatcher:
+    def test_solve(self):
+        director = FakeDirector()
+        batcher = JsChallengeBatcher(director)
+        results = batcher.solve([
+            n_request('p1', 'ab', 'fail'),
+            JsChallengeRequest(JsChallengeType.SIG, SigChallengeInput('p1', ['cd']), 'id'),
+        ])
+        assert results == {
+            (JsChallengeType.N, 'p1', 'ab'): 'ba',
+            (JsChallengeType.SIG, 'p1', 'cd'): 'dc',
+        }
+        assert len(director.calls) == 1
+
+    def test_concurrent_requests_are_batched(self):
+        director = FakeDirector()
+        director.release.clear()
+        batcher = JsChallengeBatcher(director)
+        results = {}
+
+        def solve(name, *requests):
+            results[name] = batcher.solve(list(requests))
+
+        first = threading.Thread(target=solve, args=('first', n_request('p1', 'ab')))
+        first.start()
+        director.started.wait()
+        # Submitted while the first batch is being solved
+        others = [
+            threading.Thread(target=solve, args=('second', n_request('p1', 'cd', video_id='2'))),
+            threading.Thread(target=solve, args=('third', n_request('p1', 'ef', 'cd', video_id='3'))),
+            threading.Thread(target=solve, args=('fourth', n_request('p2', 'gh', video_id='4'))),
+        ]
+        for thread in others:
+            thread.start()
+        while len(batcher._batch.video_ids) < 2 or sum(map(len, batcher._batch.challenges.values())) < 3:
+            time.sleep(0.01)
+        director.release.set()
+        for thread in (first, *others):
+            thread.join()
+
+        assert len(director.calls) == 2
+        assert sorted((r.input.player_url, sorted(r.input.challenges)) for r in director.calls[1]) == [
+            ('p1', ['cd', 'ef']), ('p2', ['gh'])]
+        assert results['first'] == {(JsChallengeType.N, 'p1', 'ab'): 'ba'}
+        assert results['second'] == results['third'] == results['fourth'] == {
+            (JsChallengeType.N, 'p1', 'cd'): 'dc',
+            (JsChallengeType.N, 'p1', 'ef'): 'fe',
+            (JsChallengeType.N, 'p2', 'gh'): 'hg',
+        }
+
+    def test_on_solved_once_per_batch(self):
+        director = FakeDirector()
+        solved = []
+        batcher = JsChallengeBatcher(director, on_solved=solved.append)
+        batcher.solve([n_request('p1', 'ab', 'cd')])
+        batcher.solve([n_request('p1', 'ef')])
+        assert solved == [
+            {(JsChallengeType.N, 'p1', 'ab'): 'ba', (JsChallengeType.N, 'p1', 'cd'): 'dc'},
+            {(JsChallengeType.N, 'p1', 'ef'): 'fe'},
+        ]
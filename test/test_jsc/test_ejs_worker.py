@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from yt_dlp.extractor.youtube.jsc._builtin.ejs import Script, ScriptSource, ScriptType, ScriptVariant
+from yt_dlp.extractor.youtube.jsc._builtin.node import NodeJCP
+from yt_dlp.extractor.youtube.jsc.provider import (
+    JsChallengeProviderResponse,
+    JsChallengeRequest,
+    JsChallengeResponse,
+    JsChallengeType,
+    NChallengeInput,
+    NChallengeOutput,
+)
+
+# Reverses the challenges, and tells which kind of player it was given
+_LIB_SCRIPT = 'var lib = {};'
+_CORE_SCRIPT = '''
+var jsc = (input) => {
+  const player = input.type === 'player' ? input.player : input.preprocessed_player;
+  const output = {
+    type: 'result',
+    responses: input.requests.map((request) => ({
+      type: 'result',
+      data: Object.fromEntries(request.challenges.map(
+        (challenge) => [challenge, `${player}:${input.type}:${[...challenge].reverse().join('')}`])),
+    })),
+  };
+  if (input.type === 'player' && input.output_preprocessed) {
+    output.preprocessed_player = `${player}-preprocessed`;
+  }
+  return output;
+};
+'''
+
+
+@pytest.fixture
+def jcp(ie, logger):
+    obj = NodeJCP(ie, logger, None)
+    if not obj.is_available():
+        pytest.skip(f'{obj.PROVIDER_NAME} is not available')
+    obj._lib_script = Script(ScriptType.LIB, ScriptVariant.UNKNOWN, ScriptSource.BUILTIN, '0', _LIB_SCRIPT)
+    obj._core_script = Script(ScriptType.CORE, ScriptVariant.UNKNOWN, ScriptSource.BUILTIN, '0', _CORE_SCRIPT)
+    obj.players_loaded = []
+
+    def _get_player(video_id, player_url):
+        obj.players_loaded.append(player_url)
+        return player_url.rpartition('/')[2]
+
+    obj._get_player = _get_player
+    yield obj
+    obj.close()
+
+
+def _request(player, challenge):
+    return JsChallengeRequest(JsChallengeType.N, NChallengeInput(f'https://example.com/{player}', [challenge]), 'id')
+
+
+def _response(request, solution):
+    return JsChallengeProviderResponse(
+        request, JsChallengeResponse(JsChallengeType.N, NChallengeOutput({request.input.challenges[0]: solution})))
+
+
+def test_worker_keeps_players(jcp):
+    first, second = _request('a', 'abc'), _request('b', 'def')
+    assert list(jcp.bulk_solve([first, second])) == [
+        _response(first, 'a:player:cba'), _response(second, 'b:player:fed')]
+    worker = jcp._worker
+    assert worker is not None
+
+    third = _request('a', 'ghi')
+    assert list(jcp.bulk_solve([third])) == [_response(third, 'a-preprocessed:preprocessed:ihg')]
+    assert jcp._worker is worker
+    assert jcp.players_loaded == ['https://example.com/a', 'https://example.com/b']
+
+
+def test_worker_restart(jcp):
+    first = _request('a', 'abc')
+    assert list(jcp.bulk_solve([first])) == [_response(first, 'a:player:cba')]
+    jcp._worker._proc.kill()
+    jcp._worker._proc.wait()
+
+    # The player is loaded again for the new worker
+    second = _request('a', 'def')
+    assert list(jcp.bulk_solve([second])) == [_response(second, 'a:player:fed')]
+    # Only the failures in a row count towards disabling the worker
+    assert jcp._worker_failures == 0
+    assert jcp.players_loaded == ['https://example.com/a'] * 2
+
+
+def test_worker_fallback(jcp):
+    jcp._worker_cmd = lambda: [jcp.runtime_info.path, '--eval', 'process.exit(1)']
+    request = _request('a', 'abc')
+    assert list(jcp.bulk_solve([request])) == [_response(request, 'a:player:cba')]
+    assert jcp._worker is None
+    assert jcp._worker_failures == jcp._MAX_WORKER_FAILURES
@@ -695,6 +695,22 @@ def test_read(self, handler):
             # Should auto-close and mark the response adaptor as closed
             assert res.closed
 
+    def test_readinto(self, handler):
+        with handler() as rh:
+            for encoding in ('', 'gzip', 'deflate'):
+                res = validate_and_send(rh, Request(
+                    f'http://127.0.0.1:{self.http_port}/content-encoding',
+                    headers={'ytdl-encoding': encoding}))
+                buf = bytearray(6)
+                assert res.readinto(buf) == 6
+                assert buf == b'<html>'
+                data = bytearray()
+                while n := res.readinto(buf):
+                    data += buf[:n]
+                assert data == b'<video src="/vid.mp4" /></html>'
+                assert res.readinto(buf) == 0
+                assert res.closed
+
     def test_request_disable_proxy(self, handler):
         for proxy_proto in handler._SUPPORTED_PROXY_SCHEMES or ['http']:
             # Given the handler is configured with a proxy
@@ -1251,6 +1267,22 @@ def close(self):
         assert res3.bytes_read == 7
         assert res3.closed
 
+        # readinto should copy from the received chunks
+        res5 = CurlCFFIResponseReader(FakeResponse())
+        buf = bytearray(2)
+        assert res5.readinto(buf) == 2
+        assert buf == b'fo'
+        assert res5.readinto(buf) == 1
+        assert buf[:1] == b'o'
+        assert res5.read(2) == b'ba'
+        assert res5.readinto(buf) == 1
+        assert buf[:1] == b'r'
+        assert res5.readinto(buf) == 1
+        assert buf[:1] == b'z'
+        assert res5.readinto(buf) == 0
+        assert res5.bytes_read == 7
+        assert res5.closed
+
         # buffer should be cleared on close
         res4 = CurlCFFIResponseReader(FakeResponse())
         res4.read(2)
@@ -9,17 +9,23 @@
 
 
 import subprocess
+import threading
+import time
+from unittest.mock import patch
 
+from test.helper import try_rm
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import shell_quote
 from yt_dlp.postprocessor import (
     ExecPP,
+    FFmpegMergerPP,
     FFmpegThumbnailsConvertorPP,
     MetadataFromFieldPP,
     MetadataParserPP,
     ModifyChaptersPP,
     SponsorBlockPP,
 )
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessorError
 
 
 class TestMetadataFromField(unittest.TestCase):
@@ -92,6 +98,121 @@ def test_parse_cmd(self):
         self.assertEqual(pp.parse_cmd('echo %(filepath)q', info), cmd)
 
 
+# Stands in for ffmpeg: concatenates the pipes it is given into the output, or fails right away
+_FAKE_MERGER = '''
+import shutil, sys
+if sys.argv[1] == 'fail':
+    sys.exit('Invalid data found when processing input')
+with open(sys.argv[-1], 'wb') as out:
+    for path in sys.argv[2:-1]:
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, out)
+'''
+
+
+@unittest.skipUnless(hasattr(os, 'mkfifo'), 'named pipes are not supported')
+class TestFFmpegMergerPP(unittest.TestCase):
+    def stream_merge(self, write, ffmpeg_mode='merge', download_success=True):
+        pp = FFmpegMergerPP(YoutubeDL({'quiet': True}))
+        info = {'requested_formats': [{
+            'filepath': f'testfile.f{i}.webm',
+            'protocol': 'https',
+            'vcodec': 'vp9' if i == 0 else 'none',
+            'acodec': 'none' if i == 0 else 'opus',
+        } for i in range(2)]}
+
+        def download(stopped):
+            errors = []
+
+            def run_write(*args):
+                try:
+                    write(*args)
+                except AssertionError as e:
+                    errors.append(e)
+
+            threads = [
+                threading.Thread(target=run_write, args=(fmt['filepath'], i, stopped))
+                for i, fmt in enumerate(info['requested_formats'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if errors:
+                raise errors[0]
+            return download_success
+
+        with (patch.object(FFmpegMergerPP, 'check_version'),
+              patch.object(FFmpegMergerPP, '_ffmpeg_command', lambda self, inputs, outputs: [
+                  sys.executable, '-c', _FAKE_MERGER, ffmpeg_mode,
+                  *(path for path, _ in inputs), outputs[0][0]])):
+            try:
+                return pp.stream_merge(info, 'testfile.webm', download)
+            finally:
+                for fmt in info['requested_formats']:
+                    self.assertFalse(os.path.exists(fmt['filepath']))
+                self.assertFalse(os.path.exists('testfile.temp.webm'))
+
+    def test_stream_merge(self):
+        def write(filename, index, stopped):
+            with open(filename, 'wb') as f:
+                f.write(bytes([index]) * 100000)
+            # The downloads are not cancelled by ffmpeg exiting once the pipes are closed
+            time.sleep(0.5)
+            self.assertFalse(stopped.is_set())
+
+        try:
+            self.assertTrue(self.stream_merge(write))
+            with open('testfile.webm', 'rb') as f:
+                self.assertEqual(f.read(), b'\0' * 100000 + b'\1' * 100000)
+        finally:
+            try_rm('testfile.webm')
+
+    def test_stream_merge_late_writer(self):
+        def write(filename, index, stopped):
+            # Like the http downloader, which opens its file once the first block is there
+            time.sleep(0.5 - index * 0.3)
+            with open(filename, 'wb') as f:
+                f.write(bytes([index]) * 100000)
+
+        try:
+            self.assertTrue(self.stream_merge(write))
+            with open('testfile.webm', 'rb') as f:
+                self.assertEqual(f.read(), b'\0' * 100000 + b'\1' * 100000)
+        finally:
+            try_rm('testfile.webm')
+
+    def test_stream_merge_ffmpeg_error(self):
+        def write(filename, index, stopped):
+            # The downloads are not blocked by the pipes that are no longer read
+            with open(filename, 'wb') as f:
+                for _ in range(100):
+                    f.write(b'\0' * 100000)
+            self.assertTrue(stopped.is_set())
+
+        with self.assertRaisesRegex(FFmpegPostProcessorError, 'Invalid data'):
+            self.stream_merge(write, 'fail')
+
+    def test_stream_merge_download_error(self):
+        def write(filename, index, stopped):
+            with open(filename, 'wb') as f:
+                f.write(b'\0')
+
+        self.assertFalse(self.stream_merge(write, download_success=False))
+        self.assertFalse(os.path.exists('testfile.webm'))
+
+    def test_stream_merge_download_error_before_writing(self):
+        def write(filename, index, stopped):
+            if index == 0:
+                stopped.set()
+                return
+            # Not blocked while ffmpeg waits for the first pipe
+            with open(filename, 'wb') as f:
+                f.write(b'\1' * 100000)
+
+        self.assertFalse(self.stream_merge(write, download_success=False))
+        self.assertFalse(os.path.exists('testfile.webm'))
+
+
 class TestModifyChaptersPP(unittest.TestCase):
     def setUp(self):
         self._pp = ModifyChaptersPP(YoutubeDL())
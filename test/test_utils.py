@@ -15,6 +15,8 @@
 import ntpath
 import pickle
 import subprocess
+import threading
+import time
 import unittest
 import unittest.mock
 import warnings
@@ -96,6 +98,7 @@
     parse_resolution,
     pkcs1pad,
     prepend_extension,
+    read_ahead,
     read_batch_urls,
     remove_end,
     remove_quotes,
@@ -1985,6 +1988,40 @@ def test(ll, idx, val, cache):
         ll = reversed(ll)
         test(ll, -15, 14, range(15))
 
+    def test_read_ahead(self):
+        produced = []
+        closed = threading.Event()
+
+        def pages(count, fail_at=None):
+            try:
+                for i in range(count):
+                    if i == fail_at:
+                        raise ExtractorError('failed')
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.set()
+
+        self.assertEqual(list(read_ahead(pages(5))), list(range(5)))
+
+        produced.clear()
+        it = read_ahead(pages(3, fail_at=2), 1)
+        self.assertEqual([next(it), next(it)], [0, 1])
+        with self.assertRaisesRegex(ExtractorError, 'failed'):
+            next(it)
+
+        # At most `size` items wait to be consumed, and one more is being produced
+        produced.clear()
+        closed.clear()
+        it = read_ahead(pages(100), 2)
+        self.assertEqual(next(it), 0)
+        time.sleep(0.5)
+        self.assertEqual(produced, [0, 1, 2, 3])
+        # The producer stops once the generator is closed
+        it.close()
+        self.assertTrue(closed.wait(5))
+        self.assertEqual(produced, [0, 1, 2, 3])
+
     def test_format_bytes(self):
         self.assertEqual(format_bytes(0), '0.00B')
         self.assertEqual(format_bytes(1000), '1000.00B')
@@ -8,7 +8,18 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-from yt_dlp.extractor import YoutubeIE
+import time
+
+from test.helper import FakeYDL
+from yt_dlp.extractor import YoutubeIE, YoutubeTabIE
+
+
+def _playlist_page(video_ids, continuation):
+    contents = [{'playlistVideoRenderer': {'videoId': video_id}} for video_id in video_ids]
+    if continuation:
+        contents.append({'continuationItemRenderer': {
+            'continuationEndpoint': {'continuationCommand': {'token': continuation}}}})
+    return contents
 
 
 class TestYoutubeMisc(unittest.TestCase):
@@ -21,6 +32,38 @@ def test_youtube_extract(self):
         assertExtractId('http://www.youtube.com/watch?v=BaW_jenozKcsharePLED17F32AD9753930', 'BaW_jenozKc')
         assertExtractId('BaW_jenozKc', 'BaW_jenozKc')
 
+    def test_tab_continuations(self):
+        ie = YoutubeTabIE(FakeYDL())
+        requests = []
+
+        def extract_response(item_id, query, **kwargs):
+            requests.append(query['continuation'])
+            page_num = int(query['continuation'][1:])
+            # Page 2 links back to page 1, unless the feed is endless
+            next_continuation = 'c1' if looping and page_num == 2 else f'c{page_num + 1}'
+            return {'onResponseReceivedActions': [{'appendContinuationItemsAction': {
+                'continuationItems': _playlist_page([f'v{page_num}'], next_continuation)}}]}
+
+        ie._extract_response = extract_response
+        tab = {'content': {'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [
+            {'playlistVideoListRenderer': {'contents': _playlist_page(['v0'], 'c1')}}]}}]}}}
+        entries = lambda: ie._entries(tab, 'PL', {}, None, None)
+
+        looping = True
+        self.assertEqual([entry['id'] for entry in entries()], ['v0', 'v1', 'v2'])
+        self.assertEqual(requests, ['c1', 'c2'])
+
+        # The next pages are fetched ahead, but not further than _CONTINUATION_READ_AHEAD
+        requests.clear()
+        looping = False
+        it = entries()
+        self.assertEqual(next(it)['id'], 'v0')
+        time.sleep(0.5)
+        self.assertEqual(requests, ['c1', 'c2'])
+        it.close()
+        time.sleep(0.5)
+        self.assertEqual(requests, ['c1', 'c2'])
+
 
 if __name__ == '__main__':
     unittest.main()
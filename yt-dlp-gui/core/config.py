@@ -8,7 +8,16 @@ def __init__(self, path="config.json"):
             "download_path": "~/Downloads",
             "cookies_path": "",
             "cookies_from_browser": False,
-            "safe_mode": True
+            "safe_mode": True,
+            # "process": 每个任务一个 yt-dlp 子进程；"embedded": 复用进程内的 YoutubeDL 实例
+            "engine": "process",
+            # 全局限速（所有任务共享，如 "10M"）；留空时安全模式使用 5M
+            "rate_budget": "",
+            # 按聚合吞吐量自动调整同时下载数与分片并发
+            "adaptive_concurrency": False,
+            # 排队期间提前解析元数据（标题/大小/格式），下载时直接开始传输；
+            # 仅用于 "embedded" 引擎，子进程引擎会在进程内多做一次提取
+            "prefetch_metadata": False
         }
         self.load()
 
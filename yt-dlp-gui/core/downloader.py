@@ -6,15 +6,41 @@
 import re
 import shutil
 from .logger import setup_logger
+from .scheduler import parse_rate
 
 logger = setup_logger("Downloader")
 
+# yt-dlp 输出/异常中的关键字 -> 面向用户的错误提示（子进程与内嵌引擎共用）
+_FRIENDLY_ERRORS = [
+    (("cookies are no longer valid",), "Cookie 已失效，请重新导入 Cookie"),
+    (("Sign in to confirm you",), "需要登录验证，请重新导入 Cookie 或使用浏览器 Cookie"),
+    (("No supported JavaScript runtime could be found", "n challenge solving failed"),
+     "缺少 JS 运行时，建议安装 Node.js 后重试"),
+    (("Requested format is not available",), "可用格式为空，请确认 Cookie 有效或尝试更换视频"),
+]
+
+# Prefer MP4 (with fallback)
+FORMAT_PREF = "bv*[ext=mp4]+ba[ext=m4a]/b[ext=mp4]/bv*+ba/b"
+
+
+def friendly_error(message):
+    """把已知的 yt-dlp 错误文本映射为友好提示；未识别返回 None。"""
+    for needles, friendly in _FRIENDLY_ERRORS:
+        if any(n in message for n in needles):
+            return friendly
+    return None
+
+
 class Downloader:
-    def __init__(self, task, output_path, yt_dlp_path, on_progress, on_complete, on_error, config=None):
+    def __init__(self, task, output_path, yt_dlp_path, on_progress, on_complete, on_error, config=None,
+                 concurrent_fragments=None, rate_limiter=None, info_json=None):
         self.task = task
         self.output_path = output_path
         self.yt_dlp_path = yt_dlp_path
         self.config = config
+        self.concurrent_fragments = concurrent_fragments
+        self.rate_limiter = rate_limiter
+        self.info_json = info_json
         self.callbacks = {
             'progress': on_progress,
             'complete': on_complete,
@@ -38,9 +64,7 @@ def start(self):
             "--progress-template", "download:%(progress._percent_str)s %(progress._speed_str)s %(progress._eta_str)s",
             "-c",  # Continue download
         ]
-        # Prefer MP4 (with fallback)
-        format_pref = "bv*[ext=mp4]+ba[ext=m4a]/b[ext=mp4]/bv*+ba/b"
-        cmd.extend(["-f", format_pref])
+        cmd.extend(["-f", FORMAT_PREF])
 
         # 注入 Cookie：优先浏览器 Cookie（Chrome），失败自动回退静态 Cookie
         if hasattr(self, "config") and self.config:
@@ -67,8 +91,16 @@ def start(self):
                 cmd.extend([
                     "--sleep-interval", "2",
                     "--max-sleep-interval", "5",
-                    "--rate-limit", "5M"
                 ])
+                if self.rate_limiter is None:
+                    cmd.extend(["--rate-limit", "5M"])
+
+        # 全局限速：子进程无法动态调整，按最大并发数平分
+        share = self.rate_limiter.share() if self.rate_limiter else None
+        if share:
+            cmd.extend(["--rate-limit", str(int(share))])
+        if self.concurrent_fragments:
+            cmd.extend(["--concurrent-fragments", str(self.concurrent_fragments)])
 
         # If a JS runtime is available, enable it to avoid n-challenge failures
         node_path = shutil.which("node")
@@ -79,7 +111,11 @@ def start(self):
         if "list=" in self.task.url and "index=" in self.task.url:
             cmd.append("--no-playlist")
 
-        cmd.append(self.task.url)
+        if self.info_json:
+            # 已预取元数据：跳过提取，直接开始下载
+            cmd.extend(["--load-info-json", self.info_json])
+        else:
+            cmd.append(self.task.url)
 
         # 生成回退命令（仅当 primary 是浏览器且存在静态 cookie）
         if hasattr(self, "config") and self.config and self._cookie_primary == "browser":
@@ -204,17 +240,9 @@ def _read_output(self):
                             return
 
                     # Detect auth/cookies issues early and abort
-                    if "cookies are no longer valid" in line:
-                        self._abort_with_error("Cookie 已失效，请重新导入 Cookie")
-                        return
-                    if "Sign in to confirm you" in line:
-                        self._abort_with_error("需要登录验证，请重新导入 Cookie 或使用浏览器 Cookie")
-                        return
-                    if "No supported JavaScript runtime could be found" in line or "n challenge solving failed" in line:
-                        self._abort_with_error("缺少 JS 运行时，建议安装 Node.js 后重试")
-                        return
-                    if "Requested format is not available" in line:
-                        self._abort_with_error("可用格式为空，请确认 Cookie 有效或尝试更换视频")
+                    friendly = friendly_error(line)
+                    if friendly:
+                        self._abort_with_error(friendly)
                         return
                     
                     # Parse progress
@@ -231,7 +259,7 @@ def _read_output(self):
                                     progress = 0.0
                                 else:
                                     progress = float(progress_str)
-                                self.callbacks['progress'](progress, speed, eta)
+                                self.callbacks['progress'](progress, speed, eta, parse_rate(speed))
                             except ValueError:
                                 pass
                     elif "[download]" in line and "Destination:" in line:
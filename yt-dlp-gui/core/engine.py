@@ -0,0 +1,281 @@
+import os
+import shutil
+import threading
+from .downloader import FORMAT_PREF, friendly_error
+from .logger import setup_logger
+
+logger = setup_logger("Engine")
+
+try:
+    import yt_dlp
+    from yt_dlp.utils import DownloadCancelled, DownloadError, format_bytes, formatSeconds
+except ImportError:
+    yt_dlp = None
+
+
+def is_available():
+    """内嵌引擎依赖可导入的 yt_dlp 包（源码目录或 pip 安装均可）。"""
+    return yt_dlp is not None
+
+
+def build_params(config, output_path, no_playlist=False, global_rate_limit=False):
+    """
+    把 GUI 配置翻译为 YoutubeDL 参数（与 Downloader 拼接的命令行保持一致）。
+
+    global_rate_limit 为真时由共享的 RateBudget 限速，不再设置单实例的 ratelimit。
+    """
+    params = {
+        "outtmpl": os.path.join(output_path, "%(title)s.%(ext)s"),
+        "format": FORMAT_PREF,
+        "continuedl": True,
+        "noplaylist": no_playlist,
+        "quiet": True,
+        "noprogress": True,
+    }
+    if config:
+        c_path = config.get("cookies_path")
+        if config.get("cookies_from_browser"):
+            params["cookiesfrombrowser"] = ("chrome", None, None, None)
+        elif c_path:
+            params["cookiefile"] = c_path
+
+        # 安全模式/慢速下载 (Unit 005)
+        if config.get("safe_mode"):
+            params.update({
+                "sleep_interval": 2,
+                "max_sleep_interval": 5,
+            })
+            if not global_rate_limit:
+                params["ratelimit"] = 5 * 1024 * 1024
+
+    if shutil.which("node"):
+        params["js_runtimes"] = {"node": {"path": None}}
+    return params
+
+
+def task_params(task, config, output_path, global_rate_limit=False):
+    """单个任务使用的参数（下载与元数据预取共用，保证命中同一组池化实例）。"""
+    # If URL is a playlist item, default to single-video download
+    no_playlist = "list=" in task.url and "index=" in task.url
+    params = build_params(config, output_path, no_playlist, global_rate_limit)
+    c_path = config.get("cookies_path") if config else None
+    if params.get("cookiesfrombrowser") and c_path:
+        params["fallback_cookiefile"] = c_path
+    return params
+
+
+def _params_key(params):
+    return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+
+class _YDLLogger:
+    """把 yt-dlp 的日志转发到 GUI 日志（yt-dlp 的 debug 同时承载普通输出）。"""
+    def debug(self, msg):
+        logger.debug(msg)
+
+    def info(self, msg):
+        logger.debug(msg)
+
+    def warning(self, msg):
+        logger.warning(msg)
+
+    def error(self, msg):
+        logger.error(msg)
+
+
+class _PooledYDL:
+    """池中的一个长驻 YoutubeDL 实例；同一时刻只被一个任务持有。"""
+    def __init__(self, key, ydl, notice=""):
+        self.key = key
+        self.ydl = ydl
+        self.notice = notice
+        self.sink = None  # 当前任务的 progress hook
+        ydl.add_progress_hook(self._hook)
+
+    def _hook(self, status):
+        if self.sink:
+            self.sink(status)
+
+
+class YoutubeDLPool:
+    """
+    长驻 YoutubeDL 实例池。
+
+    实例按参数分组复用：提取器注册表、Cookie、已解析的播放器 JS 等都留在实例里，
+    后续任务无需重新导入和初始化。每个实例同一时刻只分配给一个工作线程。
+    """
+    def __init__(self, max_idle=5):
+        self.max_idle = max_idle
+        self._idle = {}  # params key -> [_PooledYDL]
+        self._lock = threading.Lock()
+
+    def acquire(self, params):
+        key = _params_key(params)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return self._create(key, params)
+
+    def release(self, pooled):
+        pooled.sink = None
+        with self._lock:
+            idle_count = sum(len(v) for v in self._idle.values())
+            if idle_count < self.max_idle:
+                self._idle.setdefault(pooled.key, []).append(pooled)
+                return
+        self._close(pooled)
+
+    def discard(self, pooled):
+        self._close(pooled)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for items in idle.values():
+            for pooled in items:
+                self._close(pooled)
+
+    def _create(self, key, params):
+        logger.info("Creating in-process YoutubeDL instance")
+        params = dict(params)
+        c_path = params.pop("fallback_cookiefile", None)
+        ydl = yt_dlp.YoutubeDL({**params, "logger": _YDLLogger()})
+        if not params.get("cookiesfrombrowser"):
+            return _PooledYDL(key, ydl)
+
+        # 浏览器 Cookie 读取失败：回退静态 Cookie（实例仍以原参数入池，后续任务直接复用）
+        try:
+            _ = ydl.cookiejar  # 访问 cookiejar 属性即加载浏览器 Cookie
+        except Exception as e:
+            logger.warning(f"Browser cookies failed; falling back to static cookie file: {e}")
+            ydl.close()
+            fallback = {k: v for k, v in params.items() if k != "cookiesfrombrowser"}
+            if c_path:
+                fallback["cookiefile"] = c_path
+            ydl = yt_dlp.YoutubeDL({**fallback, "logger": _YDLLogger()})
+            return _PooledYDL(key, ydl, notice="浏览器 Cookie 读取失败，已回退静态 Cookie")
+        return _PooledYDL(key, ydl)
+
+    @staticmethod
+    def _close(pooled):
+        try:
+            pooled.ydl.close()
+        except Exception:
+            pass
+
+
+class EmbeddedDownloader:
+    """
+    在工作线程中用池化的 YoutubeDL 执行任务，接口与 Downloader 相同。
+
+    进度直接取自 progress_hooks 的结构化字典，不再解析子进程输出。
+    暂停/取消通过 progress hook 实现：暂停时阻塞在 hook 中，取消时抛出 DownloadCancelled。
+    """
+    def __init__(self, task, output_path, pool, on_progress, on_complete, on_error, config=None,
+                 concurrent_fragments=None, rate_limiter=None, info_json=None):
+        self.task = task
+        self.output_path = output_path
+        self.pool = pool
+        self.config = config
+        self.concurrent_fragments = concurrent_fragments
+        self.rate_limiter = rate_limiter
+        self.info_json = info_json
+        self._last_bytes = 0
+        self.callbacks = {
+            'progress': on_progress,
+            'complete': on_complete,
+            'error': on_error
+        }
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._paused = False
+        self._cancelled = False
+
+    def start(self):
+        c_path = self.config.get("cookies_path") if self.config else None
+        if c_path and not os.path.exists(c_path):
+            self.callbacks["error"]("Cookie 文件路径无效，请重新导入 Cookie")
+            return
+
+        params = task_params(self.task, self.config, self.output_path, self.rate_limiter is not None)
+
+        try:
+            pooled = self.pool.acquire(params)
+        except Exception as e:
+            logger.error(f"YoutubeDL init failed: {e}")
+            self.callbacks['error'](str(e))
+            return
+
+        if pooled.notice:
+            self.task.notice = pooled.notice
+        pooled.sink = self._on_hook
+        # 分片并发随调度器动态变化，按任务设置，不参与实例分组
+        pooled.ydl.params["concurrent_fragment_downloads"] = self.concurrent_fragments or 1
+        logger.info(f"In-process download started: {self.task.url}")
+        try:
+            if self.info_json:
+                # 已预取元数据；若签名 URL 失效 yt-dlp 会自动按 webpage_url 重新提取
+                pooled.ydl.download_with_info_file(self.info_json)
+            else:
+                pooled.ydl.extract_info(self.task.url, download=True)
+        except DownloadCancelled:
+            self.pool.release(pooled)
+            if not self._cancelled:
+                self.callbacks['error']("下载已中止")
+            return
+        except DownloadError as e:
+            self.pool.release(pooled)
+            self._report_error(str(e))
+            return
+        except Exception as e:
+            # 非预期异常：实例可能处于不确定状态，不放回池中
+            logger.error(f"In-process download crashed: {e}")
+            self.pool.discard(pooled)
+            self._report_error(str(e))
+            return
+
+        self.pool.release(pooled)
+        if not self._cancelled:
+            self.callbacks['complete']()
+
+    def _report_error(self, message):
+        if not self._cancelled:
+            self.callbacks['error'](friendly_error(message) or message)
+
+    def _on_hook(self, status):
+        while not self._resume_event.wait(0.5):
+            if self._cancelled:
+                break
+        if self._cancelled:
+            raise DownloadCancelled()
+        if status.get("status") != "downloading":
+            self._last_bytes = 0
+            return
+
+        downloaded = status.get("downloaded_bytes") or 0
+        if self.rate_limiter:
+            # 下载线程阻塞在 hook 中，即实现所有任务共享的全局限速
+            self.rate_limiter.consume(downloaded - self._last_bytes if downloaded >= self._last_bytes else downloaded)
+        self._last_bytes = downloaded
+        total = status.get("total_bytes") or status.get("total_bytes_estimate")
+        progress = 100.0 * downloaded / total if total else 0.0
+        speed = status.get("speed")
+        eta = status.get("eta")
+        self.callbacks['progress'](
+            min(progress, 100.0),
+            f"{format_bytes(speed)}/s" if speed else "NA",
+            formatSeconds(eta) if eta is not None else "NA",
+            speed)
+
+    def pause(self):
+        self._paused = True
+        self._resume_event.clear()
+
+    def resume(self):
+        self._paused = False
+        self._resume_event.set()
+
+    def cancel(self):
+        self._cancelled = True
+        self._resume_event.set()
@@ -0,0 +1,120 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .logger import setup_logger
+
+logger = setup_logger("Prefetch")
+
+# 签名 URL 中的过期时间，例如 YouTube 的 ...&expire=1700000000 或 DASH 清单中的 /expire/1700000000/
+_EXPIRE_RE = re.compile(r"[/?&](?:expire|expires|Expires)[=/](\d{10})\b")
+
+
+def _estimated_size(info):
+    formats = info.get("requested_formats") or [info]
+    sizes = [f.get("filesize") or f.get("filesize_approx") for f in formats]
+    return sum(sizes) if all(sizes) else 0
+
+
+class PrefetchEntry:
+    def __init__(self, info_json, title, size, expires_at):
+        self.info_json = info_json
+        self.title = title
+        self.size = size
+        self.expires_at = expires_at
+
+
+class MetadataPrefetcher:
+    """
+    在下载名额空出之前，用有界线程池提前执行 extract_info(download=False)。
+
+    解析结果写成 info.json 缓存（按签名 URL 的有效期过期），下载阶段通过
+    --load-info-json / download_with_info_file 直接开始传输，无需再次提取。
+    """
+    DEFAULT_TTL = 30 * 60
+    EXPIRY_MARGIN = 2 * 60
+    RETRY_INTERVAL = 5 * 60  # 失败的 URL 过这么久才重新预取
+
+    def __init__(self, pool, workers=2, lookahead=10):
+        self.pool = pool
+        self.lookahead = lookahead
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._cache = {}  # url -> PrefetchEntry
+        self._failed = {}  # url -> 可以重新预取的时间
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._dir = tempfile.mkdtemp(prefix="yt-dlp-gui-prefetch-")
+
+    def submit(self, url, params, on_done):
+        """提交预取；on_done(entry) 在工作线程中调用。返回是否真正提交。"""
+        with self._lock:
+            if url in self._inflight or url in self._cache or len(self._inflight) >= self.lookahead:
+                return False
+            if self._failed.get(url, 0) > time.time():
+                return False
+            self._inflight.add(url)
+        self._executor.submit(self._run, url, params, on_done)
+        return True
+
+    def get(self, url):
+        """返回仍在有效期内的缓存条目（用于下载阶段），否则 None。"""
+        with self._lock:
+            return self._valid(self._cache.get(url))
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _valid(self, entry):
+        if entry and entry.expires_at > time.time():
+            return entry
+        return None
+
+    def _run(self, url, params, on_done):
+        entry = None
+        try:
+            entry = self._extract(url, params)
+        except Exception as e:
+            # 预取失败不影响下载阶段，交给正常流程报告错误
+            logger.debug(f"Prefetch failed for {url}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(url)
+                if entry:
+                    self._cache[url] = entry
+                    self._failed.pop(url, None)
+                else:
+                    self._failed[url] = time.time() + self.RETRY_INTERVAL
+        if entry:
+            on_done(entry)
+
+    def _extract(self, url, params):
+        pooled = self.pool.acquire(params)
+        try:
+            ydl = pooled.ydl
+            ie_result = ydl.extract_info(url, download=False, process=False)
+            if ie_result.get("_type") in ("playlist", "multi_video"):
+                # 播放列表只取标题，不在这里展开全部条目
+                return PrefetchEntry(None, ie_result.get("title") or "", 0, 0)
+            info = ydl.process_ie_result(ie_result, download=False)
+            info = ydl.sanitize_info(info)
+        finally:
+            self.pool.release(pooled)
+
+        path = os.path.join(self._dir, f"{info['id']}-{abs(hash(url))}.info.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        return PrefetchEntry(path, info.get("title") or "", _estimated_size(info), self._expires_at(info))
+
+    def _expires_at(self, info):
+        expires_at = time.time() + self.DEFAULT_TTL
+        for f in info.get("requested_formats") or [info]:
+            for url in (f.get("url"), f.get("manifest_url")):
+                m = _EXPIRE_RE.search(url or "")
+                if m:
+                    expires_at = min(expires_at, int(m.group(1)))
+        return expires_at - self.EXPIRY_MARGIN
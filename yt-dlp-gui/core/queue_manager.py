@@ -1,60 +1,207 @@
 import threading
+import time
 import os
 from uuid import uuid4
 from copy import copy
 from .task import Task, TaskStatus
 from .downloader import Downloader
+from . import engine
+from .scheduler import AdaptiveConcurrency, RateBudget, parse_rate
+from .prefetch import MetadataPrefetcher
 from .logger import setup_logger
 
 logger = setup_logger("QueueManager")
 
+class UpdateCoalescer:
+    """
+    合并高频的任务变化通知：同一任务在一个周期内的多次变化只通知一次，
+    整体最多每秒 max_rate 批，避免 5 个下载 x 5Hz 进度把 UI 刷爆。
+    """
+    def __init__(self, callback, max_rate=10):
+        self.callback = callback
+        self.interval = 1.0 / max_rate
+        self._pending = {}  # 有序去重的 task_id 集合
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._stopped = False
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def notify(self, task_id):
+        with self._lock:
+            self._pending[task_id] = None
+            self._event.set()
+
+    def stop(self):
+        self._stopped = True
+        self._event.set()
+
+    def _run(self):
+        while True:
+            self._event.wait()
+            if self._stopped:
+                return
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._event.clear()
+            for task_id in pending:
+                try:
+                    self.callback(task_id)
+                except Exception as e:
+                    logger.error(f"Update callback failed for {task_id}: {e}")
+            time.sleep(self.interval)
+
 class QueueManager:
-    def __init__(self, max_concurrent=5, config=None, yt_dlp_path="./yt-dlp"):
+    def __init__(self, max_concurrent=5, config=None, yt_dlp_path="./yt-dlp", store=None,
+                 max_updates_per_sec=10):
         self.max_concurrent = max_concurrent
         self.config = config
         self.yt_dlp_path = yt_dlp_path
-        self.tasks = []
+        self.store = store # optional TaskStore for persisting the queue
+        self.tasks = store.load() if store else []
+        self._index = {t.id: t for t in self.tasks} # task_id -> Task
         self.active_downloads = {} # task_id -> Downloader
         self.lock = threading.Lock()
-        self.on_update = None # callback(task_id)
+        self.on_update = None # callback(task_id), coalesced to max_updates_per_sec
+        self._updates = UpdateCoalescer(self._dispatch_update, max_updates_per_sec)
+        self.ydl_pool = engine.YoutubeDLPool(max_idle=max_concurrent)
+        self.rate_budget = RateBudget(max_consumers=max_concurrent)
+        self.concurrency = AdaptiveConcurrency(max_active=max_concurrent)
+        self.prefetcher = MetadataPrefetcher(self.ydl_pool) if engine.is_available() else None
+        if self.tasks:
+            self._schedule()
+
+    def _adaptive(self):
+        return bool(self.config and self.config.get("adaptive_concurrency"))
+
+    def _configured_rate_budget(self):
+        if not self.config:
+            return None
+        rate = parse_rate(self.config.get("rate_budget"))
+        if rate is None and self.config.get("safe_mode"):
+            rate = 5 * 1024 * 1024
+        return rate
+
+    def _output_path(self):
+        return self.config.get("download_path") if self.config else "."
+
+    def _prefetch_ahead(self):
+        """为排在最前面的若干等待任务提前解析元数据（与下载名额并行）"""
+        if not self.prefetcher or not self.config or not self.config.get("prefetch_metadata"):
+            return
+        if not self._use_embedded_engine():
+            return
+        c_path = self.config.get("cookies_path")
+        if c_path and not os.path.exists(c_path):
+            return
+        with self.lock:
+            candidates = []
+            for t in self.tasks:
+                if t.status == TaskStatus.PENDING:
+                    candidates.append(t)
+                    if len(candidates) == self.prefetcher.lookahead:
+                        break
+        # 预取与下载须使用相同的参数即相同的池键才能复用同一实例
+        global_rate_limit = self._configured_rate_budget() is not None
+        for task in candidates:
+            params = engine.task_params(task, self.config, self._output_path(), global_rate_limit)
+            self.prefetcher.submit(task.url, params, lambda entry, t=task: self._on_prefetched(t.id, entry))
+
+    def _on_prefetched(self, task_id, entry):
+        task = self.get_task(task_id)
+        if not task:
+            return
+        if entry.title and not task.title:
+            task.title = entry.title
+        if entry.size:
+            task.size = entry.size
+        self._persist(task)
+        self._notify(task_id)
+
+    def _release_slot(self, task_id):
+        self.concurrency.forget(task_id)
+
+    def _notify(self, task_id):
+        self._updates.notify(task_id)
+
+    def _dispatch_update(self, task_id):
+        if self.on_update:
+            self.on_update(task_id)
+
+    def _persist(self, task, progress_only=False):
+        if not self.store:
+            return
+        if progress_only:
+            self.store.touch(task)
+        else:
+            self.store.save(task)
+
+    def _use_embedded_engine(self):
+        if not self.config or self.config.get("engine") != "embedded":
+            return False
+        if not engine.is_available():
+            logger.warning("yt_dlp package is not importable; falling back to subprocess engine")
+            return False
+        return True
 
     def add_task(self, url):
         logger.info(f"New task added: {url}")
         with self.lock:
             task = Task(id=str(uuid4()), url=url)
             self.tasks.append(task)
+            self._index[task.id] = task
+        self._persist(task)
+        self._notify(task.id)
         self._schedule()
         return task.id
 
     def _schedule(self):
         with self.lock:
-            pending = [t for t in self.tasks if t.status == TaskStatus.PENDING]
             active_count = len(self.active_downloads)
-            slots = max(0, self.max_concurrent - active_count)
-            to_start = pending[:slots]
+            limit = self.concurrency.target if self._adaptive() else self.max_concurrent
+            slots = max(0, limit - active_count)
+            to_start = []
+            if slots:
+                # 只扫描到凑满空位为止，不为上千个排队任务建临时列表
+                for t in self.tasks:
+                    if t.status == TaskStatus.PENDING:
+                        to_start.append(t)
+                        if len(to_start) == slots:
+                            break
             
-            logger.debug(f"Scheduling check. Active: {active_count}, Max: {self.max_concurrent}, Pending slots: {slots}")
+            logger.debug(f"Scheduling check. Active: {active_count}, Max: {limit}, Pending slots: {slots}")
 
             # Mark them as starting so we don't start them again if schedule is called quickly
             for task in to_start:
                 task.status = TaskStatus.DOWNLOADING
 
+        for task in to_start:
+            self._persist(task)
+
+        rate = self._configured_rate_budget()
+        self.rate_budget.set_rate(rate)
+        fragments = self.concurrency.fragments_per_task() if self._adaptive() else None
+
         # Start downloads outside lock to avoid deadlocks in callbacks if they call back into manager
         for task in to_start:
             logger.info(f"Starting downloader for task: {task.id}")
-            output_path = self.config.get("download_path") if self.config else "."
-            
-            # Get download path from config
-            output_path = output_path
-            
-            downloader = Downloader(
+            output_path = self._output_path()
+            prefetched = self.prefetcher.get(task.url) if self.prefetcher else None
+
+            if self._use_embedded_engine():
+                downloader_cls, backend = engine.EmbeddedDownloader, self.ydl_pool
+            else:
+                downloader_cls, backend = Downloader, self.yt_dlp_path
+            downloader = downloader_cls(
                 task, 
                 output_path, 
-                self.yt_dlp_path,
-                on_progress=lambda p, s, e, t=task: self._on_progress(t.id, p, s, e),
+                backend,
+                on_progress=lambda p, s, e, bps=None, t=task: self._on_progress(t.id, p, s, e, bps),
                 on_complete=lambda t=task: self._on_complete(t.id),
                 on_error=lambda err, t=task: self._on_error(t.id, err),
-                config=self.config
+                config=self.config,
+                concurrent_fragments=fragments,
+                rate_limiter=self.rate_budget if rate else None,
+                info_json=prefetched.info_json if prefetched else None
             )
             
             with self.lock:
@@ -62,29 +209,36 @@ def _schedule(self):
             
             threading.Thread(target=downloader.start, daemon=True).start()
             
-            if self.on_update:
-                self.on_update(task.id)
+            self._notify(task.id)
 
-    def _on_progress(self, task_id, progress, speed, eta):
+        self._prefetch_ahead()
+
+    def _on_progress(self, task_id, progress, speed, eta, speed_bps=None):
         task = self.get_task(task_id)
         if task:
             task.progress = progress
             task.speed = speed
             task.eta = eta
-            if self.on_update:
-                self.on_update(task_id)
+            self._persist(task, progress_only=True)
+            self._notify(task_id)
+
+        if self._adaptive():
+            self.concurrency.record(task_id, speed_bps)
+            if self.concurrency.tick(len(self.active_downloads), self.rate_budget.rate):
+                self._schedule()
 
     def _on_complete(self, task_id):
         with self.lock:
             if task_id in self.active_downloads:
                 del self.active_downloads[task_id]
+        self._release_slot(task_id)
         
         task = self.get_task(task_id)
         if task:
             task.status = TaskStatus.COMPLETED
             task.progress = 100.0
-            if self.on_update:
-                self.on_update(task_id)
+            self._persist(task)
+            self._notify(task_id)
         
         self._schedule()
 
@@ -92,13 +246,14 @@ def _on_error(self, task_id, error):
         with self.lock:
             if task_id in self.active_downloads:
                 del self.active_downloads[task_id]
+        self._release_slot(task_id)
         
         task = self.get_task(task_id)
         if task:
             task.status = TaskStatus.FAILED
             task.error = error
-            if self.on_update:
-                self.on_update(task_id)
+            self._persist(task)
+            self._notify(task_id)
         
         self._schedule()
 
@@ -109,12 +264,13 @@ def pause_task(self, task_id):
         
         if downloader:
             downloader.pause()
+        self.concurrency.forget(task_id)
             
         task = self.get_task(task_id)
         if task:
             task.status = TaskStatus.PAUSED
-            if self.on_update:
-                self.on_update(task_id)
+            self._persist(task)
+            self._notify(task_id)
 
     def resume_task(self, task_id):
         downloader = None
@@ -126,9 +282,12 @@ def resume_task(self, task_id):
             
         task = self.get_task(task_id)
         if task:
-            task.status = TaskStatus.DOWNLOADING
-            if self.on_update:
-                self.on_update(task_id)
+            # 从持久化队列恢复的暂停任务没有下载器，重新排队即可（-c 会续传）
+            task.status = TaskStatus.DOWNLOADING if downloader else TaskStatus.PENDING
+            self._persist(task)
+            self._notify(task_id)
+            if not downloader:
+                self._schedule()
 
     def cancel_task(self, task_id):
         downloader = None
@@ -136,6 +295,7 @@ def cancel_task(self, task_id):
             if task_id in self.active_downloads:
                 downloader = self.active_downloads[task_id]
                 del self.active_downloads[task_id]
+        self._release_slot(task_id)
         
         if downloader:
             downloader.cancel()
@@ -143,8 +303,8 @@ def cancel_task(self, task_id):
         task = self.get_task(task_id)
         if task:
             task.status = TaskStatus.CANCELLED
-            if self.on_update:
-                self.on_update(task_id)
+            self._persist(task)
+            self._notify(task_id)
         
         self._schedule()
 
@@ -155,17 +315,28 @@ def retry_task(self, task_id):
                 task.status = TaskStatus.PENDING
                 task.progress = 0
                 task.error = ""
-            if self.on_update:
-                self.on_update(task_id)
+            self._persist(task)
+            self._notify(task_id)
             self._schedule()
 
     def get_task(self, task_id):
-        with self.lock:
-            for t in self.tasks:
-                if t.id == task_id:
-                    return t
-        return None
+        # dict lookups are atomic, no need to take the lock on every progress callback
+        return self._index.get(task_id)
 
     def get_all_tasks(self):
         with self.lock:
             return copy(self.tasks)
+
+    def get_tasks_from(self, start):
+        """Tasks added after the first `start` ones (tasks are only ever appended)."""
+        with self.lock:
+            return self.tasks[start:]
+
+    def shutdown(self):
+        """Flush the persistent queue and release pooled in-process YoutubeDL instances."""
+        self._updates.stop()
+        if self.prefetcher:
+            self.prefetcher.close()
+        if self.store:
+            self.store.close()
+        self.ydl_pool.close()
@@ -0,0 +1,136 @@
+import re
+import threading
+import time
+from .logger import setup_logger
+
+logger = setup_logger("Scheduler")
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_rate(text):
+    """解析 "5M" / "2.30MiB/s" / "800KB" 之类的字节数或速率；无法解析返回 None。"""
+    if not text:
+        return None
+    m = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)(?:i?B)?(?:/s)?\s*", str(text), re.IGNORECASE)
+    if not m:
+        return None
+    try:
+        return float(m.group(1)) * _UNITS[m.group(2).upper()]
+    except ValueError:
+        return None
+
+
+class RateBudget:
+    """
+    所有任务共享的全局限速（令牌桶）。
+
+    内嵌引擎在 progress hook 中调用 consume() 阻塞下载线程；
+    子进程引擎无法动态限速，每个任务按最大并发数分得固定的份额（share()），
+    这样无论任务何时启动，总速率都不会超过全局限速。
+    """
+    def __init__(self, rate=None, max_consumers=1, burst_seconds=1.0):
+        self.rate = rate
+        self.max_consumers = max_consumers
+        self.burst_seconds = burst_seconds
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self.rate = rate
+
+    def share(self):
+        with self._lock:
+            if not self.rate:
+                return None
+            return self.rate / max(1, self.max_consumers)
+
+    def consume(self, nbytes):
+        if nbytes <= 0:
+            return
+        with self._lock:
+            if not self.rate:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.rate * self.burst_seconds, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= nbytes
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """
+    根据聚合吞吐量调整同时下载的任务数（爬山法）。
+
+    每个观测窗口比较聚合吞吐量：上升则沿当前方向继续加/减一个任务，
+    明显下降（拥塞导致吞吐崩溃）则掉头，变化不大说明链路已饱和则保持。
+    总连接数 max_connections 在活动任务间平分，任务越少每个任务的分片并发越高。
+    """
+    GAIN_THRESHOLD = 0.05
+    LOSS_THRESHOLD = 0.10
+
+    def __init__(self, min_active=1, max_active=5, initial=2, window=10.0,
+                 max_connections=16, max_fragments=8):
+        self.min_active = min_active
+        self.max_active = max_active
+        self.target = max(min_active, min(initial, max_active))
+        self.window = window
+        self.max_connections = max_connections
+        self.max_fragments = max_fragments
+        self._speeds = {}  # task_id -> latest bytes/s
+        self._direction = 1
+        self._last_throughput = None
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, task_id, speed):
+        if speed is not None:
+            with self._lock:
+                self._speeds[task_id] = speed
+
+    def forget(self, task_id):
+        with self._lock:
+            self._speeds.pop(task_id, None)
+
+    def throughput(self):
+        with self._lock:
+            return sum(self._speeds.values())
+
+    def fragments_per_task(self):
+        return max(1, min(self.max_fragments, self.max_connections // max(1, self.target)))
+
+    def tick(self, active_count, rate_limit=None):
+        """每个观测窗口调整一次 target；target 增大时返回 True（调用方应重新调度）。"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._window_start < self.window:
+                return False
+            self._window_start = now
+            throughput = sum(self._speeds.values())
+            last, self._last_throughput = self._last_throughput, throughput
+            old_target = self.target
+
+            if active_count < self.target:
+                # 排队任务不足以占满名额，观测结果没有参考价值
+                return False
+            if rate_limit and throughput >= 0.9 * rate_limit:
+                # 已触及全局限速，再加任务只会互相抢带宽
+                return False
+            if last:
+                change = (throughput - last) / last
+                if change < -self.LOSS_THRESHOLD:
+                    self._direction = -self._direction
+                elif change < self.GAIN_THRESHOLD:
+                    return False
+                self.target = max(self.min_active, min(self.max_active, self.target + self._direction))
+            else:
+                self.target = min(self.max_active, self.target + 1)
+
+        if self.target != old_target:
+            logger.info(f"Adaptive concurrency: {old_target} -> {self.target} "
+                        f"(throughput {throughput / 1024 / 1024:.2f} MiB/s)")
+        return self.target > old_target
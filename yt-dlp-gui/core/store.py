@@ -0,0 +1,96 @@
+import json
+import sqlite3
+import threading
+from .task import Task, TaskStatus
+from .logger import setup_logger
+
+logger = setup_logger("TaskStore")
+
+
+class TaskStore:
+    """
+    基于 SQLite (WAL) 的任务队列持久化。
+
+    - 状态变化（添加/开始/完成/失败/暂停/取消）立即写入对应的单行；
+    - 进度变化只标记为脏，由后台线程每 flush_interval 秒合并成一个事务写入，
+      避免 5Hz 的进度回调变成每秒多次 fsync；
+    - 启动时直接从数据库恢复队列，不需要重新探测 URL。
+    """
+    def __init__(self, path, flush_interval=2.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 下 NORMAL 只在 checkpoint 时 fsync，崩溃最多丢失最后几次进度
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "id TEXT NOT NULL UNIQUE, "
+            "status TEXT NOT NULL, "
+            "data TEXT NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._dirty = {}  # task_id -> Task
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def load(self):
+        """按添加顺序恢复任务；上次退出时仍在下载的任务重新排队。"""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM tasks ORDER BY seq").fetchall()
+        tasks = []
+        for (data,) in rows:
+            try:
+                task = Task.from_dict(json.loads(data))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping corrupt task row: {e}")
+                continue
+            if task.status == TaskStatus.DOWNLOADING:
+                task.status = TaskStatus.PENDING
+                task.speed = ""
+                task.eta = ""
+            tasks.append(task)
+        logger.info(f"Restored {len(tasks)} tasks from {self.path}")
+        return tasks
+
+    def save(self, task):
+        """立即写入单个任务（用于状态变化）。"""
+        with self._lock:
+            self._dirty.pop(task.id, None)
+            self._write([task])
+
+    def touch(self, task):
+        """标记任务进度已变化，稍后批量写入。"""
+        with self._lock:
+            self._dirty[task.id] = task
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = list(self._dirty.values()), {}
+            if dirty:
+                self._write(dirty)
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, tasks):
+        rows = [(t.id, t.status.value, json.dumps(t.to_dict(), ensure_ascii=False)) for t in tasks]
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO tasks (id, status, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET status = excluded.status, data = excluded.data",
+                    rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to persist tasks: {e}")
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
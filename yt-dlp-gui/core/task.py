@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from typing import Optional, Any
 import subprocess
 
@@ -23,16 +23,16 @@ class Task:
     eta: str = ""
     error: str = ""
     notice: str = ""
+    size: int = 0 # estimated bytes, filled in by metadata prefetch
     
     # Non-serializable field
     process: Optional[subprocess.Popen] = field(default=None, repr=False, compare=False)
 
     def to_dict(self):
         """Convert to dictionary for serialization, excluding process."""
-        data = asdict(self)
+        # asdict() would deep-copy the live Popen handle, so build the dict by hand
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'process'}
         data['status'] = self.status.value
-        if 'process' in data:
-            del data['process']
         return data
 
     @classmethod
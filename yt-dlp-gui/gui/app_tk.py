@@ -11,6 +11,7 @@
 
 from core.config import Config
 from core.queue_manager import QueueManager
+from core.store import TaskStore
 from core.task import TaskStatus
 
 
@@ -90,6 +91,8 @@ def _get_status_text(self):
             return "已暂停"
         if s == TaskStatus.CANCELLED:
             return "已取消"
+        if self.task.size:
+            return f"等待中 | 约 {self.task.size / 1024 / 1024:.1f} MiB"
         return "等待中"
 
     def _get_action_text(self):
@@ -601,7 +604,8 @@ def _init_backend(self):
         self.queue_manager = QueueManager(
             max_concurrent=5,
             config=self.config,
-            yt_dlp_path=self.yt_dlp_path
+            yt_dlp_path=self.yt_dlp_path,
+            store=TaskStore(os.path.join(_parent_dir, "queue.db"))
         )
         self.queue_manager.on_update = self._on_task_update
 
@@ -670,4 +674,5 @@ def _open_settings(self):
         SettingsDialog(self, self.config)
 
     def _on_close(self):
+        self.queue_manager.shutdown()
         self.destroy()
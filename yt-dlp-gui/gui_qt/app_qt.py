@@ -8,6 +8,7 @@
 
 from core.config import Config
 from core.queue_manager import QueueManager
+from core.store import TaskStore
 from core.task import TaskStatus
 from .models import TaskListModel
 from .settings_qt import SettingsDialog
@@ -18,6 +19,7 @@
 class UiBridge(QObject):
     """用于跨线程安全触发 UI 刷新（避免在非主线程直接操作 Qt Widgets 导致崩溃）"""
     refresh_requested = Signal()
+    task_changed = Signal(str)
 
 class TaskDelegate(QStyledItemDelegate):
     """自定义任务渲染委派"""
@@ -62,6 +64,8 @@ def paint(self, painter, option, index):
             status_text = f"❌ 失败: {task.error[:60]}"
         elif task.status == TaskStatus.COMPLETED:
             status_text = "✅ 下载完成"
+        elif task.status == TaskStatus.PENDING and getattr(task, "size", 0):
+            status_text = f"{status_text} | 约 {task.size / 1024 / 1024:.1f} MiB"
         
         status_rect = rect.adjusted(10, 55, -10, -5)
         painter.drawText(status_rect, Qt.AlignLeft | Qt.AlignVCenter, status_text)
@@ -83,7 +87,9 @@ def __init__(self, yt_dlp_path):
         _root_dir = os.path.dirname(_gui_dir)
         config_path = os.path.join(_root_dir, "config.json")
         self.config = Config(config_path)
-        self.queue_manager = QueueManager(max_concurrent=5, config=self.config, yt_dlp_path=yt_dlp_path)
+        self.queue_manager = QueueManager(
+            max_concurrent=5, config=self.config, yt_dlp_path=yt_dlp_path,
+            store=TaskStore(os.path.join(_root_dir, "queue.db")))
         self._cookie_error_prompted = False
         self._last_clicked_task_id = None
         
@@ -95,9 +101,11 @@ def __init__(self, yt_dlp_path):
         self.timer.start(1000)
 
         # 主动回调刷新（更及时）——必须跨线程安全，不能在下载线程直接操作 Qt Widgets
+        # QueueManager 已将通知合并为每任务每周期一次，这里只更新变化的行
         self._ui_bridge = UiBridge()
         self._ui_bridge.refresh_requested.connect(self._refresh_ui)
-        self.queue_manager.on_update = lambda _tid: self._ui_bridge.refresh_requested.emit()
+        self._ui_bridge.task_changed.connect(self._on_task_changed)
+        self.queue_manager.on_update = self._ui_bridge.task_changed.emit
 
     def _init_ui(self):
         central = QWidget()
@@ -190,37 +198,29 @@ def _open_settings(self):
             logger.info("Settings saved, cleared cookie error state")
 
     def _refresh_ui(self):
-        # 保存当前选中任务的 ID
-        selected_id = self._get_selected_id()
-        if not selected_id and self._last_clicked_task_id:
-            selected_id = self._last_clicked_task_id
-        
-        self.model.refresh(self.queue_manager.get_all_tasks())
-        
-        # 恢复选中状态
-        if selected_id:
-            for row in range(self.model.rowCount()):
-                index = self.model.index(row, 0)
-                task = self.model.data(index, Qt.UserRole)
-                if task and task.id == selected_id:
-                    # 使用 QItemSelectionModel 兼容 PySide6
-                    from PySide6.QtCore import QItemSelectionModel
-                    self.list_view.selectionModel().select(index, QItemSelectionModel.ClearAndSelect)
-                    self.list_view.setCurrentIndex(index)
-                    break
-        
+        # 只追加新任务；已有行由 dataChanged 增量刷新，选中状态无需重置/恢复
+        self.model.append_tasks(self.queue_manager.get_tasks_from(self.model.rowCount()))
+
+    def _on_task_changed(self, task_id):
+        task = self.queue_manager.get_task(task_id)
+        if not task:
+            return
+        if self.model.row_of(task_id) is None:
+            # 更新先于定时刷新到达：按队列顺序补齐之前的任务，模型始终是任务列表的前缀
+            self._refresh_ui()
+        else:
+            self.model.task_changed(task)
+
         # Detect cookie invalid errors and prompt user once
-        for task in self.queue_manager.get_all_tasks():
-            if getattr(task, "error", "") and "Cookie 已失效" in task.error:
-                if not self._cookie_error_prompted:
-                    self._cookie_error_prompted = True
-                    def _prompt():
-                        self._show_cookie_prompt(task.id)
-                    QTimer.singleShot(0, _prompt)
-                    # 非弹窗提示条
-                    self.error_banner.setText("Cookie 已失效，请重新导入 Cookie（点击设置导入）")
-                    self.error_banner.setVisible(True)
-                break
+        if getattr(task, "error", "") and "Cookie 已失效" in task.error:
+            if not self._cookie_error_prompted:
+                self._cookie_error_prompted = True
+                def _prompt():
+                    self._show_cookie_prompt(task.id)
+                QTimer.singleShot(0, _prompt)
+                # 非弹窗提示条
+                self.error_banner.setText("Cookie 已失效，请重新导入 Cookie（点击设置导入）")
+                self.error_banner.setVisible(True)
 
     def _show_cookie_prompt(self, task_id):
         msg = QMessageBox(self)
@@ -271,4 +271,5 @@ def _on_retry(self):
         if tid: self.queue_manager.retry_task(tid)
 
     def closeEvent(self, event):
+        self.queue_manager.shutdown()
         super().closeEvent(event)
@@ -5,6 +5,7 @@ class TaskListModel(QAbstractListModel):
     def __init__(self, tasks=None):
         super().__init__()
         self.tasks = tasks or []
+        self._rows = {t.id: row for row, t in enumerate(self.tasks)} # task_id -> row
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.tasks)
@@ -23,4 +24,30 @@ def data(self, index, role=Qt.DisplayRole):
     def refresh(self, new_tasks):
         self.beginResetModel()
         self.tasks = new_tasks
+        self._rows = {t.id: row for row, t in enumerate(self.tasks)}
         self.endResetModel()
+
+    def append_tasks(self, new_tasks):
+        """追加新任务（只插入新增行，不重置整个模型）"""
+        new_tasks = [t for t in new_tasks if t.id not in self._rows]
+        if not new_tasks:
+            return
+        first = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_tasks) - 1)
+        for task in new_tasks:
+            self._rows[task.id] = len(self.tasks)
+            self.tasks.append(task)
+        self.endInsertRows()
+
+    def task_changed(self, task):
+        """单个任务变化：只发出该行的 dataChanged；尚未同步的任务由 append_tasks 按队列顺序追加"""
+        row = self._rows.get(task.id)
+        if row is None:
+            return
+        # 任务对象与 QueueManager 共享，重绘即可读到最新字段
+        self.tasks[row] = task
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def row_of(self, task_id):
+        return self._rows.get(task_id)
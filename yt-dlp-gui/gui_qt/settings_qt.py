@@ -52,6 +52,23 @@ def _init_ui(self):
         self.cb_safe.setChecked(self.config.get("safe_mode") is not False) # 默认开启
         layout.addWidget(self.cb_safe)
 
+        # 下载引擎
+        self.cb_embedded = QCheckBox("使用内嵌下载引擎 (复用 yt-dlp 实例，任务启动更快)")
+        self.cb_embedded.setChecked(self.config.get("engine") == "embedded")
+        layout.addWidget(self.cb_embedded)
+
+        # 带宽调度
+        self.cb_adaptive = QCheckBox("自动调整同时下载数 (按总吞吐量)")
+        self.cb_adaptive.setChecked(bool(self.config.get("adaptive_concurrency")))
+        layout.addWidget(self.cb_adaptive)
+
+        rate_layout = QHBoxLayout()
+        rate_layout.addWidget(QLabel("全局限速 (所有任务共享，如 10M，留空不限/安全模式 5M):"))
+        self.edit_rate = QLineEdit()
+        self.edit_rate.setText(self.config.get("rate_budget") or "")
+        rate_layout.addWidget(self.edit_rate)
+        layout.addLayout(rate_layout)
+
         layout.addStretch()
 
         # 保存按钮
@@ -96,4 +113,7 @@ def _save_settings(self):
         self.config.set("download_path", path)
         self.config.set("safe_mode", self.cb_safe.isChecked())
         self.config.set("cookies_from_browser", self.cb_browser_cookie.isChecked())
+        self.config.set("engine", "embedded" if self.cb_embedded.isChecked() else "process")
+        self.config.set("adaptive_concurrency", self.cb_adaptive.isChecked())
+        self.config.set("rate_budget", self.edit_rate.text().strip())
         self.accept()
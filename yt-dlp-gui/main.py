@@ -5,10 +5,13 @@
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
+# 内嵌下载引擎需要导入源码目录中的 yt_dlp 包
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
 
 def main():
     # Detect yt-dlp executable
-    parent_dir = os.path.dirname(current_dir)
     yt_dlp_path = os.path.join(parent_dir, "yt-dlp")
     # Ensure Homebrew paths are visible when launching via .app (Finder PATH is minimal)
     brew_paths = ["/opt/homebrew/bin", "/usr/local/bin"]
@@ -1,15 +1,18 @@
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime as dt
 import errno
 import fileinput
 import functools
+import hashlib
 import http.cookiejar
 import io
 import itertools
 import json
 import locale
+import math
 import operator
 import os
 import random
@@ -19,18 +22,21 @@
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import tokenize
 import traceback
 import unicodedata
 
+from .archive import open_download_archive, read_text_archive
 from .cache import Cache
 from .compat import urllib  # isort: split
 from .compat import urllib_req_to_req
 from .cookies import CookieLoadError, LenientSimpleCookie, load_cookies
-from .downloader import FFmpegFD, get_suitable_downloader, shorten_protocol_name
+from .downloader import FFmpegFD, FileDownloader, get_suitable_downloader, shorten_protocol_name
 from .downloader.rtmp import rtmpdump_version
 from .extractor import gen_extractor_classes, get_info_extractor, import_extractors
+from .extractor._url_index import URLIndex
 from .extractor.common import UnsupportedURLIE
 from .extractor.openload import PhantomJSwrapper
 from .globals import (
@@ -46,7 +52,7 @@
     supported_remote_components,
 )
 from .minicurses import format_text
-from .networking import HEADRequest, Request, RequestDirector
+from .networking import HEADRequest, Request, RequestDirector, _load_optional_handlers
 from .networking.common import _REQUEST_HANDLERS, _RH_PREFERENCES
 from .networking.exceptions import (
     HTTPError,
@@ -58,7 +64,6 @@
 from .networking.impersonate import ImpersonateRequestHandler, ImpersonateTarget
 from .plugins import directories as plugin_directories, load_all_plugins
 from .postprocessor import (
-    EmbedThumbnailPP,
     FFmpegFixupDuplicateMoovPP,
     FFmpegFixupDurationPP,
     FFmpegFixupM3u8PP,
@@ -136,7 +141,6 @@
     iri_to_uri,
     is_path_like,
     join_nonempty,
-    locked_file,
     make_archive_id,
     make_dir,
     number_of_digits,
@@ -176,6 +180,7 @@
     clean_proxies,
     std_headers,
 )
+from .utils.progress import CombinedProgress
 from .version import CHANNEL, ORIGIN, RELEASE_GIT_HEAD, VARIANT, __version__
 
 if os.name == 'nt':
@@ -196,6 +201,99 @@ def wrapper(self, *args, **kwargs):
     return wrapper
 
 
+class _EntryCancelled(DownloadCancelled):
+    msg = 'An earlier entry stopped the processing of the playlist'
+
+
+class _EntryTurns:
+    """
+    Orders the decisions of concurrently processed playlist entries
+
+    An entry takes its turn before it is counted and checked against the archive and
+    filters, and passes it on once it is counted as a download (or when it finishes).
+    Entries only take their turn once the entries before them have passed theirs and,
+    if the earlier entries that are still running could still reach --max-downloads
+    or --skip-playlist-after-errors, have finished; so every decision sees the same
+    state as with sequential processing.
+    """
+
+    def __init__(self, workers, max_failures):
+        self.workers, self.max_failures = workers, max_failures
+        self._cond = threading.Condition()
+        self._next = 0  # the entry whose turn it is
+        self._over = set()  # entries after _next whose turn is already over
+        self._running, self._failed = set(), set()
+        self._stop_after = float('inf')
+        self._aborted = False
+        self._free_lines = list(range(workers))[::-1]
+        self._printer = None
+
+    def _end_turn(self, seq):
+        self._over.add(seq)
+        while self._next in self._over:
+            self._over.remove(self._next)
+            self._next += 1
+
+    def check(self, seq=None):
+        if self._aborted or (seq is not None and seq > self._stop_after):
+            raise _EntryCancelled
+
+    def take(self, seq, must_drain):
+        """Wait for the turn of the entry; must_drain() tells whether the running entries must finish first"""
+        with self._cond:
+            while True:
+                self.check(seq)
+                if self._next == seq:
+                    failures = sum(s < seq for s in self._failed)
+                    if failures >= self.max_failures:
+                        raise _EntryCancelled
+                    running = len(self._running)
+                    if not running or (failures + running < self.max_failures and not must_drain()):
+                        return
+                self._cond.wait()
+
+    def pass_on(self, seq):
+        with self._cond:
+            self._running.add(seq)
+            self._end_turn(seq)
+            self._cond.notify_all()
+
+    def finish(self, seq, failed=False, stop=False):
+        with self._cond:
+            self._running.discard(seq)
+            if failed:
+                self._failed.add(seq)
+            if stop:
+                self._stop_after = min(self._stop_after, seq)
+            if seq >= self._next:
+                self._end_turn(seq)
+            self._cond.notify_all()
+
+    def abort(self):
+        """Cancel all the entries that are still waiting or downloading"""
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+    def take_line(self):
+        with self._cond:
+            return self._free_lines.pop()
+
+    def release_line(self, line):
+        with self._cond:
+            self._free_lines.append(line)
+
+    def status_printer(self, create_printer):
+        with self._cond:
+            if self._printer is None:
+                self._printer = create_printer(self.workers)
+            return self._printer
+
+    def end_status(self):
+        if self._printer is not None:
+            self._printer.end()
+
+
 class YoutubeDL:
     """YoutubeDL class.
 
@@ -293,6 +391,22 @@ class YoutubeDL:
     playlist_items:    Specific indices of playlist to download.
     playlistrandom:    Download playlist items in random order.
     lazy_playlist:     Process playlist entries as they are received.
+    sync_playlists:    Process only the entries of each playlist that are newer
+                       than those processed by the previous run with this
+                       option, which are remembered in the cache
+    concurrent_entries: Number of playlist entries to extract and download
+                       concurrently. Archive, filters, max_downloads and
+                       skip_playlist_after_errors behave as when processing
+                       them one by one
+    concurrent_formats: Download the formats that are to be merged at the same
+                       time, sharing concurrent_fragment_downloads and ratelimit
+    stream_merge:      Merge the formats with ffmpeg while they are being downloaded
+                       natively, through named pipes. Formats that can't be streamed
+                       or must be resumed are merged after downloading
+    concurrent_side_downloads: Number of subtitles and thumbnails of a video that
+                       are downloaded at the same time. When more than 1, they are
+                       also downloaded along with the video where nothing before
+                       the postprocessors needs them
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            A class having a `debug`, `warning` and `error` function where
@@ -328,6 +442,7 @@ class YoutubeDL:
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    cache_stats:       Print the hit and miss rates of the cache sections when closing
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -342,6 +457,11 @@ class YoutubeDL:
                        downloaded. None for no limit.
     download_archive:  A set, or the name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded again.
+                       Files with a .db/.sqlite/.sqlite3 extension are created as
+                       SQLite databases, which are not loaded into memory
+    claim_downloads:   Claim each video in the (SQLite) download_archive before
+                       downloading it, so that other processes sharing the
+                       archive skip it
     break_on_existing: Stop the download process after attempting to download a
                        file that is in the archive.
     break_per_url:     Whether break_on_reject and break_on_existing
@@ -512,8 +632,8 @@ class YoutubeDL:
     the downloader (see yt_dlp/downloader/common.py):
     nopart, updatetime, buffersize, ratelimit, throttledratelimit, min_filesize,
     max_filesize, test, noresizebuffer, retries, file_access_retries, fragment_retries,
-    continuedl, hls_use_mpegts, http_chunk_size, external_downloader_args,
-    concurrent_fragment_downloads, progress_delta.
+    continuedl, hls_use_mpegts, http_chunk_size, http_connections, external_downloader_args,
+    concurrent_fragment_downloads, decryption_processes, progress_delta.
 
     The following options are used by the post processors:
     ffmpeg_location:   Location of the ffmpeg binary; either the path
@@ -591,6 +711,13 @@ class YoutubeDL:
     no_overwrites:     Same as `overwrites=False`
     """
 
+    # Without lazy extractors, deriving the URL index from the regexes costs as much
+    # as a few hundred linear scans, so it is only worthwhile for large batches
+    _URL_INDEX_MIN_LOOKUPS = 250
+
+    # The newest entries of a playlist that sync_playlists remembers, in case some of them are removed
+    _PLAYLIST_SYNC_IDS = 10
+
     _NUMERIC_FIELDS = {
         'width', 'height', 'asr', 'audio_channels', 'fps',
         'tbr', 'abr', 'vbr', 'filesize', 'filesize_approx',
@@ -636,6 +763,7 @@ def __init__(self, params=None, auto_init=True):
         self.params = params
         self._ies = {}
         self._ies_instances = {}
+        self._url_index, self._url_lookups = None, 0
         self._pps = {k: [] for k in POSTPROCESS_WHEN}
         self._printed_messages = set()
         self._first_webpage_request = True
@@ -648,7 +776,10 @@ def __init__(self, params=None, auto_init=True):
         self._num_videos = 0
         self._playlist_level = 0
         self._playlist_urls = set()
+        self._entry_local = threading.local()  # State of the playlist entry processed by this thread
         self.cache = Cache(self)
+        if self.params.get('cache_stats'):
+            self.add_close_hook(self.cache.report_stats)
         self.__header_cookies = []
 
         # compat for API: load plugins if they have not already
@@ -832,23 +963,21 @@ def check_deprecated(param, option, suggestion):
 
         def preload_download_archive(fn):
             """Preload the archive, if any is specified"""
-            archive = set()
             if fn is None:
-                return archive
+                return set()
             elif not is_path_like(fn):
                 return fn
 
             self.write_debug(f'Loading archive file {fn!r}')
-            try:
-                with locked_file(fn, 'r', encoding='utf-8') as archive_file:
-                    for line in archive_file:
-                        archive.add(line.strip())
-            except OSError as ioe:
-                if ioe.errno != errno.ENOENT:
-                    raise
+            archive = open_download_archive(fn)
+            self.add_close_hook(archive.close)
             return archive
 
         self.archive = preload_download_archive(self.params.get('download_archive'))
+        self._claim_downloads = self.params.get('claim_downloads')
+        if self._claim_downloads and not callable(getattr(self.archive, 'claim', None)):
+            self.report_warning('Downloads can only be claimed in a SQLite download archive; not claiming them')
+            self._claim_downloads = False
 
     def _clean_js_runtimes(self, runtimes):
         if not (
@@ -898,6 +1027,8 @@ def warn_if_short_id(self, argv):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         ie_key = ie.ie_key()
+        if ie_key not in self._ies:
+            self._url_index = None
         self._ies[ie_key] = ie
         if not isinstance(ie, type):
             self._ies_instances[ie_key] = ie
@@ -1069,6 +1200,9 @@ def trouble(self, message=None, tb=None, is_error=True):
         @param tb          If given, is additional traceback information
         @param is_error    Whether to raise error according to ignorerrors
         """
+        if is_error:
+            # Errors of concurrently processed playlist entries are reported in order
+            self._take_entry_turn()
         if message is not None:
             self.to_stderr(message)
         if self.params.get('verbose'):
@@ -1266,8 +1400,10 @@ def prepare_outtmpl(self, outtmpl, info_dict, sanitize=False):
             formatSeconds(info_dict['duration'], '-' if sanitize else ':')
             if info_dict.get('duration', None) is not None
             else None)
-        info_dict['autonumber'] = int(self.params.get('autonumber_start', 1) - 1 + self._num_downloads)
-        info_dict['video_autonumber'] = self._num_videos
+        counters = vars(self._entry_local)
+        info_dict['autonumber'] = int(
+            self.params.get('autonumber_start', 1) - 1 + counters.get('num_downloads', self._num_downloads))
+        info_dict['video_autonumber'] = counters.get('num_videos', self._num_videos)
         if info_dict.get('resolution') is None:
             info_dict['resolution'] = self.format_resolution(info_dict, default=None)
 
@@ -1543,6 +1679,7 @@ def prepare_filename(self, info_dict, dir_type='', *, outtmpl=None, warn=False):
 
     def _match_entry(self, info_dict, incomplete=False, silent=False):
         """Returns None if the file should be downloaded"""
+        self._take_entry_turn()
         _type = 'video' if 'playlist-match-filter' in self.params['compat_opts'] else info_dict.get('_type', 'video')
         assert incomplete or _type == 'video', 'Only video result can be considered complete'
 
@@ -1665,11 +1802,12 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
             ie_key = 'Generic'
 
         if ie_key:
-            ies = {ie_key: self._ies[ie_key]} if ie_key in self._ies else {}
+            ies = [ie_key] if ie_key in self._ies else []
         else:
-            ies = self._ies
+            ies = self._candidate_ies(url)
 
-        for key, ie in ies.items():
+        for key in ies:
+            ie = self._ies[key]
             if not ie.suitable(url):
                 continue
 
@@ -1690,6 +1828,15 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
             self.report_error(f'No suitable extractor{format_field(ie_key, None, " (%s)")} found for URL {url}',
                               tb=False if extractors_restricted else None)
 
+    def _candidate_ies(self, url):
+        """Return the keys of the extractors that may be suitable for the URL, in the order they must be tried"""
+        if self._url_index is None:
+            self._url_lookups += 1
+            if not LAZY_EXTRACTORS.value and self._url_lookups <= self._URL_INDEX_MIN_LOOKUPS:
+                return list(self._ies)
+            self._url_index = URLIndex(self._ies)
+        return self._url_index.candidates(url)
+
     def _handle_extraction_exceptions(func):
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
@@ -2050,8 +2197,10 @@ def __process_playlist(self, ie_result, download):
             return
         self.to_screen(f'[download] Downloading {ie_result["_type"]}: {title}')
 
+        sync_key = self._playlist_sync_key(ie_result)
+        synced_ids = self.cache.load('playlist-sync', sync_key, default={}).get('ids', []) if sync_key else []
         all_entries = PlaylistEntries(self, ie_result)
-        entries = orderedSet(all_entries.get_requested_items(), lazy=True)
+        entries = orderedSet(all_entries.get_requested_items(stop_at=set(synced_ids)), lazy=True)
 
         lazy = self.params.get('lazy_playlist')
         if lazy:
@@ -2100,46 +2249,74 @@ def __process_playlist(self, ie_result, download):
         if keep_resolved_entries:
             self.write_debug('The information of all playlist entries will be held in memory')
 
-        failures = 0
-        max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
-        for i, (playlist_index, entry) in enumerate(entries):
-            if lazy:
-                resolved_entries.append((playlist_index, entry))
-            if not entry:
-                continue
+        def entries_to_process():
+            for i, (playlist_index, entry) in enumerate(entries):
+                if lazy:
+                    resolved_entries.append((playlist_index, entry))
+                if not entry:
+                    continue
 
-            entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
-            if not lazy and 'playlist-index' in self.params['compat_opts']:
-                playlist_index = ie_result['requested_entries'][i]
+                entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
+                # The videos rejected by the archive or the filters are synced too, not just those processed
+                if sync_key and entry.get('_type', 'video') in ('video', 'url'):
+                    listed_ids.append((playlist_index, entry.get('id')))
+                if not lazy and 'playlist-index' in self.params['compat_opts']:
+                    playlist_index = ie_result['requested_entries'][i]
+
+                entry_copy = collections.ChainMap(entry, {
+                    **common_info,
+                    'n_entries': int_or_none(n_entries),
+                    'playlist_index': playlist_index,
+                    'playlist_autonumber': i + 1,
+                })
 
-            entry_copy = collections.ChainMap(entry, {
-                **common_info,
-                'n_entries': int_or_none(n_entries),
-                'playlist_index': playlist_index,
-                'playlist_autonumber': i + 1,
-            })
+                if self._match_entry(entry_copy, incomplete=True) is not None:
+                    # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
+                    resolved_entries[i] = (playlist_index, NO_DEFAULT)
+                    continue
 
-            if self._match_entry(entry_copy, incomplete=True) is not None:
-                # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
-                resolved_entries[i] = (playlist_index, NO_DEFAULT)
-                continue
+                self.to_screen(
+                    f'[download] Downloading item {self._format_screen(i + 1, self.Styles.ID)} '
+                    f'of {self._format_screen(n_entries, self.Styles.EMPHASIS)}')
 
-            self.to_screen(
-                f'[download] Downloading item {self._format_screen(i + 1, self.Styles.ID)} '
-                f'of {self._format_screen(n_entries, self.Styles.EMPHASIS)}')
-
-            entry_result = self.__process_iterable_entry(entry, download, collections.ChainMap({
-                'playlist_index': playlist_index,
-                'playlist_autonumber': i + 1,
-            }, extra))
-            if not entry_result:
-                failures += 1
-            if failures >= max_failures:
-                self.report_error(
-                    f'Skipping the remaining entries in playlist "{title}" since {failures} items failed extraction')
-                break
-            if keep_resolved_entries:
-                resolved_entries[i] = (playlist_index, entry_result)
+                yield i, playlist_index, entry, collections.ChainMap({
+                    'playlist_index': playlist_index,
+                    'playlist_autonumber': i + 1,
+                }, extra)
+
+        failures = 0
+        max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
+        listed_ids = []  # (playlist_index, id) of the videos that were listed, for sync_playlists
+        workers = self.params.get('concurrent_entries') or 1
+        if workers > 1 and not hasattr(self._entry_local, 'turns'):
+            results = self.__process_entries_concurrently(entries_to_process(), download, workers, max_failures)
+        else:  # Entries of nested playlists are processed by the worker of the outer entry
+            results = (
+                (i, playlist_index, self.__process_iterable_entry(entry, download, extra_info))
+                for i, playlist_index, entry, extra_info in entries_to_process())
+
+        completed = reached_existing = False
+        try:
+            with contextlib.closing(results):
+                for i, playlist_index, entry_result in results:
+                    if not entry_result:
+                        failures += 1
+                    if failures >= max_failures:
+                        self.report_error(
+                            f'Skipping the remaining entries in playlist "{title}" since {failures} items failed extraction')
+                        break
+                    if keep_resolved_entries:
+                        resolved_entries[i] = (playlist_index, entry_result)
+            completed = True
+        except ExistingVideoReached:
+            # The entries that were not processed are older than the one that is already downloaded
+            completed = reached_existing = True
+            raise
+        finally:
+            if sync_key and completed:
+                self._update_playlist_sync(
+                    sync_key, title, synced_ids, listed_ids, len(resolved_entries), failures,
+                    all_entries.reached_known_entry or reached_existing)
 
         # Update with processed data
         ie_result['entries'] = [e for _, e in resolved_entries if e is not NO_DEFAULT]
@@ -2158,11 +2335,131 @@ def __process_playlist(self, ie_result, download):
         self.to_screen(f'[download] Finished downloading playlist: {title}')
         return ie_result
 
+    def _playlist_sync_key(self, ie_result):
+        """The cache key of the entries of the playlist that were synced, or None if it is not synced"""
+        if not self.params.get('sync_playlists') or ie_result['_type'] != 'playlist' or not ie_result.get('id'):
+            return None
+        elif not self.cache.enabled:
+            self.report_warning('Playlists cannot be synced without a cache directory', only_once=True)
+            return None
+        # The tabs of a channel have the same ID
+        url = ie_result.get('webpage_url') or ie_result.get('original_url') or ''
+        extractor = ie_result.get('extractor_key') or ie_result.get('ie_key')
+        return f'{extractor}_{ie_result["id"]}_{hashlib.sha256(url.encode()).hexdigest()[:16]}'
+
+    def _update_playlist_sync(self, sync_key, title, synced_ids, new_ids, n_listed, failures, reached_known_entry):
+        """Remember the newest entries of the playlist, unless some new entries were not processed"""
+        self.to_screen(f'[download] Synced playlist {title}: {n_listed} new entries')
+        playlist_end = self.params.get('playlistend')
+        item, *others = PlaylistEntries.parse_playlist_items(self.params.get('playlist_items') or '{}:{}'.format(
+            self.params.get('playliststart') or 1, '' if playlist_end in (None, -1) else playlist_end))
+        from_start = not others and isinstance(item, slice) and item.start in (None, 1) and item.step in (None, 1)
+        # Otherwise the entries that were skipped would never be processed
+        if (failures or not new_ids or not from_start
+                or (item.stop is not None and not reached_known_entry)):
+            return
+        new_ids = [entry_id for _, entry_id in sorted(new_ids) if entry_id]
+        self.cache.store('playlist-sync', sync_key, {
+            'ids': orderedSet([*new_ids, *synced_ids])[:self._PLAYLIST_SYNC_IDS],
+        })
+
     @_handle_extraction_exceptions
     def __process_iterable_entry(self, entry, download, extra_info):
         return self.process_ie_result(
             entry, download=download, extra_info=extra_info)
 
+    def __process_entries_concurrently(self, entries, download, workers, max_failures):
+        """Process (i, playlist_index, entry, extra_info) in a pool of workers, yielding the results in order"""
+        turns = _EntryTurns(workers, max_failures)
+
+        def process_entry(i, entry, extra_info):
+            local = self._entry_local
+            local.turns, local.seq, local.turn, local.line = turns, i, 'waiting', turns.take_line()
+            try:
+                result = self.__process_iterable_entry(entry, download, extra_info)
+            except _EntryCancelled:
+                turns.finish(i)
+                return NO_DEFAULT
+            except BaseException:
+                turns.finish(i, stop=True)
+                raise
+            else:
+                turns.finish(i, failed=not result)
+                return result
+            finally:
+                turns.release_line(local.line)
+                vars(local).clear()
+
+        if os.name == 'nt':
+            def future_result(future):
+                while True:
+                    try:
+                        return future.result(0.1)
+                    except KeyboardInterrupt:
+                        raise
+                    except concurrent.futures.TimeoutError:
+                        continue
+        else:
+            def future_result(future):
+                return future.result()
+
+        def results(i, playlist_index, future):
+            entry_result = future_result(future)
+            if entry_result is not NO_DEFAULT:
+                yield i, playlist_index, entry_result
+
+        pending = collections.deque()
+        pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='playlist-entry')
+        try:
+            while True:
+                try:
+                    job = next(entries, None)
+                except Exception:
+                    # Like sequential processing, finish the earlier entries first
+                    while pending:
+                        yield from results(*pending.popleft())
+                    raise
+                if job is None:
+                    break
+                i, playlist_index, entry, extra_info = job
+                # Extract a few entries ahead, but don't run too far ahead of the oldest unfinished one
+                while len(pending) >= 2 * workers:
+                    yield from results(*pending.popleft())
+                pending.append((i, playlist_index, pool.submit(process_entry, i, entry, extra_info)))
+            while pending:
+                yield from results(*pending.popleft())
+        finally:
+            # Entries after the ones consumed are not wanted if we are stopping early
+            turns.abort()
+            pool.shutdown(wait=True, cancel_futures=True)
+            turns.end_status()
+
+    def _take_entry_turn(self):
+        """Wait until the playlist entry processed by this thread may take decisions that depend on earlier ones"""
+        local = self._entry_local
+        if getattr(local, 'turn', None) != 'waiting':
+            return
+        max_downloads = float(self.params.get('max_downloads') or 'inf')
+        local.turns.take(local.seq, lambda: self._num_downloads >= max_downloads)
+        local.turn = 'taken'
+
+    def _pass_entry_turn(self):
+        """Let the next playlist entry take its turn once this thread's entry is counted as a download"""
+        local = self._entry_local
+        if not hasattr(local, 'turns'):
+            return
+        local.num_downloads = self._num_downloads
+        if local.turn == 'taken':
+            local.turns.pass_on(local.seq)
+            local.turn = 'passed'
+
+    def _entry_status_line(self, create_printer):
+        """Return the printer shared between concurrently processed entries and the line of this thread's entry"""
+        local = self._entry_local
+        if not hasattr(local, 'turns'):
+            return None
+        return local.turns.status_printer(create_printer), local.line
+
     def _build_format_filter(self, filter_spec):
         " Returns a function to filter the formats according to the filter_spec "
 
@@ -2798,7 +3095,10 @@ def sort_formats(self, info_dict):
 
     def process_video_result(self, info_dict, download=True):
         assert info_dict.get('_type', 'video') == 'video'
+        self._take_entry_turn()
         self._num_videos += 1
+        if hasattr(self._entry_local, 'turns'):
+            self._entry_local.num_videos = self._num_videos
 
         if 'id' not in info_dict:
             raise ExtractorError('Missing "id" field in extractor result', ie=info_dict['extractor'])
@@ -3076,38 +3376,42 @@ def to_screen(*msg):
                               (f'{c["start_time"]:.1f}-{c["end_time"]:.1f}' for c in requested_ranges))
             max_downloads_reached = False
 
-            for fmt, chapter in itertools.product(formats_to_download, requested_ranges):
-                new_info = self._copy_infodict(info_dict)
-                new_info.update(fmt)
-                offset, duration = info_dict.get('section_start') or 0, info_dict.get('duration') or float('inf')
-                end_time = offset + min(chapter.get('end_time', duration), duration)
-                # duration may not be accurate. So allow deviations <1sec
-                if end_time == float('inf') or end_time > offset + duration + 1:
-                    end_time = None
-                if chapter or offset:
-                    new_info.update({
-                        'section_start': offset + chapter.get('start_time', 0),
-                        'section_end': end_time,
-                        'section_title': chapter.get('title'),
-                        'section_number': chapter.get('index'),
-                    })
-                downloaded_formats.append(new_info)
-                try:
-                    self.process_info(new_info)
-                except MaxDownloadsReached:
-                    max_downloads_reached = True
-                self._raise_pending_errors(new_info)
-                # Remove copied info
-                for key, val in tuple(new_info.items()):
-                    if info_dict.get(key) == val:
-                        new_info.pop(key)
-                if max_downloads_reached:
-                    break
+            try:
+                for fmt, chapter in itertools.product(formats_to_download, requested_ranges):
+                    new_info = self._copy_infodict(info_dict)
+                    new_info.update(fmt)
+                    offset, duration = info_dict.get('section_start') or 0, info_dict.get('duration') or float('inf')
+                    end_time = offset + min(chapter.get('end_time', duration), duration)
+                    # duration may not be accurate. So allow deviations <1sec
+                    if end_time == float('inf') or end_time > offset + duration + 1:
+                        end_time = None
+                    if chapter or offset:
+                        new_info.update({
+                            'section_start': offset + chapter.get('start_time', 0),
+                            'section_end': end_time,
+                            'section_title': chapter.get('title'),
+                            'section_number': chapter.get('index'),
+                        })
+                    downloaded_formats.append(new_info)
+                    try:
+                        self.process_info(new_info)
+                    except MaxDownloadsReached:
+                        max_downloads_reached = True
+                    self._raise_pending_errors(new_info)
+                    # Remove copied info
+                    for key, val in tuple(new_info.items()):
+                        if info_dict.get(key) == val:
+                            new_info.pop(key)
+                    if max_downloads_reached:
+                        break
 
-            write_archive = {f.get('__write_download_archive', False) for f in downloaded_formats}
-            assert write_archive.issubset({True, False, 'ignore'})
-            if True in write_archive and False not in write_archive:
-                self.record_download_archive(info_dict)
+                write_archive = {f.get('__write_download_archive', False) for f in downloaded_formats}
+                assert write_archive.issubset({True, False, 'ignore'})
+                if True in write_archive and False not in write_archive:
+                    self.record_download_archive(info_dict)
+            finally:
+                # A video that was not recorded can be downloaded by another process
+                self.release_download_archive_claim(info_dict)
 
             info_dict['requested_downloads'] = downloaded_formats
             info_dict = self.run_all_pps('after_video', info_dict)
@@ -3247,7 +3551,7 @@ def print_field(field, actual_field=None, optional=False):
         if self.params.get('forcejson'):
             self.to_stdout(json.dumps(self.sanitize_info(info_dict)))
 
-    def dl(self, name, info, subtitle=False, test=False):
+    def dl(self, name, info, subtitle=False, test=False, *, params=None, progress_hooks=()):
         if not info.get('url'):
             self.raise_no_formats(info, True)
 
@@ -3266,12 +3570,18 @@ def dl(self, name, info, subtitle=False, test=False):
                 '_no_ytdl_file': True,
             }
         else:
-            params = self.params
+            params = params or self.params
+            if subtitle and (params.get('http_connections') or 1) > 1:
+                # Subtitles are too small to be worth probing for a segmented download
+                params = {**params, 'http_connections': 1}
 
         fd = get_suitable_downloader(info, params, to_stdout=(name == '-'))(self, params)
         if not test:
-            for ph in self._progress_hooks:
+            for ph in (*self._progress_hooks, *progress_hooks):
                 fd.add_progress_hook(ph)
+            if turns := getattr(self._entry_local, 'turns', None):
+                # Stop the download when the playlist is aborted
+                fd.add_progress_hook(lambda _: turns.check())
             urls = '", "'.join(
                 (f['url'].split(',')[0] + ',<data>' if f['url'].startswith('data:') else f['url'])
                 for f in info.get('requested_formats', []) or [info])
@@ -3284,6 +3594,130 @@ def dl(self, name, info, subtitle=False, test=False):
             new_info['http_headers'] = self._calc_headers(new_info)
         return fd.download(name, new_info, subtitle)
 
+    def _dl_concurrently(self, downloads, info_dict, stopped=None, **params):
+        """
+        Download the formats to be merged at the same time and return the result of dl() for each
+
+        The formats share the --concurrent-fragments and --limit-rate budgets, and their progress
+        is reported as one. When a download raises or the threading.Event `stopped` is set,
+        the others are stopped; if `stopped` is given, so are they when a download fails.
+        The downloads stopped by the caller are failed. `params` override those of the downloaders
+        """
+        count = len(downloads)
+        stop_on_failure = stopped is not None
+        params = {
+            **self.params,
+            'concurrent_fragment_downloads': math.ceil((self.params.get('concurrent_fragment_downloads') or 1) / count),
+            'noprogress': True,
+            **params,
+        }
+        if self.params.get('ratelimit'):
+            params['ratelimit'] = max(self.params['ratelimit'] // count, 1)
+
+        stopped = stopped or threading.Event()
+        # Created in this thread to get the status line of a concurrently processed playlist entry
+        display = FileDownloader(self, self.params)
+        if turns := getattr(self._entry_local, 'turns', None):
+            display.add_progress_hook(lambda _: turns.check())
+
+        def report(status):
+            if stopped.is_set():
+                raise DownloadCancelled('Another format of the video failed to download')
+            display._hook_progress(status, info_dict)
+
+        progress = CombinedProgress(count, report)
+        lock, errors = threading.Lock(), []
+
+        def download(index, name, info):
+            try:
+                result = self.dl(name, info, params=params, progress_hooks=[progress.hook(index)])
+            except BaseException as e:
+                with lock:
+                    # The downloads that fail once the others are stopped only report the cancellation
+                    if not stopped.is_set():
+                        errors.append(e)
+                    stopped.set()
+                raise
+            if stop_on_failure and not result[0]:
+                stopped.set()
+            return result
+
+        pool = concurrent.futures.ThreadPoolExecutor(count, thread_name_prefix='format')
+        try:
+            futures = [pool.submit(download, index, *args) for index, args in enumerate(downloads)]
+            concurrent.futures.wait(futures)
+        except BaseException:
+            stopped.set()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            display._finish_multiline_status()
+        if errors:
+            raise errors[0]
+        return [(False, False) if future.exception() else future.result() for future in futures]
+
+    def _can_stream_merge(self, info_dict, filename, merger):
+        """Whether ffmpeg can merge the formats while they are downloaded natively into named pipes"""
+        if (not self.params.get('stream_merge') or not hasattr(os, 'mkfifo') or filename == '-'
+                or not merger.available or self.params.get('allow_unplayable_formats')
+                or self.params.get('keepvideo')):
+            return False
+        for f in info_dict['requested_formats']:
+            fmt = {**info_dict, **f}
+            del fmt['requested_formats']
+            fd = get_suitable_downloader(fmt, self.params)
+            if not fd or fd.FD_NAME not in ('http', 'dashsegments'):
+                return False
+            # External downloaders that take over the fragments can't write into a pipe
+            if fd.FD_NAME == 'dashsegments' and get_suitable_downloader(
+                    fmt, self.params, None, protocol='dash_frag_urls'):
+                return False
+            # ffmpeg can't seek in a pipe to read an index at the end of a progressive mp4
+            if fd.FD_NAME == 'http' and f.get('ext') not in ('webm', 'mkv') and not (
+                    f.get('container') or '').endswith('_dash'):
+                return False
+        return True
+
+    def _side_downloads_in_background(self):
+        """Whether the subtitles and thumbnails of a video can be downloaded while the video is"""
+        return (
+            (self.params.get('concurrent_side_downloads') or 1) > 1
+            and any(self.params.get(key) for key in (
+                'writesubtitles', 'writeautomaticsub', 'writethumbnail', 'write_all_thumbnails'))
+            and not self.params.get('skip_download')
+            # The info json records which thumbnails could be downloaded
+            and not self.params.get('writeinfojson')
+            # The files must be there for what runs before the download
+            and not self._pps['before_dl']
+            and not self.params['forceprint'].get('before_dl')
+            and not self.params['print_to_file'].get('before_dl'))
+
+    def _run_side_downloads(self, func, jobs):
+        """
+        Return func(*job) for each of the jobs (subtitles or thumbnails to download), in order
+
+        Up to concurrent_side_downloads of them run at the same time. The first exception
+        is raised once the running jobs are over, and the others are not started
+        """
+        workers = min(self.params.get('concurrent_side_downloads') or 1, len(jobs))
+        if workers <= 1:
+            return [func(*job) for job in jobs]
+        with concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='side-download') as pool:
+            futures = [pool.submit(func, *job) for job in jobs]
+            try:
+                return [future.result() for future in futures]
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    @staticmethod
+    def _has_partial_download(filename):
+        """Whether part of the format was downloaded by an earlier run, to be resumed"""
+        if FileDownloader.is_pipe(filename):
+            # A pipe left over by an interrupted streaming merge holds no data
+            os.remove(filename)
+        return any(os.path.exists(fn) for fn in (filename, f'{filename}.part', f'{filename}.ytdl'))
+
     def existing_file(self, filepaths, *, default_overwrite=True):
         existing_files = list(filter(os.path.exists, orderedSet(filepaths)))
         if existing_files and not self.params.get('overwrites', default_overwrite):
@@ -3297,14 +3731,24 @@ def existing_file(self, filepaths, *, default_overwrite=True):
     @_catch_unsafe_extension_error
     def process_info(self, info_dict):
         """Process a single resolved IE result. (Modifies it in-place)"""
+        side_downloads = []
+        try:
+            self.__process_info(info_dict, side_downloads)
+        except BaseException:
+            concurrent.futures.wait(side_downloads)
+            raise
+        # Subtitles and thumbnails that were still downloading when the video failed
+        for future in side_downloads:
+            future.result()
 
+    def __process_info(self, info_dict, side_downloads):
         assert info_dict.get('_type', 'video') == 'video'
         original_infodict = info_dict
 
         if 'format' not in info_dict and 'ext' in info_dict:
             info_dict['format'] = info_dict['ext']
 
-        if self._match_entry(info_dict) is not None:
+        if self._match_entry(info_dict) is not None or not self.claim_download_archive(info_dict):
             info_dict['__write_download_archive'] = 'ignore'
             return
 
@@ -3321,6 +3765,7 @@ def replace_info_dict(new_info):
         new_info, _ = self.pre_process(info_dict, 'video')
         replace_info_dict(new_info)
         self._num_downloads += 1
+        self._pass_entry_turn()
 
         # info_dict['_filename'] needs to be set for backward compatibility
         info_dict['_filename'] = full_filename = self.prepare_filename(info_dict, warn=True)
@@ -3350,16 +3795,32 @@ def check_max_downloads():
                                    self.prepare_filename(info_dict, 'description')) is None:
             return
 
-        sub_files = self._write_subtitles(info_dict, temp_filename)
-        if sub_files is None:
-            return
-        files_to_move.update(dict(sub_files))
+        # The filenames depend on the state of the playlist entry processed by this thread
+        sub_filename_base = self.prepare_filename(info_dict, 'subtitle')
+        thumb_filename_base = self.prepare_filename(info_dict, 'thumbnail')
 
-        thumb_files = self._write_thumbnails(
-            'video', info_dict, temp_filename, self.prepare_filename(info_dict, 'thumbnail'))
-        if thumb_files is None:
+        def write_side_files():
+            sub_files = self._write_subtitles(info_dict, temp_filename, sub_filename_base)
+            if sub_files is None:
+                return None
+            thumb_files = self._write_thumbnails('video', info_dict, temp_filename, thumb_filename_base)
+            if thumb_files is None:
+                return None
+            return {**dict(sub_files), **dict(thumb_files)}
+
+        def add_side_files(files):
+            if files is not None:
+                files_to_move.update(files)
+            return files is not None
+
+        side_files = None
+        if self._side_downloads_in_background():
+            pool = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='side-downloads')
+            side_files = pool.submit(write_side_files)
+            pool.shutdown(wait=False)
+            side_downloads.append(side_files)
+        elif not add_side_files(write_side_files()):
             return
-        files_to_move.update(dict(thumb_files))
 
         infofn = self.prepare_filename(info_dict, 'infojson')
         _infojson_written = self._write_info_json('video', info_dict, infofn)
@@ -3415,6 +3876,7 @@ def _write_link_file(link_type):
         replace_info_dict(new_info)
 
         if self.params.get('skip_download'):
+            # Never downloaded in the background, see _side_downloads_in_background
             info_dict['filepath'] = temp_filename
             info_dict['__finaldir'] = os.path.dirname(os.path.abspath(full_filename))
             info_dict['__files_to_move'] = files_to_move
@@ -3447,14 +3909,15 @@ def existing_video_file(*filepaths):
                 if info_dict.get('requested_formats') is not None:
                     old_ext = info_dict['ext']
                     if self.params.get('merge_output_format') is None:
-                        if (info_dict['ext'] == 'webm'
-                                and info_dict.get('thumbnails')
-                                # check with type instead of pp_key, __name__, or isinstance
-                                # since we dont want any custom PPs to trigger this
-                                and any(type(pp) == EmbedThumbnailPP for pp in self._pps['post_process'])):  # noqa: E721
-                            info_dict['ext'] = 'mkv'
-                            self.report_warning(
-                                'webm doesn\'t support embedding a thumbnail, mkv will be used')
+                        if info_dict['ext'] == 'webm' and info_dict.get('thumbnails'):
+                            from .postprocessor import EmbedThumbnailPP
+
+                            # check with type instead of pp_key, __name__, or isinstance
+                            # since we dont want any custom PPs to trigger this
+                            if any(type(pp) == EmbedThumbnailPP for pp in self._pps['post_process']):  # noqa: E721
+                                info_dict['ext'] = 'mkv'
+                                self.report_warning(
+                                    'webm doesn\'t support embedding a thumbnail, mkv will be used')
                     new_ext = info_dict['ext']
 
                     def correct_ext(filename, ext=new_ext):
@@ -3477,10 +3940,11 @@ def correct_ext(filename, ext=new_ext):
                     info_dict['requested_formats'] = list(map(dict, info_dict['requested_formats']))
 
                     merger = FFmpegMergerPP(self)
+                    stream_merge = self._can_stream_merge(info_dict, temp_filename, merger)
                     downloaded = []
                     if dl_filename is not None:
                         self.report_file_already_downloaded(dl_filename)
-                    elif fd:
+                    elif fd and not stream_merge:
                         if fd != FFmpegFD and temp_filename != '-':
                             for f in info_dict['requested_formats']:
                                 f['filepath'] = fname = prepend_extension(
@@ -3511,6 +3975,7 @@ def correct_ext(filename, ext=new_ext):
                                 f'You have requested downloading multiple formats to stdout {reason}. '
                                 'The formats will be streamed one after the other')
                             fname = temp_filename
+                        downloads = []
                         for f in info_dict['requested_formats']:
                             new_info = dict(info_dict)
                             del new_info['requested_formats']
@@ -3523,7 +3988,25 @@ def correct_ext(filename, ext=new_ext):
                                     return
                                 f['filepath'] = fname
                                 downloaded.append(fname)
-                            partial_success, real_download = self.dl(fname, new_info)
+                            downloads.append((fname, new_info))
+                        if stream_merge and not any(map(self._has_partial_download, downloaded)):
+                            try:
+                                success = merger.stream_merge(info_dict, temp_filename, lambda stopped: all(
+                                    partial_success for partial_success, _ in self._dl_concurrently(
+                                        downloads, info_dict, stopped, overwrites=True)))
+                            except PostProcessingError as err:
+                                self.report_error(f'Unable to merge the formats: {err}')
+                                return
+                            info_dict['__real_download'] = True
+                            # The formats have been merged, and their pipes removed
+                            downloaded = []
+                            results = ()
+                        elif self.params.get('concurrent_formats') and temp_filename != '-' and len(downloads) > 1:
+                            results = self._dl_concurrently(downloads, info_dict)
+                        else:
+                            results = itertools.starmap(self.dl, downloads)
+                        # A failed format does not stop the others, but the formats are not merged
+                        for partial_success, real_download in results:
                             info_dict['__real_download'] = info_dict['__real_download'] or real_download
                             success = success and partial_success
 
@@ -3558,6 +4041,9 @@ def correct_ext(filename, ext=new_ext):
                 self.report_error(f'content too short (expected {err.expected} bytes and served {err.downloaded})')
                 return
 
+            # The postprocessors may use the subtitles and thumbnails
+            if side_files and not add_side_files(side_files.result()):
+                return
             self._raise_pending_errors(info_dict)
             if success and full_filename != '-':
 
@@ -3846,11 +4332,31 @@ def record_download_archive(self, info_dict):
         assert vid_id
 
         self.write_debug(f'Adding to archive: {vid_id}')
-        if is_path_like(fn):
-            with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-                archive_file.write(vid_id + '\n')
         self.archive.add(vid_id)
 
+    def claim_download_archive(self, info_dict):
+        """Claim the video in the archive shared with other processes; False if one of them is downloading it"""
+        vid_id = self._claim_downloads and self._make_archive_id(info_dict)
+        if not vid_id or self.archive.claim(vid_id):
+            return True
+        self.to_screen('[download] ' + ''.join((
+            format_field(info_dict, 'id', f'{self._format_screen("%s", self.Styles.ID)}: '),
+            format_field(info_dict, 'title', f'{self._format_screen("%s", self.Styles.EMPHASIS)} '),
+            'has already been claimed by another process')))
+        return False
+
+    def release_download_archive_claim(self, info_dict):
+        vid_id = self._claim_downloads and self._make_archive_id(info_dict)
+        if vid_id:
+            self.archive.release(vid_id)
+
+    def import_download_archive(self, fn):
+        """Add the IDs of the text archive file to the download archive"""
+        if not is_path_like(self.params.get('download_archive')):
+            raise YoutubeDLError('An archive file must be given with --download-archive to import IDs into')
+        self.to_screen(f'[info] Importing the download archive {fn!r}')
+        self.archive.update(read_text_archive(fn))
+
     @staticmethod
     def format_resolution(format, default='unknown'):
         if format.get('vcodec') == 'none' and format.get('acodec') != 'none':
@@ -4337,6 +4843,7 @@ def build_request_director(self, handlers, preferences=None):
 
     @functools.cached_property
     def _request_director(self):
+        _load_optional_handlers()
         return self.build_request_director(_REQUEST_HANDLERS.values(), _RH_PREFERENCES)
 
     def encode(self, s):
@@ -4402,7 +4909,7 @@ def _write_description(self, label, ie_result, descfn):
                 return None
         return True
 
-    def _write_subtitles(self, info_dict, filename):
+    def _write_subtitles(self, info_dict, filename, sub_filename_base=None):
         """ Write subtitles to file and return list of (sub_filename, final_sub_filename); or None if error"""
         ret = []
         subtitles = info_dict.get('requested_subtitles')
@@ -4413,11 +4920,13 @@ def _write_subtitles(self, info_dict, filename):
         elif not subtitles:
             self.to_screen('[info] There are no subtitles for the requested languages')
             return ret
-        sub_filename_base = self.prepare_filename(info_dict, 'subtitle')
+        if sub_filename_base is None:
+            sub_filename_base = self.prepare_filename(info_dict, 'subtitle')
         if not sub_filename_base:
             self.to_screen('[info] Skipping writing video subtitles')
             return ret
 
+        downloads = []
         for sub_lang, sub_info in subtitles.items():
             sub_format = sub_info['ext']
             sub_filename = subtitles_filename(filename, sub_lang, sub_format, info_dict.get('ext'))
@@ -4429,26 +4938,29 @@ def _write_subtitles(self, info_dict, filename):
                 ret.append((existing_sub, sub_filename_final))
                 continue
 
+            if sub_info.get('data') is None:
+                downloads.append((sub_lang, sub_info, sub_filename, sub_filename_final))
+                continue
             self.to_screen(f'[info] Writing video subtitles to: {sub_filename}')
-            if sub_info.get('data') is not None:
-                try:
-                    # Use newline='' to prevent conversion of newline characters
-                    # See https://github.com/ytdl-org/youtube-dl/issues/10268
-                    with open(sub_filename, 'w', encoding='utf-8', newline='') as subfile:
-                        subfile.write(sub_info['data'])
-                    sub_info['filepath'] = sub_filename
-                    ret.append((sub_filename, sub_filename_final))
-                    continue
-                except OSError:
-                    self.report_error(f'Cannot write video subtitles file {sub_filename}')
-                    return None
+            try:
+                # Use newline='' to prevent conversion of newline characters
+                # See https://github.com/ytdl-org/youtube-dl/issues/10268
+                with open(sub_filename, 'w', encoding='utf-8', newline='') as subfile:
+                    subfile.write(sub_info['data'])
+                sub_info['filepath'] = sub_filename
+                ret.append((sub_filename, sub_filename_final))
+            except OSError:
+                self.report_error(f'Cannot write video subtitles file {sub_filename}')
+                return None
 
+        def download_subtitle(sub_lang, sub_info, sub_filename, sub_filename_final):
+            self.to_screen(f'[info] Writing video subtitles to: {sub_filename}')
             try:
                 sub_copy = sub_info.copy()
                 sub_copy.setdefault('http_headers', info_dict.get('http_headers'))
                 self.dl(sub_filename, sub_copy, subtitle=True)
                 sub_info['filepath'] = sub_filename
-                ret.append((sub_filename, sub_filename_final))
+                return sub_filename, sub_filename_final
             except (DownloadError, ExtractorError, OSError, ValueError, *network_exceptions) as err:
                 msg = f'Unable to download video subtitles for {sub_lang!r}: {err}'
                 if self.params.get('ignoreerrors') is not True:  # False or 'only_download'
@@ -4456,6 +4968,8 @@ def _write_subtitles(self, info_dict, filename):
                         self.report_error(msg)
                     raise DownloadError(msg)
                 self.report_warning(msg)
+
+        ret.extend(filter(None, self._run_side_downloads(download_subtitle, downloads)))
         return ret
 
     def _write_thumbnails(self, label, info_dict, filename, thumb_filename_base=None):
@@ -4478,6 +4992,24 @@ def _write_thumbnails(self, label, info_dict, filename, thumb_filename_base=None
         if thumbnails and not self._ensure_dir_exists(filename):
             return None
 
+        def download_thumbnail(t, thumb_display_id, thumb_filename):
+            self.to_screen(f'[info] Downloading {thumb_display_id} ...')
+            try:
+                uf = self.urlopen(Request(t['url'], headers=t.get('http_headers', {})))
+                self.to_screen(f'[info] Writing {thumb_display_id} to: {thumb_filename}')
+                with open(thumb_filename, 'wb') as thumbf:
+                    shutil.copyfileobj(uf, thumbf)
+                t['filepath'] = thumb_filename
+                return True
+            except network_exceptions as err:
+                if isinstance(err, HTTPError) and err.status == 404:
+                    self.to_screen(f'[info] {thumb_display_id.title()} does not exist')
+                else:
+                    self.report_warning(f'Unable to download {thumb_display_id}: {err}')
+                return False
+
+        # All the thumbnails are downloaded together; otherwise only until one of them is written
+        downloads = []
         for idx, t in list(enumerate(thumbnails))[::-1]:
             thumb_ext = t.get('ext') or determine_ext(t['url'], 'jpg')
             if multiple:
@@ -4492,21 +5024,20 @@ def _write_thumbnails(self, label, info_dict, filename, thumb_filename_base=None
                     thumb_display_id if multiple else f'{label} thumbnail').capitalize()))
                 t['filepath'] = existing_thumb
                 ret.append((existing_thumb, thumb_filename_final))
+            elif write_all:
+                downloads.append((idx, t, thumb_display_id, thumb_filename, thumb_filename_final))
+            elif download_thumbnail(t, thumb_display_id, thumb_filename):
+                ret.append((thumb_filename, thumb_filename_final))
             else:
-                self.to_screen(f'[info] Downloading {thumb_display_id} ...')
-                try:
-                    uf = self.urlopen(Request(t['url'], headers=t.get('http_headers', {})))
-                    self.to_screen(f'[info] Writing {thumb_display_id} to: {thumb_filename}')
-                    with open(thumb_filename, 'wb') as thumbf:
-                        shutil.copyfileobj(uf, thumbf)
-                    ret.append((thumb_filename, thumb_filename_final))
-                    t['filepath'] = thumb_filename
-                except network_exceptions as err:
-                    if isinstance(err, HTTPError) and err.status == 404:
-                        self.to_screen(f'[info] {thumb_display_id.title()} does not exist')
-                    else:
-                        self.report_warning(f'Unable to download {thumb_display_id}: {err}')
-                    thumbnails.pop(idx)
+                thumbnails.pop(idx)
             if ret and not write_all:
                 break
+
+        # In decreasing order of idx, so the thumbnails can be removed one after the other
+        for (idx, _, _, thumb_filename, thumb_filename_final), written in zip(
+                downloads, self._run_side_downloads(download_thumbnail, [job[1:4] for job in downloads]), strict=True):
+            if written:
+                ret.append((thumb_filename, thumb_filename_final))
+            else:
+                thumbnails.pop(idx)
         return ret
@@ -6,12 +6,19 @@
 
 __license__ = 'The Unlicense'
 
+if '--profile-startup' in sys.argv:
+    from ._import_profiler import import_profiler, requested_by_cli
+    if requested_by_cli():
+        import_profiler.start()
+
 import collections
+import functools
 import getpass
 import itertools
 import optparse
 import os
 import re
+import time
 import traceback
 
 from .cookies import SUPPORTED_BROWSERS, SUPPORTED_KEYRINGS, CookieLoadError
@@ -129,6 +136,28 @@ def print_extractor_information(opts, urls):
     return True
 
 
+def print_import_profile(ydl, ready):
+    from ._import_profiler import import_profiler
+
+    import_profiler.stop()
+    if import_profiler.started is None:
+        ydl.report_warning('--profile-startup must be given on the command line to profile the imports')
+        return
+    ms = lambda seconds: f'{seconds * 1000:.1f}'
+    modules = import_profiler.modules
+    ydl.to_stderr(
+        f'[startup] Ready after {ms(ready - import_profiler.started)}ms, '
+        f'{len(modules)} modules imported in {ms(sum(m[2] for m in modules))}ms until the end')
+    ydl.to_stderr(render_table(
+        ['Package', 'Self [ms]'],
+        [[package, ms(total)] for package, total in sorted(
+            import_profiler.packages().items(), key=lambda x: x[1], reverse=True)[:20]]))
+    ydl.to_stderr(render_table(
+        ['Module', 'Self [ms]', 'Cumulative [ms]'],
+        [[name, ms(self_time), ms(cumulative)] for name, _, self_time, cumulative in sorted(
+            modules, key=lambda x: x[3], reverse=True)[:30]]))
+
+
 def set_compat_opts(opts):
     def _unused_compat_opt(name):
         if name not in opts.compat_opts:
@@ -217,6 +246,10 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('concurrent entries', opts.concurrent_entries, True)
+    validate_positive('concurrent side downloads', opts.concurrent_side_downloads, True)
+    validate_positive('decryption processes', opts.decryption_processes)
+    validate_positive('HTTP connections', opts.http_connections, True)
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -469,6 +502,10 @@ def metadataparser_actions(f):
 
     if opts.download_archive is not None:
         opts.download_archive = expand_path(opts.download_archive)
+    if opts.import_download_archive is not None:
+        validate(opts.download_archive is not None, 'download archive',
+                 msg='--import-download-archive needs a {name} to import into')
+        opts.import_download_archive = expand_path(opts.import_download_archive)
 
     if opts.ffmpeg_location is not None:
         opts.ffmpeg_location = expand_path(opts.ffmpeg_location)
@@ -846,9 +883,15 @@ def parse_options(argv=None):
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
         'keep_fragments': opts.keep_fragments,
         'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'concurrent_entries': opts.concurrent_entries,
+        'concurrent_formats': opts.concurrent_formats,
+        'stream_merge': opts.stream_merge,
+        'concurrent_side_downloads': opts.concurrent_side_downloads,
+        'decryption_processes': opts.decryption_processes,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'http_chunk_size': opts.http_chunk_size,
+        'http_connections': opts.http_connections,
         'continuedl': opts.continue_dl,
         'noprogress': opts.quiet if opts.noprogress is None else opts.noprogress,
         'progress_with_newline': opts.progress_with_newline,
@@ -859,6 +902,7 @@ def parse_options(argv=None):
         'playlistreverse': opts.playlist_reverse,
         'playlistrandom': opts.playlist_random,
         'lazy_playlist': opts.lazy_playlist,
+        'sync_playlists': opts.sync_playlists,
         'noplaylist': opts.noplaylist,
         'logtostderr': opts.outtmpl.get('default') == '-',
         'consoletitle': opts.consoletitle,
@@ -898,8 +942,10 @@ def parse_options(argv=None):
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'cache_stats': opts.cache_stats,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
+        'claim_downloads': opts.claim_downloads,
         'break_on_existing': opts.break_on_existing,
         'break_on_reject': opts.break_on_reject,
         'break_per_url': opts.break_per_url,
@@ -979,12 +1025,17 @@ def _real_main(argv=None):
         _load_all_plugins()
 
     with YoutubeDL(ydl_opts) as ydl:
-        pre_process = opts.update_self or opts.rm_cachedir
+        if opts.profile_startup:
+            ydl.add_close_hook(functools.partial(print_import_profile, ydl, time.perf_counter()))
+        pre_process = opts.update_self or opts.rm_cachedir or opts.import_download_archive or opts.profile_startup
         actual_use = all_urls or opts.load_info_filename
 
         if opts.rm_cachedir:
             ydl.cache.remove()
 
+        if opts.import_download_archive:
+            ydl.import_download_archive(opts.import_download_archive)
+
         try:
             updater = Updater(ydl, opts.update_self)
             if opts.update_self and updater.update() and actual_use and updater.cmd:
@@ -14,4 +14,8 @@
 import yt_dlp
 
 if __name__ == '__main__':
+    if getattr(sys, 'frozen', False):
+        # The decryption processes of the frozen executable are started through this entry point
+        import multiprocessing
+        multiprocessing.freeze_support()
     yt_dlp.main()
@@ -21,6 +21,8 @@ def get_hidden_imports():
     yield from ('yt_dlp.compat._legacy', 'yt_dlp.compat._deprecated')
     yield from ('yt_dlp.utils._legacy', 'yt_dlp.utils._deprecated')
     yield pycryptodome_module()
+    # The built-in post-processors are imported dynamically when they are first used
+    yield from collect_submodules('yt_dlp.postprocessor')
     # Only `websockets` is required, others are collected just in case
     for module in ('websockets', 'requests', 'urllib3'):
         yield from collect_submodules(module)
@@ -0,0 +1,87 @@
+"""
+Measures the time spent importing each module, for --profile-startup
+
+Most of the imports are over by the time the options are parsed, so yt_dlp/__init__.py
+starts the profiler before importing anything else when the option is on the command line
+of yt-dlp itself. This module must therefore not import anything from yt_dlp
+"""
+
+import os
+import sys
+import threading
+import time
+
+
+def requested_by_cli():
+    """Whether --profile-startup was given to yt-dlp, rather than to a program that embeds yt_dlp"""
+    if '--profile-startup' not in sys.argv[1:]:
+        return False
+    elif getattr(sys, 'frozen', False):
+        return True
+    # python -m yt_dlp
+    orig_argv = sys.orig_argv
+    if '-m' in orig_argv and orig_argv[orig_argv.index('-m') + 1:][:1] == ['yt_dlp']:
+        return True
+    # The yt-dlp script or zip, or python yt_dlp/__main__.py
+    path = os.path.abspath(sys.argv[0])
+    return (os.path.splitext(os.path.basename(path))[0] in ('yt-dlp', 'yt-dlp-script')
+            or path.endswith(os.path.join('yt_dlp', '__main__.py')))
+
+
+class ImportProfiler:
+    """A meta path finder that times the execution of the modules found by the other finders"""
+
+    def __init__(self):
+        self.started = None
+        self.modules = []  # (name, depth, self time, cumulative time) in the order they finished loading
+        self._local = threading.local()  # the stack of modules being loaded by each thread
+
+    def start(self):
+        if self.started is None:
+            self.started = time.perf_counter()
+            sys.meta_path.insert(0, self)
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            # Loaders that are classes (eg. for builtin and frozen modules) are shared between modules
+            loader = spec.loader
+            if loader is not None and not isinstance(loader, type) and hasattr(loader, 'exec_module'):
+                loader.exec_module = self._timed(name, loader.exec_module)
+            return spec
+        return None
+
+    def _timed(self, name, exec_module):
+        def timed_exec_module(module):
+            stack = vars(self._local).setdefault('stack', [])
+            stack.append([0])
+            start = time.perf_counter()
+            try:
+                return exec_module(module)
+            finally:
+                cumulative = time.perf_counter() - start
+                children, = stack.pop()
+                if stack:
+                    stack[-1][0] += cumulative
+                self.modules.append((name, len(stack), cumulative - children, cumulative))
+        return timed_exec_module
+
+    def packages(self):
+        """Return the self time of the modules grouped by package (eg. "yt_dlp.networking", "yt_dlp.YoutubeDL", "http")"""
+        packages = {}
+        for name, _, self_time, _ in self.modules:
+            parts = name.split('.')
+            package = '.'.join(parts[:2 if parts[0] == 'yt_dlp' else 1])
+            packages[package] = packages.get(package, 0) + self_time
+        return packages
+
+
+import_profiler = ImportProfiler()
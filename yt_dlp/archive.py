@@ -0,0 +1,264 @@
+"""
+Backends of the download archive (--download-archive)
+
+A text archive lists one ID per line and is loaded into memory as a whole.
+Huge archives are better kept in a SQLite database, which is looked up on disk
+instead. Archive files ending in one of SQLITE_ARCHIVE_EXTENSIONS are created as
+SQLite databases; existing files are recognised by their content
+"""
+
+import contextlib
+import errno
+import os
+import socket
+import threading
+import time
+import uuid
+
+from . import dependencies
+from .utils import YoutubeDLError, locked_file
+
+SQLITE_ARCHIVE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+_SQLITE_HEADER = b'SQLite format 3\0'
+
+
+def is_sqlite_archive(fn):
+    """Whether the archive file is (or will be created as) a SQLite database"""
+    try:
+        with open(fn, 'rb') as f:
+            header = f.read(len(_SQLITE_HEADER))
+    except FileNotFoundError:
+        header = b''
+    if header:
+        return header == _SQLITE_HEADER
+    return os.path.splitext(os.fsdecode(fn))[1].lower() in SQLITE_ARCHIVE_EXTENSIONS
+
+
+def open_download_archive(fn):
+    return (SQLiteArchive if is_sqlite_archive(fn) else TextArchive)(fn)
+
+
+def read_text_archive(fn):
+    """Yield the IDs of a text archive, without holding them in memory"""
+    with locked_file(fn, 'r', encoding='utf-8') as archive_file:
+        for line in archive_file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class TextArchive:
+    """
+    The archive file with one ID per line
+
+    IDs that other processes append to the file are picked up before each lookup
+    """
+
+    def __init__(self, fn):
+        self.filename = fn
+        self._ids = set()
+        self._size = 0
+        self._lock = threading.Lock()
+        try:
+            with locked_file(fn, 'r', encoding='utf-8') as archive_file:
+                for line in archive_file:
+                    self._ids.add(line.strip())
+                self._size = os.fstat(archive_file.fileno()).st_size
+        except OSError as ioe:
+            if ioe.errno != errno.ENOENT:
+                raise
+
+    def _refresh(self):
+        try:
+            size = os.stat(self.filename).st_size
+        except OSError:
+            return
+        if size == self._size:
+            return
+        with locked_file(self.filename, 'rb') as archive_file:
+            if size < self._size:  # Rewritten
+                self._ids.clear()
+                self._size = 0
+            archive_file.seek(self._size)
+            data = archive_file.read()
+        # Leave a line that is still being written for the next time
+        data = data[:data.rfind(b'\n') + 1]
+        self._size += len(data)
+        self._ids.update(line.strip() for line in data.decode('utf-8', 'replace').splitlines())
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            self._refresh()
+            return vid_id in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, vid_id):
+        self.update((vid_id,))
+
+    def update(self, vid_ids):
+        with self._lock:
+            self._refresh()
+            new_ids = [vid_id for vid_id in dict.fromkeys(vid_ids) if vid_id not in self._ids]
+            if not new_ids:
+                return
+            with locked_file(self.filename, 'a', encoding='utf-8') as archive_file:
+                archive_file.writelines(f'{vid_id}\n' for vid_id in new_ids)
+                archive_file.flush()
+                self._size = os.fstat(archive_file.fileno()).st_size
+            self._ids.update(new_ids)
+
+    def close(self):
+        pass
+
+
+class SQLiteArchive:
+    """
+    The archive as an indexed table of a SQLite database
+
+    Membership is looked up in the database, so the archive is never loaded into memory
+    and the IDs recorded by other processes are seen right away.
+    Each added ID is committed right away, so that it is seen by the other processes and
+    survives the process being killed; update() inserts many IDs in batches
+
+    Processes sharing the archive can claim an ID before downloading it, so that only one
+    of them does. The claim is released when the ID is added or released, or when the
+    archive is closed. Claims of processes on the same host that have died, and claims
+    that have not been renewed for _CLAIM_TIMEOUT, are taken over
+    """
+
+    _IMPORT_BATCH_SIZE = 10000
+    _CLAIM_TIMEOUT = 6 * 60 * 60
+    _CLAIM_RENEW_INTERVAL = 60
+
+    def __init__(self, fn):
+        sqlite3 = dependencies.sqlite3
+        if not sqlite3:
+            raise YoutubeDLError(
+                f'Cannot open the SQLite download archive {fn!r} without sqlite3 support. '
+                'Please use a Python interpreter compiled with sqlite3 support')
+        self.filename = fn
+        self._lock = threading.Lock()
+        self._host, self._pid = socket.gethostname(), os.getpid()
+        # Several instances may share the archive within a process
+        self._owner = f'{self._host}:{self._pid}:{uuid.uuid4().hex}'
+        self._claimed = set()
+        self._last_renewal = 0
+        # The connection is shared by the threads processing concurrent playlist entries
+        self._conn = sqlite3.connect(fn, timeout=60, check_same_thread=False)
+        with self._conn:
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS archive (id TEXT PRIMARY KEY) WITHOUT ROWID')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS claims ('
+                'id TEXT PRIMARY KEY, owner TEXT NOT NULL, host TEXT, pid INTEGER, claimed REAL NOT NULL'
+                ') WITHOUT ROWID')
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # Take the write lock upfront, so that the transaction sees what the others committed before it
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM archive WHERE id = ?', (vid_id,)).fetchone() is not None
+
+    def __iter__(self):
+        with self._lock:
+            vid_ids = self._conn.execute('SELECT id FROM archive')
+        for vid_id, in vid_ids:
+            yield vid_id
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM archive').fetchone()[0]
+
+    def __bool__(self):
+        # Lookups are cheap, there is no need to count the IDs to skip them
+        return True
+
+    def add(self, vid_id):
+        with self._lock, self._transaction():
+            self._conn.execute('INSERT OR IGNORE INTO archive (id) VALUES (?)', (vid_id,))
+            if vid_id in self._claimed:
+                self._conn.execute('DELETE FROM claims WHERE id = ? AND owner = ?', (vid_id, self._owner))
+                self._claimed.discard(vid_id)
+
+    def update(self, vid_ids):
+        """Add many IDs at once, eg. when converting a text archive"""
+        batch = []
+        for vid_id in vid_ids:
+            batch.append((vid_id,))
+            if len(batch) >= self._IMPORT_BATCH_SIZE:
+                self._insert(batch)
+                batch = []
+        self._insert(batch)
+
+    def _insert(self, rows):
+        with self._lock, self._transaction():
+            self._conn.executemany('INSERT OR IGNORE INTO archive (id) VALUES (?)', rows)
+
+    def _is_stale(self, host, pid, claimed):
+        if time.time() - claimed >= self._CLAIM_TIMEOUT:
+            return True
+        # Signals can't be used to probe processes on Windows
+        if host != self._host or pid == self._pid or os.name == 'nt':
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except OSError:  # eg. owned by another user
+            pass
+        return False
+
+    def claim(self, vid_id):
+        """Atomically claim the ID for this archive; False if it is recorded or another process claimed it"""
+        with self._lock:
+            if vid_id in self._claimed:
+                return True
+            now = time.time()
+            with self._transaction():
+                if self._conn.execute('SELECT 1 FROM archive WHERE id = ?', (vid_id,)).fetchone():
+                    return False
+                claim = self._conn.execute('SELECT host, pid, claimed FROM claims WHERE id = ?', (vid_id,)).fetchone()
+                if claim and not self._is_stale(*claim):
+                    return False
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO claims (id, owner, host, pid, claimed) VALUES (?, ?, ?, ?, ?)',
+                    (vid_id, self._owner, self._host, self._pid, now))
+                if self._claimed and now - self._last_renewal >= self._CLAIM_RENEW_INTERVAL:
+                    self._conn.execute('UPDATE claims SET claimed = ? WHERE owner = ?', (now, self._owner))
+                    self._last_renewal = now
+            self._claimed.add(vid_id)
+            return True
+
+    def release(self, vid_id):
+        """Release the claim on an ID that was not added"""
+        with self._lock:
+            if vid_id not in self._claimed:
+                return
+            with self._transaction():
+                self._conn.execute('DELETE FROM claims WHERE id = ? AND owner = ?', (vid_id, self._owner))
+            self._claimed.discard(vid_id)
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            if self._claimed:
+                with self._transaction():
+                    self._conn.execute('DELETE FROM claims WHERE owner = ?', (self._owner,))
+                self._claimed.clear()
+            self._conn.close()
+            self._conn = None
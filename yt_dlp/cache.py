@@ -1,18 +1,42 @@
+import collections
 import contextlib
+import copy
 import json
 import os
 import re
 import shutil
+import sys
+import tempfile
+import threading
+import time
 import traceback
 import urllib.parse
 
-from .utils import expand_path, traverse_obj, version_tuple, write_json_file
+from .utils import expand_path, render_table, traverse_obj, version_tuple
 from .version import __version__
 
 
 class Cache:
+    """
+    Filesystem cache of JSON data, in one file per key under <cachedir>/<section>/
+
+    Loaded entries are kept in memory, and are parsed again only when the file was replaced
+    (eg. by another process). Files are written to a temporary file and renamed over the
+    old one, so that concurrent processes never read a partially written entry.
+    Each section is kept under _SECTION_SIZE_LIMIT by deleting the least recently used entries
+    """
+
+    _SECTION_SIZE_LIMIT = 50 * 1024 * 1024
+    _MEMORY_ENTRIES = 64  # per section
+    # The modification time of the files is their last use, but is updated at most this often
+    _TOUCH_INTERVAL = 60 * 60
+
     def __init__(self, ydl):
         self._ydl = ydl
+        self._lock = threading.Lock()
+        self._memory = collections.defaultdict(collections.OrderedDict)  # section -> key -> (signature, payload)
+        self._section_sizes = {}
+        self._stats = collections.defaultdict(collections.Counter)
 
     def _get_root_dir(self):
         res = self._ydl.params.get('cachedir')
@@ -30,28 +54,123 @@ def _get_cache_fn(self, section, key, dtype):
     def enabled(self):
         return self._ydl.params.get('cachedir') is not False
 
-    def store(self, section, key, data, dtype='json'):
+    @staticmethod
+    def _signature(stat):
+        # Replacing a file always changes its inode or modification time
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _remember(self, section, key, signature, payload):
+        with self._lock:
+            memory = self._memory[section]
+            memory[key] = signature, payload
+            memory.move_to_end(key)
+            while len(memory) > self._MEMORY_ENTRIES:
+                memory.popitem(last=False)
+
+    def _forget(self, section, key):
+        with self._lock:
+            self._memory[section].pop(key, None)
+
+    def _write(self, fn, payload):
+        """Atomically replace fn with the JSON payload, and return the stat of the new file"""
+        tf = tempfile.NamedTemporaryFile(
+            prefix=f'{os.path.basename(fn)}.', dir=os.path.dirname(fn),
+            suffix='.tmp', delete=False, mode='w', encoding='utf-8')
+        try:
+            with tf:
+                json.dump(payload, tf, ensure_ascii=False)
+                tf.flush()
+                with contextlib.suppress(OSError):
+                    mask = os.umask(0)
+                    os.umask(mask)
+                    os.chmod(tf.name, 0o666 & ~mask)
+                stat = os.fstat(tf.fileno())
+            # Atomic on Windows as well, unlike os.rename
+            os.replace(tf.name, fn)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tf.name)
+            raise
+        # Windows only updates the modification time on close
+        if sys.platform == 'win32':
+            stat = os.stat(fn)
+        return stat
+
+    def store(self, section, key, data, dtype='json', *, ttl=None):
+        """Store the data, which expires after `ttl` seconds if given"""
         assert dtype in ('json',)
 
         if not self.enabled:
             return
 
         fn = self._get_cache_fn(section, key, dtype)
+        payload = {'yt-dlp_version': __version__, 'data': data}
+        if ttl is not None:
+            payload['expires'] = time.time() + ttl
         try:
+            try:
+                old_stat = os.stat(fn)
+            except OSError:
+                old_stat = None
+            else:
+                # Rewriting an unchanged entry is a waste on the hot paths that store the same data again
+                signature, old_payload = self._memory[section].get(key, (None, None))
+                if signature == self._signature(old_stat) and old_payload == payload:
+                    return
+
             os.makedirs(os.path.dirname(fn), exist_ok=True)
             self._ydl.write_debug(f'Saving {section}.{key} to cache')
-            write_json_file({'yt-dlp_version': __version__, 'data': data}, fn)
+            stat = self._write(fn, payload)
         except Exception:
             tb = traceback.format_exc()
             self._ydl.report_warning(f'Writing cache to {fn!r} failed: {tb}')
+            return
+
+        # The caller may modify the data afterwards
+        self._remember(section, key, self._signature(stat), copy.deepcopy(payload))
+        self._stats[section]['stores'] += 1
+        self._account(section, stat.st_size - (old_stat.st_size if old_stat else 0))
+
+    def _account(self, section, size_change):
+        with self._lock:
+            size = self._section_sizes.get(section)
+            if size is None:
+                size = sum(size for _, size, _ in self._section_files(section))
+            else:
+                size += size_change
+            self._section_sizes[section] = size
+            if size <= self._SECTION_SIZE_LIMIT:
+                return
+            # Other processes may have added or evicted entries in the meantime
+            files = sorted(self._section_files(section))
+            size = sum(size for _, size, _ in files)
+            for _, file_size, path in files:
+                if size <= self._SECTION_SIZE_LIMIT:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                    self._stats[section]['evictions'] += 1
+                size -= file_size
+            self._section_sizes[section] = size
+
+    def _section_files(self, section):
+        """Return the (modification time, size, path) of each file of the section"""
+        files = []
+        with contextlib.suppress(OSError), os.scandir(os.path.join(self._get_root_dir(), section)) as it:
+            for entry in it:
+                with contextlib.suppress(OSError):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
 
     def _validate(self, data, min_ver):
         version = traverse_obj(data, 'yt-dlp_version')
         if not version:  # Backward compatibility
             data, version = {'data': data}, '2022.08.19'
         if not min_ver or version_tuple(version) >= version_tuple(min_ver):
-            return data['data']
+            return True, data['data']
         self._ydl.write_debug(f'Discarding old cache from version {version} (needs {min_ver})')
+        return False, None
 
     def load(self, section, key, dtype='json', default=None, *, min_ver=None):
         assert dtype in ('json',)
@@ -59,20 +178,76 @@ def load(self, section, key, dtype='json', default=None, *, min_ver=None):
         if not self.enabled:
             return default
 
+        stats = self._stats[section]
         cache_fn = self._get_cache_fn(section, key, dtype)
-        with contextlib.suppress(OSError):
-            try:
-                with open(cache_fn, encoding='utf-8') as cachef:
-                    self._ydl.write_debug(f'Loading {section}.{key} from cache')
-                    return self._validate(json.load(cachef), min_ver)
-            except (ValueError, KeyError):
+        try:
+            stat = os.stat(cache_fn)
+        except OSError:
+            self._forget(section, key)
+            stats['misses'] += 1
+            return default
+
+        signature = self._signature(stat)
+        remembered, payload = self._memory[section].get(key, (None, None))
+        if remembered != signature:
+            payload = None
+            with contextlib.suppress(OSError):
                 try:
-                    file_size = os.path.getsize(cache_fn)
-                except OSError as oe:
-                    file_size = str(oe)
-                self._ydl.report_warning(f'Cache retrieval from {cache_fn} failed ({file_size})')
+                    with open(cache_fn, encoding='utf-8') as cachef:
+                        self._ydl.write_debug(f'Loading {section}.{key} from cache')
+                        payload = json.load(cachef)
+                except ValueError:
+                    self._ydl.report_warning(f'Cache retrieval from {cache_fn} failed ({stat.st_size})')
+            if payload is None:
+                stats['misses'] += 1
+                return default
+            self._remember(section, key, signature, payload)
+        else:
+            self._ydl.write_debug(f'Loading {section}.{key} from cache')
+            self._remember(section, key, signature, payload)
+
+        expires = traverse_obj(payload, 'expires')
+        if expires and expires <= time.time():
+            self._ydl.write_debug(f'Discarding expired cache of {section}.{key}')
+            self._forget(section, key)
+            with contextlib.suppress(OSError):
+                os.remove(cache_fn)
+            stats['misses'] += 1
+            return default
+
+        try:
+            valid, data = self._validate(payload, min_ver)
+        except (KeyError, TypeError):
+            self._ydl.report_warning(f'Cache retrieval from {cache_fn} failed ({stat.st_size})')
+            stats['misses'] += 1
+            return default
+        if not valid:
+            stats['misses'] += 1
+            return None
+
+        stats['hits' if remembered == signature else 'disk hits'] += 1
+        if time.time() - stat.st_mtime >= self._TOUCH_INTERVAL:
+            with contextlib.suppress(OSError):
+                os.utime(cache_fn)
+                self._remember(section, key, self._signature(os.stat(cache_fn)), payload)
+        # The remembered data must not be modified by the caller
+        return copy.deepcopy(data)
 
-        return default
+    def report_stats(self):
+        """Print the hit and miss rates of each section"""
+        rows = []
+        for section, stats in sorted(self._stats.items()):
+            hits = stats['hits'] + stats['disk hits']
+            lookups = hits + stats['misses']
+            rows.append([
+                section, str(lookups), f'{hits / lookups:.0%}' if lookups else '-',
+                str(stats['hits']), str(stats['disk hits']), str(stats['misses']),
+                str(stats['stores']), str(stats['evictions'])])
+        if not rows:
+            self._ydl.to_screen('[cache] The cache was not used')
+            return
+        self._ydl.to_screen(render_table(
+            ['Section', 'Lookups', 'Hit rate', 'Memory hits', 'Disk hits', 'Misses', 'Stores', 'Evicted'], rows))
 
     def remove(self):
         if not self.enabled:
@@ -88,4 +263,7 @@ def remove(self):
         if os.path.exists(cachedir):
             self._ydl.to_screen('.', skip_eol=True)
             shutil.rmtree(cachedir)
+        with self._lock:
+            self._memory.clear()
+            self._section_sizes.clear()
         self._ydl.to_screen('.')
@@ -25,11 +25,7 @@
     aes_gcm_decrypt_and_verify_bytes,
     unpad_pkcs7,
 )
-from .dependencies import (
-    _SECRETSTORAGE_UNAVAILABLE_REASON,
-    secretstorage,
-    sqlite3,
-)
+from . import dependencies
 from .minicurses import MultilinePrinter, QuietMultilinePrinter
 from .utils import (
     DownloadError,
@@ -128,7 +124,7 @@ def _extract_firefox_cookies(profile, container, logger):
     MAX_SUPPORTED_DB_SCHEMA_VERSION = 17
 
     logger.info('Extracting cookies from firefox')
-    if not sqlite3:
+    if not dependencies.sqlite3:
         logger.warning('Cannot extract cookies from firefox without sqlite3 support. '
                        'Please use a Python interpreter compiled with sqlite3 support')
         return YoutubeDLCookieJar()
@@ -294,7 +290,7 @@ def _get_chromium_based_browser_settings(browser_name):
 def _extract_chrome_cookies(browser_name, profile, keyring, logger):
     logger.info(f'Extracting cookies from {browser_name}')
 
-    if not sqlite3:
+    if not dependencies.sqlite3:
         logger.warning(f'Cannot extract cookies from {browser_name} without sqlite3 support. '
                        'Please use a Python interpreter compiled with sqlite3 support')
         return YoutubeDLCookieJar()
@@ -956,8 +952,9 @@ def _get_kwallet_password(browser_keyring_name, keyring, logger):
 
 
 def _get_gnome_keyring_password(browser_keyring_name, logger):
+    secretstorage = dependencies.secretstorage
     if not secretstorage:
-        logger.error(f'secretstorage not available {_SECRETSTORAGE_UNAVAILABLE_REASON}')
+        logger.error(f'secretstorage not available {dependencies._SECRETSTORAGE_UNAVAILABLE_REASON}')
         return b''
     # the Gnome keyring does not seem to organise keys in the same way as KWallet,
     # using `dbus-monitor` during startup, it can be observed that chromium lists all keys
@@ -1113,7 +1110,7 @@ def _open_database_copy(database_path, tmpdir):
     # cannot open sqlite databases if they are already in use (e.g. by the browser)
     database_copy_path = os.path.join(tmpdir, 'temporary.sqlite')
     shutil.copy(database_path, database_copy_path)
-    conn = sqlite3.connect(database_copy_path)
+    conn = dependencies.sqlite3.connect(database_copy_path)
     return conn.cursor()
 
 
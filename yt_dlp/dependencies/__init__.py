@@ -23,80 +23,150 @@
         certifi = None
 
 
-try:
-    import mutagen
-except ImportError:
-    mutagen = None
+from . import Cryptodome
 
+# The dependencies of single features are only imported once they are used, since
+# some of them are slow to import (eg. secretstorage, which initializes the cryptography backend).
+# This includes the libraries of the optional request handlers, which are loaded with the first request
+_DEFERRED_DEPENDENCIES = {}
 
-secretstorage = None
-try:
-    import secretstorage
-    _SECRETSTORAGE_UNAVAILABLE_REASON = None
-except ImportError:
-    _SECRETSTORAGE_UNAVAILABLE_REASON = (
-        'as the `secretstorage` module is not installed. '
-        'Please install by running `python3 -m pip install secretstorage`')
-except Exception as _err:
-    _SECRETSTORAGE_UNAVAILABLE_REASON = f'as the `secretstorage` module could not be initialized. {_err}'
 
+def _deferred(func):
+    _DEFERRED_DEPENDENCIES[func.__name__.lstrip('_')] = func
+    return func
 
-try:
-    import sqlite3
-    # We need to get the underlying `sqlite` version, see https://github.com/yt-dlp/yt-dlp/issues/8152
-    sqlite3._yt_dlp__version = sqlite3.sqlite_version
-except ImportError:
-    # although sqlite3 is part of the standard library, it is possible to compile Python without
-    # sqlite support. See: https://github.com/yt-dlp/yt-dlp/issues/544
-    sqlite3 = None
 
+@_deferred
+def _websockets():
+    try:
+        import websockets
+    except ImportError:
+        return None
+    return websockets
 
-try:
-    import websockets
-except ImportError:
-    websockets = None
 
-try:
-    import urllib3
-except ImportError:
-    urllib3 = None
+@_deferred
+def _urllib3():
+    try:
+        import urllib3
+    except ImportError:
+        return None
+    return urllib3
 
-try:
-    import requests
-except ImportError:
-    requests = None
 
-try:
-    import xattr  # xattr or pyxattr
-except ImportError:
-    xattr = None
-else:
+@_deferred
+def _requests():
+    try:
+        import requests
+    except ImportError:
+        return None
+    return requests
+
+
+@_deferred
+def _curl_cffi():
+    try:
+        import curl_cffi
+    except ImportError:
+        return None
+    return curl_cffi
+
+
+@_deferred
+def _mutagen():
+    try:
+        import mutagen
+    except ImportError:
+        return None
+    return mutagen
+
+
+@_deferred
+def _secretstorage():
+    global _SECRETSTORAGE_UNAVAILABLE_REASON
+    try:
+        import secretstorage
+    except ImportError:
+        _SECRETSTORAGE_UNAVAILABLE_REASON = (
+            'as the `secretstorage` module is not installed. '
+            'Please install by running `python3 -m pip install secretstorage`')
+    except Exception as _err:
+        _SECRETSTORAGE_UNAVAILABLE_REASON = f'as the `secretstorage` module could not be initialized. {_err}'
+    else:
+        _SECRETSTORAGE_UNAVAILABLE_REASON = None
+        return secretstorage
+    return None
+
+
+@_deferred
+def _sqlite3():
+    try:
+        import sqlite3
+    except ImportError:
+        # although sqlite3 is part of the standard library, it is possible to compile Python without
+        # sqlite support. See: https://github.com/yt-dlp/yt-dlp/issues/544
+        return None
+    # We need to get the underlying `sqlite` version, see https://github.com/yt-dlp/yt-dlp/issues/8152
+    sqlite3._yt_dlp__version = sqlite3.sqlite_version
+    return sqlite3
+
+
+@_deferred
+def _xattr():
+    try:
+        import xattr  # xattr or pyxattr
+    except ImportError:
+        return None
     if hasattr(xattr, 'set'):  # pyxattr
         xattr._yt_dlp__identifier = 'pyxattr'
+    return xattr
 
-try:
-    import curl_cffi
-except ImportError:
-    curl_cffi = None
 
-from . import Cryptodome
-
-try:
-    import yt_dlp_ejs
-except ImportError:
-    yt_dlp_ejs = None
+@_deferred
+def _yt_dlp_ejs():
+    try:
+        import yt_dlp_ejs
+    except ImportError:
+        return None
+    return yt_dlp_ejs
 
 
-all_dependencies = {k: v for k, v in globals().items() if not k.startswith('_')}
-available_dependencies = {k: v for k, v in all_dependencies.items() if v}
+def __getattr__(name):
+    if name in _DEFERRED_DEPENDENCIES:
+        globals()[name] = _DEFERRED_DEPENDENCIES[name]()
+        return globals()[name]
+    elif name == '_SECRETSTORAGE_UNAVAILABLE_REASON':
+        __getattr__('secretstorage')
+        return globals()[name]
+    elif name in ('all_dependencies', 'available_dependencies'):
+        all_dependencies = {k: globals()[k] if k in globals() else __getattr__(k) for k in _DEPENDENCY_NAMES}
+        if name == 'all_dependencies':
+            return all_dependencies
+        return {k: v for k, v in all_dependencies.items() if v}
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 # Deprecated
 Cryptodome_AES = Cryptodome.AES
 
 
+_DEPENDENCY_NAMES = (
+    'brotli',
+    'certifi',
+    'mutagen',
+    'secretstorage',
+    'sqlite3',
+    'websockets',
+    'urllib3',
+    'requests',
+    'xattr',
+    'curl_cffi',
+    'Cryptodome',
+    'yt_dlp_ejs',
+)
+
 __all__ = [
     'all_dependencies',
     'available_dependencies',
-    *all_dependencies.keys(),
+    *_DEPENDENCY_NAMES,
 ]
@@ -4,6 +4,7 @@
 import os
 import random
 import re
+import stat
 import threading
 import time
 
@@ -12,6 +13,7 @@
     MultilineLogger,
     MultilinePrinter,
     QuietMultilinePrinter,
+    SharedLinePrinter,
 )
 from ..utils import (
     IDENTITY,
@@ -72,6 +74,8 @@ class FileDownloader:
     http_chunk_size:    Size of a chunk for chunk-based HTTP downloading. May be
                         useful for bypassing bandwidth throttling imposed by
                         a webserver (experimental)
+    http_connections:   Number of connections to download a single file over
+                        HTTP with, each fetching its own byte range
     progress_template:  See YoutubeDL.py
     retry_sleep_functions: See YoutubeDL.py
 
@@ -221,6 +225,16 @@ def temp_name(self, filename):
             return filename
         return filename + '.part'
 
+    @staticmethod
+    def is_pipe(filename):
+        """Whether the file is stdout or a named pipe, which can only be written once and in order"""
+        if filename == '-':
+            return True
+        try:
+            return stat.S_ISFIFO(os.stat(filename).st_mode)
+        except OSError:
+            return False
+
     def undo_temp_name(self, filename):
         if filename.endswith('.part'):
             return filename[:-len('.part')]
@@ -291,16 +305,25 @@ def report_destination(self, filename):
         self.to_screen('[download] Destination: ' + filename)
 
     def _prepare_multiline_status(self, lines=1):
+        # Concurrently processed playlist entries each get a line of a printer shared between them
+        status_line = lines == 1 and self.ydl._entry_status_line(self._create_multiline_printer)
+        if status_line:
+            self._multiline = SharedLinePrinter(*status_line)
+        else:
+            self._multiline = self._create_multiline_printer(lines)
+
+    def _create_multiline_printer(self, lines):
         if self.params.get('noprogress'):
-            self._multiline = QuietMultilinePrinter()
+            printer = QuietMultilinePrinter()
         elif self.ydl.params.get('logger'):
-            self._multiline = MultilineLogger(self.ydl.params['logger'], lines)
+            printer = MultilineLogger(self.ydl.params['logger'], lines)
         elif self.params.get('progress_with_newline'):
-            self._multiline = BreaklineStatusPrinter(self.ydl._out_files.out, lines)
+            printer = BreaklineStatusPrinter(self.ydl._out_files.out, lines)
         else:
-            self._multiline = MultilinePrinter(self.ydl._out_files.out, lines, not self.params.get('quiet'))
-        self._multiline.allow_colors = self.ydl._allow_colors.out and self.ydl._allow_colors.out != 'no_color'
-        self._multiline._HAVE_FULLCAP = self.ydl._allow_colors.out
+            printer = MultilinePrinter(self.ydl._out_files.out, lines, not self.params.get('quiet'))
+        printer.allow_colors = self.ydl._allow_colors.out and self.ydl._allow_colors.out != 'no_color'
+        printer._HAVE_FULLCAP = self.ydl._allow_colors.out
+        return printer
 
     def _finish_multiline_status(self):
         self._multiline.end()
@@ -1,3 +1,4 @@
+import collections
 import concurrent.futures
 import contextlib
 import json
@@ -8,10 +9,10 @@
 
 from .common import FileDownloader
 from .http import HttpFD
-from ..aes import aes_cbc_decrypt_bytes, unpad_pkcs7
+from ..aes import aes_cbc_decrypt_bytes, aes_cbc_decrypt_is_native, unpad_pkcs7
 from ..networking import Request
 from ..networking.exceptions import HTTPError, IncompleteRead
-from ..utils import DownloadError, RetryManager, traverse_obj
+from ..utils import DownloadError, RetryManager, timeconvert, traverse_obj
 from ..utils.networking import HTTPHeaderDict
 from ..utils.progress import ProgressCalculator
 
@@ -23,6 +24,203 @@ def to_screen(self, *args, **kargs):
     to_console_title = to_screen
 
 
+class _FragmentCancelled(Exception):
+    """Raised inside an attempt whose fragment has already been fetched by another connection"""
+
+
+class _FragmentBuffer:
+    """Write-only stand-in for a fragment file that keeps the downloaded blocks in memory
+
+    Fragments larger than `max_size` are spilled to the usual -FragN file on disk"""
+
+    def __init__(self, fd, filename, max_size):
+        self._fd = fd
+        self.filename = filename
+        self.max_size = max_size
+        self.blocks = []
+        self.size = 0
+        self.file = None
+        self.spilled = False
+        self.cancelled = False
+
+    def reopen(self):
+        if self.spilled:
+            self.file, self.filename = FileDownloader.sanitize_open(self._fd, self.filename, 'ab')
+        return self
+
+    def write(self, data):
+        if self.cancelled:
+            raise _FragmentCancelled(self.filename)
+        if not self.spilled and self.size + len(data) > self.max_size:
+            self.file, self.filename = FileDownloader.sanitize_open(self._fd, self.filename, 'wb')
+            self.file.writelines(self.blocks)
+            self.blocks, self.spilled = [], True
+        if self.spilled:
+            self.file.write(data)
+        else:
+            # HttpFD reuses the buffer it passes in
+            self.blocks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def getvalue(self):
+        if not self.spilled:
+            return b''.join(self.blocks)
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
+    def discard(self):
+        self.close()
+        self.blocks, self.cancelled = [], True
+        if self.spilled:
+            FileDownloader.try_remove(self._fd, self.filename)
+
+
+class HttpMemoryDownloader(HttpQuietDownloader):
+    """Downloads fragments into memory instead of writing and re-reading a -FragN file per fragment"""
+
+    MAX_FRAGMENT_MEMORY = 16 * 1024 * 1024
+
+    def __init__(self, ydl, params):
+        super().__init__(ydl, params)
+        self._buffers = {}
+        self._cancelled = set()
+
+    def sanitize_open(self, filename, open_mode):
+        if filename in self._cancelled:
+            raise _FragmentCancelled(filename)
+        buf = self._buffers.get(filename)
+        if 'a' in open_mode and buf is not None:
+            return buf.reopen(), filename
+        if buf is not None:
+            buf.discard()
+        buf = self._buffers[filename] = _FragmentBuffer(self, filename, self.MAX_FRAGMENT_MEMORY)
+        return buf, filename
+
+    def filesize_or_none(self, filename):
+        buf = self._buffers.get(filename)
+        return buf.size if buf is not None else 0
+
+    def try_rename(self, old_filename, new_filename):
+        if old_filename != new_filename:
+            self._buffers[new_filename] = self._buffers.pop(old_filename)
+
+    def try_remove(self, filename):
+        buf = self._buffers.pop(filename, None)
+        if buf is not None:
+            buf.discard()
+
+    def try_utime(self, filename, last_modified_hdr):
+        # There is no file to touch; just report the timestamp back to FragmentFD
+        if last_modified_hdr is None:
+            return None
+        return timeconvert(last_modified_hdr) or None
+
+    def cancel(self, filename):
+        """Abort any attempt still downloading `filename` and drop what it has received"""
+        for name in (filename, self.temp_name(filename)):
+            self._cancelled.add(name)
+            self.try_remove(name)
+
+    def pop_fragment(self, filename):
+        buf = self._buffers.get(filename)
+        if buf is None:
+            return None
+        content = buf.getvalue()
+        self.try_remove(filename)
+        return content
+
+
+def _map_reordered(executor, func, iterable, workers, window, hedge=None, cancel=None,
+                   hedge_factor=4, hedge_min_samples=4, hedge_min_delay=0.5):
+    """Like `executor.map`, but calls may finish in any order
+
+    At most `workers` calls run at a time, and no new call is started while `window` results
+    are already waiting for a slower predecessor. A call taking `hedge_factor` times longer than
+    the median of its peers (and at least `hedge_min_delay` seconds) is re-issued once as
+    `hedge(item)`, which returns None on failure.
+    The first attempt to finish wins and `cancel(item, hedged)` is called for the other one"""
+    items = enumerate(iterable)
+    attempts = {}  # future -> (index, item, hedged, start time)
+    pending = {}  # index -> futures of attempts that are still running
+    results = {}  # index -> winning future, waiting for its predecessors
+    hedged_indices = set()
+    durations = collections.deque(maxlen=32)
+    next_index = submitted = 0
+    exhausted = False
+
+    def submit(index, item, hedged):
+        future = executor.submit(hedge if hedged else func, item)
+        attempts[future] = (index, item, hedged, time.monotonic())
+        pending.setdefault(index, []).append(future)
+
+    def cancel_others(index, winner):
+        for future in pending.pop(index):
+            if future is not winner and cancel:
+                cancel(attempts[future][1], attempts[future][2])
+
+    def hedge_threshold():
+        if hedge is None or len(durations) < hedge_min_samples:
+            return None
+        return max(hedge_min_delay, hedge_factor * sorted(durations)[len(durations) // 2])
+
+    try:
+        while True:
+            threshold = hedge_threshold()
+            if threshold is not None and len(attempts) < workers:
+                now = time.monotonic()
+                for index, futures in sorted(pending.items()):
+                    _, item, _, started = attempts[futures[0]]
+                    if index not in hedged_indices and now - started > threshold:
+                        hedged_indices.add(index)
+                        submit(index, item, True)
+                        break
+
+            while not exhausted and len(attempts) < workers and submitted - next_index < window:
+                try:
+                    index, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                submit(index, item, False)
+                submitted += 1
+
+            while next_index in results:
+                yield results.pop(next_index).result()
+                next_index += 1
+            if exhausted and next_index == submitted:
+                return
+
+            timeout = None
+            if threshold is not None:
+                now = time.monotonic()
+                timeout = max(0.05, min(
+                    (threshold - (now - attempts[futures[0]][3])
+                     for index, futures in pending.items() if index not in hedged_indices),
+                    default=threshold))
+            done, _ = concurrent.futures.wait(attempts, timeout, concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                index, _, hedged, started = attempts[future]
+                if index in pending and not (hedged and (future.exception() or future.result() is None)):
+                    if not future.exception():
+                        durations.append(time.monotonic() - started)
+                    cancel_others(index, future)
+                    results[index] = future
+                elif index in pending:
+                    pending[index].remove(future)
+                del attempts[future]
+    finally:
+        if cancel:
+            for future, (_index, item, hedged, _) in attempts.items():
+                if not future.done():
+                    cancel(item, hedged)
+
+
 class FragmentFD(FileDownloader):
     """
     A base file downloader class for fragmented media (e.g. f4m/m3u8 manifests).
@@ -34,8 +232,12 @@ class FragmentFD(FileDownloader):
     skip_unavailable_fragments:
                         Skip unavailable fragments (DASH and hlsnative only)
     keep_fragments:     Keep downloaded fragments on disk after downloading is
-                        finished
+                        finished. Otherwise, fragments are held in memory
+                        and never written to disk on their own
     concurrent_fragment_downloads:  The number of threads to use for native hls and dash downloads
+    decryption_processes:  The number of processes that decrypt AES-128 fragments when
+                        only the pure-Python cipher is available. Default is 0,
+                        which decrypts them in the download threads
     _no_ytdl_file:      Don't use .ytdl file
 
     For each incomplete fragment download yt-dlp keeps on disk a special
@@ -55,10 +257,20 @@ class FragmentFD(FileDownloader):
                 index:  0-based index of current fragment among all fragments
             fragment_count:
                 Total count of fragments
+            dest_length:
+                Length of the destination file when the state was saved
+
+    The state is only saved every YTDL_CHECKPOINT_FRAGMENTS fragments or
+    YTDL_CHECKPOINT_INTERVAL seconds, and when the download is interrupted.
+    Anything appended to the destination file after the last checkpoint is
+    truncated and downloaded again when resuming.
 
     This feature is experimental and file format may change in future.
     """
 
+    YTDL_CHECKPOINT_FRAGMENTS = 100
+    YTDL_CHECKPOINT_INTERVAL = 5
+
     def report_retry_fragment(self, err, frag_index, count, retries):
         self.deprecation_warning('yt_dlp.downloader.FragmentFD.report_retry_fragment is deprecated. '
                                  'Use yt_dlp.downloader.FileDownloader.report_retry instead')
@@ -77,7 +289,7 @@ def _prepare_and_start_frag_download(self, ctx, info_dict):
         self._start_frag_download(ctx, info_dict)
 
     def __do_ytdl_file(self, ctx):
-        return ctx['live'] is not True and ctx['tmpfilename'] != '-' and not self.params.get('_no_ytdl_file')
+        return ctx['live'] is not True and not ctx['to_pipe'] and not self.params.get('_no_ytdl_file')
 
     def _read_ytdl_file(self, ctx):
         assert 'ytdl_corrupt' not in ctx
@@ -87,29 +299,56 @@ def _read_ytdl_file(self, ctx):
             ctx['fragment_index'] = ytdl_data['downloader']['current_fragment']['index']
             if 'extra_state' in ytdl_data['downloader']:
                 ctx['extra_state'] = ytdl_data['downloader']['extra_state']
+            ctx['ytdl_dest_length'] = ytdl_data['downloader'].get('dest_length')
         except Exception:
             ctx['ytdl_corrupt'] = True
         finally:
             stream.close()
 
-    def _write_ytdl_file(self, ctx):
+    def _write_ytdl_file(self, ctx, fragment_index=None, dest_length=None):
         frag_index_stream, _ = self.sanitize_open(self.ytdl_filename(ctx['filename']), 'w')
         try:
             downloader = {
                 'current_fragment': {
-                    'index': ctx['fragment_index'],
+                    'index': ctx['fragment_index'] if fragment_index is None else fragment_index,
                 },
             }
             if 'extra_state' in ctx:
                 downloader['extra_state'] = ctx['extra_state']
             if ctx.get('fragment_count') is not None:
                 downloader['fragment_count'] = ctx['fragment_count']
+            if dest_length is not None:
+                downloader['dest_length'] = dest_length
             frag_index_stream.write(json.dumps({'downloader': downloader}))
         finally:
             frag_index_stream.close()
 
+    def _checkpoint_ytdl_file(self, ctx, force=False):
+        """Save the resume state if enough fragments or time have passed since the last checkpoint"""
+        if not self.__do_ytdl_file(ctx) or not ctx.get('ytdl_unsaved_fragments'):
+            return
+        if not force and (
+                ctx['ytdl_unsaved_fragments'] < self.YTDL_CHECKPOINT_FRAGMENTS
+                and time.monotonic() - ctx['ytdl_checkpoint_time'] < self.YTDL_CHECKPOINT_INTERVAL):
+            return
+        dest_stream = ctx['dest_stream']
+        if dest_stream.closed:
+            dest_length = self.filesize_or_none(ctx['tmpfilename'])
+        else:
+            dest_stream.flush()
+            dest_length = dest_stream.tell()
+        self._write_ytdl_file(ctx, ctx['ytdl_appended_index'], dest_length)
+        ctx.update({
+            'ytdl_unsaved_fragments': 0,
+            'ytdl_checkpoint_time': time.monotonic(),
+        })
+
+    @staticmethod
+    def _fragment_filename(tmpfilename, frag_index):
+        return '%s-Frag%d' % (tmpfilename, frag_index)
+
     def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_data=None):
-        fragment_filename = '%s-Frag%d' % (ctx['tmpfilename'], ctx['fragment_index'])
+        fragment_filename = self._fragment_filename(ctx['tmpfilename'], ctx['fragment_index'])
         fragment_info_dict = {
             'url': frag_url,
             'http_headers': headers or info_dict.get('http_headers'),
@@ -118,7 +357,7 @@ def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_dat
         }
         frag_resume_len = 0
         if ctx['dl'].params.get('continuedl', True):
-            frag_resume_len = self.filesize_or_none(self.temp_name(fragment_filename))
+            frag_resume_len = ctx['dl'].filesize_or_none(ctx['dl'].temp_name(fragment_filename))
         fragment_info_dict['frag_resume_len'] = ctx['frag_resume_len'] = frag_resume_len
 
         success, _ = ctx['dl'].download(fragment_filename, fragment_info_dict)
@@ -132,6 +371,12 @@ def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_dat
     def _read_fragment(self, ctx):
         if not ctx.get('fragment_filename_sanitized'):
             return None
+        if isinstance(ctx['dl'], HttpMemoryDownloader):
+            frag_content = ctx['dl'].pop_fragment(ctx['fragment_filename_sanitized'])
+            if frag_content is not None:
+                ctx['fragment_on_disk'] = False
+                return frag_content
+            # Not downloaded in this session, e.g. left on disk by an interrupted --keep-fragments run
         try:
             down, frag_sanitized = self.sanitize_open(ctx['fragment_filename_sanitized'], 'rb')
         except FileNotFoundError:
@@ -146,12 +391,18 @@ def _read_fragment(self, ctx):
     def _append_fragment(self, ctx, frag_content):
         try:
             ctx['dest_stream'].write(frag_content)
-            ctx['dest_stream'].flush()
+            if ctx['to_pipe']:
+                ctx['dest_stream'].flush()
         finally:
-            if self.__do_ytdl_file(ctx):
-                self._write_ytdl_file(ctx)
+            ctx['ytdl_appended_index'] = ctx['fragment_index']
+            ctx['ytdl_unsaved_fragments'] = ctx.get('ytdl_unsaved_fragments', 0) + 1
+            self._checkpoint_ytdl_file(ctx)
             if not self.params.get('keep_fragments', False):
-                self.try_remove(ctx['fragment_filename_sanitized'])
+                frag_filename = ctx['fragment_filename_sanitized']
+                if isinstance(ctx['dl'], HttpMemoryDownloader):
+                    ctx['dl'].try_remove(frag_filename)
+                if ctx.pop('fragment_on_disk', True):
+                    self.try_remove(frag_filename)
             del ctx['fragment_filename_sanitized']
 
     def _prepare_frag_download(self, ctx):
@@ -164,10 +415,11 @@ def _prepare_frag_download(self, ctx):
             total_frags_str = 'unknown (live)'
         self.to_screen(f'[{self.FD_NAME}] Total fragments: {total_frags_str}')
         self.report_destination(ctx['filename'])
-        dl = HttpQuietDownloader(self.ydl, {
+        dl = (HttpQuietDownloader if self.params.get('keep_fragments') else HttpMemoryDownloader)(self.ydl, {
             **self.params,
             'noprogress': True,
             'test': False,
+            'http_connections': 1,
             'sleep_interval': 0,
             'max_sleep_interval': 0,
             'sleep_interval_subtitles': 0,
@@ -183,6 +435,7 @@ def _prepare_frag_download(self, ctx):
         # Should be initialized before ytdl file check
         ctx.update({
             'tmpfilename': tmpfilename,
+            'to_pipe': self.is_pipe(tmpfilename),
             'fragment_index': 0,
         })
 
@@ -192,7 +445,17 @@ def _prepare_frag_download(self, ctx):
             if continuedl and ytdl_file_exists:
                 self._read_ytdl_file(ctx)
                 is_corrupt = ctx.get('ytdl_corrupt') is True
+                dest_length = ctx.pop('ytdl_dest_length', None)
                 is_inconsistent = ctx['fragment_index'] > 0 and resume_len == 0
+                if dest_length is not None and not is_corrupt:
+                    if resume_len < dest_length:
+                        is_inconsistent = True
+                    elif resume_len > dest_length:
+                        # Fragments appended after the last checkpoint are downloaded again
+                        self.write_debug(
+                            f'Truncating {tmpfilename} to {dest_length} bytes from the last checkpoint')
+                        os.truncate(tmpfilename, dest_length)
+                        resume_len = dest_length
                 if is_corrupt or is_inconsistent:
                     message = (
                         '.ytdl file is corrupt' if is_corrupt else
@@ -200,16 +463,17 @@ def _prepare_frag_download(self, ctx):
                     self.report_warning(
                         f'{message}. Restarting from the beginning ...')
                     ctx['fragment_index'] = resume_len = 0
+                    open_mode = 'wb'
                     if 'ytdl_corrupt' in ctx:
                         del ctx['ytdl_corrupt']
-                    self._write_ytdl_file(ctx)
+                    self._write_ytdl_file(ctx, dest_length=0)
 
             else:
                 if not continuedl:
                     if ytdl_file_exists:
                         self._read_ytdl_file(ctx)
                     ctx['fragment_index'] = resume_len = 0
-                self._write_ytdl_file(ctx)
+                self._write_ytdl_file(ctx, dest_length=0)
                 assert ctx['fragment_index'] == 0
 
         dest_stream, tmpfilename = self.sanitize_open(tmpfilename, open_mode)
@@ -220,6 +484,7 @@ def _prepare_frag_download(self, ctx):
             'tmpfilename': tmpfilename,
             # Total complete fragments downloaded so far in bytes
             'complete_frags_downloaded_bytes': resume_len,
+            'ytdl_checkpoint_time': time.monotonic(),
         })
 
     def _start_frag_download(self, ctx, info_dict):
@@ -284,11 +549,12 @@ def frag_progress_hook(s):
 
     def _finish_frag_download(self, ctx, info_dict):
         ctx['dest_stream'].close()
+        ctx['ytdl_unsaved_fragments'] = 0
         if self.__do_ytdl_file(ctx):
             self.try_remove(self.ytdl_filename(ctx['filename']))
         elapsed = time.time() - ctx['started']
 
-        to_file = ctx['tmpfilename'] != '-'
+        to_file = not ctx['to_pipe']
         if to_file:
             downloaded_bytes = self.filesize_or_none(ctx['tmpfilename'])
         else:
@@ -335,10 +601,19 @@ def _prepare_external_frag_download(self, ctx):
         # Should be initialized before ytdl file check
         ctx.update({
             'tmpfilename': tmpfilename,
+            'to_pipe': self.is_pipe(tmpfilename),
             'fragment_index': 0,
         })
 
-    def decrypter(self, info_dict):
+    def _decryption_pool(self):
+        processes = self.params.get('decryption_processes') or 0
+        if processes < 1 or not aes_cbc_decrypt_is_native():
+            return None
+        # The processes are only started once an encrypted fragment is submitted
+        return concurrent.futures.ProcessPoolExecutor(processes)
+
+    def decrypter(self, info_dict, pool=None):
+        """Return a function that decrypts the content of a fragment, optionally in the process pool"""
         _key_cache = {}
 
         def _get_key(url):
@@ -360,7 +635,9 @@ def decrypt_fragment(fragment, frag_content):
             # not what it decrypts to.
             if self.params.get('test', False):
                 return frag_content
-            return unpad_pkcs7(aes_cbc_decrypt_bytes(frag_content, decrypt_info['KEY'], iv))
+            if pool is None:
+                return unpad_pkcs7(aes_cbc_decrypt_bytes(frag_content, decrypt_info['KEY'], iv))
+            return unpad_pkcs7(pool.submit(aes_cbc_decrypt_bytes, frag_content, decrypt_info['KEY'], iv).result())
 
         return decrypt_fragment
 
@@ -430,13 +707,19 @@ def interrupt_trigger_iter(fg):
 
     def download_and_append_fragments(
             self, ctx, fragments, info_dict, *, is_fatal=(lambda idx: False),
-            pack_func=(lambda content, idx: content), finish_func=None,
-            tpe=None, interrupt_trigger=(True, )):
+            prepare_func=(lambda content, idx: content), pack_func=(lambda content, idx: content),
+            finish_func=None, tpe=None, interrupt_trigger=(True, )):
+        """
+        Download the fragments and append them to ctx['dest_stream'], in order
+
+        Reading, decrypting and `prepare_func` run in the download threads, so that only
+        the order-dependent `pack_func` and the writes are left to the appending thread
+        """
 
         if not self.params.get('skip_unavailable_fragments', True):
             is_fatal = lambda _: True
 
-        def download_fragment(fragment, ctx):
+        def download_fragment(fragment, ctx, hedged=False):
             if not interrupt_trigger[0]:
                 return
 
@@ -447,8 +730,8 @@ def download_fragment(fragment, ctx):
             if byte_range:
                 headers['Range'] = 'bytes=%d-%d' % (byte_range['start'], byte_range['end'] - 1)
 
-            # Never skip the first fragment
-            fatal = is_fatal(fragment.get('index') or (frag_index - 1))
+            # Never skip the first fragment. A failed hedged request just leaves the fragment to the original one
+            fatal = not hedged and is_fatal(fragment.get('index') or (frag_index - 1))
 
             def error_callback(err, count, retries):
                 if fatal and count > retries:
@@ -456,7 +739,7 @@ def error_callback(err, count, retries):
                 self.report_retry(err, count, retries, frag_index, fatal)
                 ctx['last_error'] = err
 
-            for retry in RetryManager(self.params.get('fragment_retries'), error_callback):
+            for retry in RetryManager(0 if hedged else self.params.get('fragment_retries'), error_callback):
                 try:
                     ctx['fragment_count'] = fragment.get('fragment_count')
                     if not self._download_fragment(
@@ -469,6 +752,10 @@ def error_callback(err, count, retries):
                     if fatal:
                         raise
 
+        def process_fragment(fragment, ctx):
+            frag_content = decrypt_fragment(fragment, self._read_fragment(ctx))
+            return frag_content and prepare_func(frag_content, fragment['frag_index'])
+
         def append_fragment(frag_content, frag_index, ctx):
             if frag_content:
                 self._append_fragment(ctx, pack_func(frag_content, frag_index))
@@ -480,47 +767,81 @@ def append_fragment(frag_content, frag_index, ctx):
                 return False
             return True
 
-        decrypt_fragment = self.decrypter(info_dict)
+        decryption_pool = self._decryption_pool()
+        decrypt_fragment = self.decrypter(info_dict, decryption_pool)
 
         max_workers = math.ceil(
             self.params.get('concurrent_fragment_downloads', 1) / ctx.get('max_progress', 1))
-        if max_workers > 1:
-            def _download_fragment(fragment):
-                ctx_copy = ctx.copy()
-                download_fragment(fragment, ctx_copy)
-                return fragment, fragment['frag_index'], ctx_copy.get('fragment_filename_sanitized')
-
-            with tpe or concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+        try:
+            if max_workers > 1:
+                # Hedged requests download into their own buffer, next to the stalled original
+                hedge_tmpfilename = f'{ctx["tmpfilename"]}.hedge'
+
+                def _download_fragment(fragment, hedged=False):
+                    ctx_copy = ctx.copy()
+                    if hedged:
+                        ctx_copy['tmpfilename'] = hedge_tmpfilename
+                    download_fragment(fragment, ctx_copy, hedged)
+                    if hedged and not ctx_copy.get('fragment_filename_sanitized'):
+                        return None
+                    frag_content = process_fragment(fragment, ctx_copy)
+                    return (fragment['frag_index'], frag_content,
+                            ctx_copy.get('fragment_filename_sanitized'), ctx_copy.get('fragment_on_disk', True))
+
+                def hedge_fragment(fragment):
+                    return _download_fragment(fragment, hedged=True)
+
+                def cancel_fragment(fragment, hedged):
+                    ctx['dl'].cancel(self._fragment_filename(
+                        hedge_tmpfilename if hedged else ctx['tmpfilename'], fragment['frag_index']))
+
+                # Hedging needs the in-memory downloader: the two attempts must not share a file,
+                # and the losing one is aborted through its buffer
+                in_memory = isinstance(ctx['dl'], HttpMemoryDownloader)
+                pool = tpe or concurrent.futures.ThreadPoolExecutor(max_workers)
                 try:
-                    for fragment, frag_index, frag_filename in pool.map(_download_fragment, fragments):
-                        ctx.update({
-                            'fragment_filename_sanitized': frag_filename,
-                            'fragment_index': frag_index,
-                        })
-                        if not append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx):
-                            return False
+                    with contextlib.closing(_map_reordered(
+                            pool, _download_fragment, fragments, max_workers, max_workers * 4,
+                            hedge=hedge_fragment if in_memory and not ctx['live'] else None,
+                            cancel=cancel_fragment if in_memory else None)) as results:
+                        for frag_index, frag_content, frag_filename, on_disk in results:
+                            ctx.update({
+                                'fragment_filename_sanitized': frag_filename,
+                                'fragment_index': frag_index,
+                                'fragment_on_disk': on_disk,
+                            })
+                            if not append_fragment(frag_content, frag_index, ctx):
+                                return False
                 except KeyboardInterrupt:
                     self._finish_multiline_status()
                     self.report_error(
                         'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
                     pool.shutdown(wait=False)
                     raise
-        else:
-            for fragment in fragments:
-                if not interrupt_trigger[0]:
-                    break
-                try:
-                    download_fragment(fragment, ctx)
-                    result = append_fragment(
-                        decrypt_fragment(fragment, self._read_fragment(ctx)), fragment['frag_index'], ctx)
-                except KeyboardInterrupt:
-                    if info_dict.get('is_live'):
+                finally:
+                    if not tpe:
+                        # Attempts that are still running have been cancelled and stop at their next write
+                        pool.shutdown(wait=not in_memory)
+            else:
+                for fragment in fragments:
+                    if not interrupt_trigger[0]:
                         break
-                    raise
-                if not result:
-                    return False
+                    try:
+                        download_fragment(fragment, ctx)
+                        result = append_fragment(process_fragment(fragment, ctx), fragment['frag_index'], ctx)
+                    except KeyboardInterrupt:
+                        if info_dict.get('is_live'):
+                            break
+                        raise
+                    if not result:
+                        return False
 
-        if finish_func is not None:
-            ctx['dest_stream'].write(finish_func())
-            ctx['dest_stream'].flush()
-        return self._finish_frag_download(ctx, info_dict)
+            if finish_func is not None:
+                ctx['dest_stream'].write(finish_func())
+                ctx['dest_stream'].flush()
+            return self._finish_frag_download(ctx, info_dict)
+        finally:
+            if decryption_pool:
+                decryption_pool.shutdown(cancel_futures=True)
+            # Keep the progress of a failed or interrupted download for resuming
+            self._checkpoint_ytdl_file(ctx, force=True)
@@ -311,12 +311,16 @@ def is_ad_fragment_end(s):
             return fd.real_download(filename, info_dict)
 
         if is_webvtt:
-            def pack_fragment(frag_content, frag_index):
+            def parse_fragment(frag_content, frag_index):
+                # Parsing is independent of the other fragments, so it is done in the download threads
+                return list(webvtt.parse_fragment(frag_content))
+
+            def pack_fragment(blocks, frag_index):
                 output = io.StringIO()
                 adjust = 0
                 overflow = False
                 mpegts_last = None
-                for block in webvtt.parse_fragment(frag_content):
+                for block in blocks:
                     if isinstance(block, webvtt.CueBlock):
                         extra_state['webvtt_mpegts_last'] = mpegts_last
                         if overflow:
@@ -404,6 +408,7 @@ def fin_fragments():
                 self.download_and_append_fragments(ctx, fragments, info_dict)
             else:
                 self.download_and_append_fragments(
-                    ctx, fragments, info_dict, pack_func=pack_fragment, finish_func=fin_fragments)
+                    ctx, fragments, info_dict, prepare_func=parse_fragment, pack_func=pack_fragment,
+                    finish_func=fin_fragments)
         else:
             return self.download_and_append_fragments(ctx, fragments, info_dict)
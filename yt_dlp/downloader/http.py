@@ -1,5 +1,8 @@
+import concurrent.futures
+import json
 import os
 import random
+import threading
 import time
 
 from .common import FileDownloader
@@ -11,6 +14,7 @@
 )
 from ..utils import (
     ContentTooShortError,
+    DownloadError,
     RetryManager,
     ThrottledDownload,
     int_or_none,
@@ -20,8 +24,39 @@
 from ..utils.networking import HTTPHeaderDict
 
 
+class _ByteRange:
+    """Part of a file still to be downloaded by one connection; `end` is exclusive"""
+    __slots__ = ('active', 'end', 'pos')
+
+    def __init__(self, pos, end):
+        self.pos, self.end, self.active = pos, end, False
+
+    @property
+    def remaining(self):
+        return max(0, self.end - self.pos)
+
+
 class HttpFD(FileDownloader):
+    """
+    Downloads a file over HTTP(S)
+
+    With http_connections > 1, a file of known length is split into that many
+    byte ranges, each fetched over its own connection and written at its
+    offset. A connection that finishes its range takes over the second half
+    of the largest range left. The ranges still to be downloaded are saved in
+    the .ytdl file, so that an interrupted download can be resumed.
+    """
+
+    MIN_RANGE_SIZE = 1024 * 1024
+    RANGE_STATE_INTERVAL = 5
+
     def real_download(self, filename, info_dict):
+        connections = self.params.get('http_connections') or 1
+        if connections > 1:
+            result = self._download_segmented(filename, info_dict, connections)
+            if result is not None:
+                return result
+
         url = info_dict['url']
         request_data = info_dict.get('request_data', None)
         request_extensions = {}
@@ -37,6 +72,7 @@ class DownloadContext(dict):
         ctx = DownloadContext()
         ctx.filename = filename
         ctx.tmpfilename = self.temp_name(filename)
+        ctx.to_pipe = self.is_pipe(ctx.tmpfilename)
         ctx.stream = None
 
         # Disable compression
@@ -58,8 +94,7 @@ class DownloadContext(dict):
 
         if self.params.get('continuedl', True):
             # Establish possible resume length
-            if os.path.isfile(ctx.tmpfilename):
-                ctx.resume_len = os.path.getsize(ctx.tmpfilename)
+            ctx.resume_len = self.filesize_or_none(ctx.tmpfilename)
 
         ctx.is_resume = ctx.resume_len > 0
 
@@ -228,6 +263,8 @@ def download():
 
             byte_counter = 0 + ctx.resume_len
             block_size = ctx.block_size
+            # Blocks are read into this buffer and written from it, instead of allocating a new bytes object each time
+            buffer = bytearray(block_size)
             start = time.time()
 
             # measure time over whole while-loop, so slow_down() and best_block_size() work together properly
@@ -235,20 +272,21 @@ def download():
             before = start  # start measuring
 
             def retry(e):
-                close_stream()
-                if ctx.tmpfilename == '-':
+                if ctx.to_pipe:
+                    # Keep writing to the pipe, from where the data stopped
                     ctx.resume_len = byte_counter
                 else:
-                    try:
-                        ctx.resume_len = os.path.getsize(ctx.tmpfilename)
-                    except FileNotFoundError:
-                        ctx.resume_len = 0
+                    close_stream()
+                    ctx.resume_len = self.filesize_or_none(ctx.tmpfilename)
                 raise RetryDownload(e)
 
             while True:
+                read_size = block_size if not is_test else min(block_size, data_len - byte_counter)
+                if read_size > len(buffer):
+                    buffer = bytearray(read_size)
                 try:
                     # Download and write
-                    data_block = ctx.data.read(block_size if not is_test else min(block_size, data_len - byte_counter))
+                    data_block = memoryview(buffer)[:ctx.data.readinto(memoryview(buffer)[:read_size])]
                 except TransportError as err:
                     retry(err)
 
@@ -333,13 +371,13 @@ def retry(e):
                 ctx.resume_len = byte_counter
                 raise NextFragment
 
-            if ctx.tmpfilename != '-':
-                ctx.stream.close()
-
             if data_len is not None and byte_counter != data_len:
                 err = ContentTooShortError(byte_counter, int(data_len))
                 retry(err)
 
+            if ctx.tmpfilename != '-':
+                ctx.stream.close()
+
             self.try_rename(ctx.tmpfilename, ctx.filename)
 
             # Update file modification time
@@ -374,3 +412,234 @@ def retry(e):
                 close_stream()
                 raise
         return False
+
+    def _read_range_state(self, filename):
+        try:
+            with open(self.ytdl_filename(filename), encoding='utf-8') as f:
+                state = json.load(f)['downloader']
+            return state['total_bytes'], [_ByteRange(pos, end) for pos, end in state['ranges']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_range_state(self, filename, total_bytes, ranges):
+        stream, _ = self.sanitize_open(self.ytdl_filename(filename), 'w')
+        try:
+            stream.write(json.dumps({'downloader': {
+                'total_bytes': total_bytes,
+                'ranges': [[r.pos, r.end] for r in ranges if r.remaining],
+            }}))
+        finally:
+            stream.close()
+
+    def _download_segmented(self, filename, info_dict, connections):
+        """Download over several connections; returns None if the file can't be split"""
+        if self.params.get('test') or info_dict.get('request_data') is not None:
+            return None
+        headers = HTTPHeaderDict({'Accept-Encoding': 'identity'}, info_dict.get('http_headers'))
+        tmpfilename = self.temp_name(filename)
+        if 'Range' in headers or self.is_pipe(tmpfilename):
+            return None
+        request_extensions = {}
+        impersonate_target = self._get_impersonate_target(info_dict)
+        if impersonate_target is not None:
+            request_extensions['impersonate'] = impersonate_target
+
+        def make_request(start, end):
+            request = Request(info_dict['url'], None, headers, extensions=request_extensions)
+            request.headers['Range'] = f'bytes={start}-{end - 1}'
+            return request
+
+        state = self.params.get('continuedl', True) and self._read_range_state(filename)
+        if state and self.filesize_or_none(tmpfilename) != state[0]:
+            self.report_unable_to_resume()
+            state = None
+        elif not state and self.params.get('continuedl', True) and self.filesize_or_none(tmpfilename):
+            # A partial download by a single connection; let it resume as such
+            return None
+
+        if state:
+            total_bytes, ranges = state
+        elif (info_dict.get('filesize') or float('inf')) < 2 * self.MIN_RANGE_SIZE:
+            return None
+        else:
+            try:
+                with self.ydl.urlopen(make_request(0, 1)) as response:
+                    _, _, total_bytes = parse_http_range(response.headers.get('Content-Range'))
+                    if response.status != 206:
+                        total_bytes = None
+            except (HTTPError, TransportError) as err:
+                self.write_debug(f'Unable to probe for a segmented download: {err}')
+                return None
+            min_filesize, max_filesize = self.params.get('min_filesize'), self.params.get('max_filesize')
+            if (not total_bytes or total_bytes < 2 * self.MIN_RANGE_SIZE
+                    or (min_filesize is not None and total_bytes < min_filesize)
+                    or (max_filesize is not None and total_bytes > max_filesize)):
+                return None
+            ranges = [
+                _ByteRange(total_bytes * i // connections, total_bytes * (i + 1) // connections)
+                for i in range(connections)]
+
+        chunk_size = (self.params.get('http_chunk_size')
+                      or info_dict.get('downloader_options', {}).get('http_chunk_size') or 0)
+        resume_len = total_bytes - sum(r.remaining for r in ranges)
+        if resume_len:
+            self.report_resuming_byte(resume_len)
+        self.report_destination(filename)
+
+        # The stream holds the lock on the file; data is written through a separate descriptor
+        stream, tmpfilename = self.sanitize_open(tmpfilename, 'ab' if state else 'wb')
+        if not state:
+            self._write_range_state(filename, total_bytes, ranges)
+        fd = os.open(tmpfilename, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        if not state:
+            os.ftruncate(fd, total_bytes)
+
+        lock, write_lock = threading.Lock(), threading.Lock()
+        stop = threading.Event()
+        progress = {
+            'downloaded': resume_len,
+            'saved_at': time.monotonic(),
+            'last_modified': None,
+        }
+        start = time.time()
+
+        def write_at(data, offset):
+            view = memoryview(data)
+            while view:
+                if hasattr(os, 'pwrite'):
+                    written = os.pwrite(fd, view, offset)
+                else:
+                    with write_lock:
+                        os.lseek(fd, offset, os.SEEK_SET)
+                        written = os.write(fd, view)
+                view, offset = view[written:], offset + written
+
+        def claim_range():
+            with lock:
+                for r in ranges:
+                    if not r.active and r.remaining:
+                        r.active = True
+                        return r
+                # Work stealing: split the largest range that is still being downloaded
+                victim = max(ranges, key=lambda r: r.remaining)
+                if victim.remaining < 2 * self.MIN_RANGE_SIZE:
+                    return None
+                r = _ByteRange(victim.pos + victim.remaining // 2, victim.end)
+                victim.end, r.active = r.pos, True
+                ranges.append(r)
+                return r
+
+        def report_progress(nbytes):
+            with lock:
+                progress['downloaded'] += nbytes
+                now = time.time()
+                speed = self.calc_speed(start, now, progress['downloaded'] - resume_len)
+                self._hook_progress({
+                    'status': 'downloading',
+                    'downloaded_bytes': progress['downloaded'],
+                    'total_bytes': total_bytes,
+                    'tmpfilename': tmpfilename,
+                    'filename': filename,
+                    'eta': self.calc_eta(speed, total_bytes - progress['downloaded']),
+                    'speed': speed,
+                    'elapsed': now - start,
+                    'ctx_id': info_dict.get('ctx_id'),
+                }, info_dict)
+                if time.monotonic() - progress['saved_at'] >= self.RANGE_STATE_INTERVAL:
+                    self._write_range_state(filename, total_bytes, ranges)
+                    progress['saved_at'] = time.monotonic()
+            self.slow_down(start, now, progress['downloaded'] - resume_len)
+
+        def fetch_range(r):
+            block_size = self.params.get('buffersize', 1024)
+            buffer = bytearray(block_size)
+            while r.pos < r.end and not stop.is_set():
+                request_end = min(r.end, r.pos + chunk_size) if chunk_size else r.end
+                with self.ydl.urlopen(make_request(r.pos, request_end)) as response:
+                    content_range_start, _, _ = parse_http_range(response.headers.get('Content-Range'))
+                    if response.status != 206 or content_range_start != r.pos:
+                        raise DownloadError(f'Server did not honour the requested range starting at byte {r.pos}')
+                    progress['last_modified'] = response.headers.get('last-modified')
+                    got = 0
+                    while not stop.is_set():
+                        with lock:
+                            # The end may have moved if part of the range was taken over
+                            size = min(block_size, r.end - r.pos, request_end - r.pos)
+                        if size <= 0:
+                            break
+                        if size > len(buffer):
+                            buffer = bytearray(size)
+                        before = time.time()
+                        block = memoryview(buffer)[:response.readinto(memoryview(buffer)[:size])]
+                        if not block:
+                            break
+                        with lock:
+                            # Part of the block may have been taken over while it was read. The position
+                            # is moved before writing, so that the range is not split inside the block
+                            offset, block = r.pos, block[:max(0, r.end - r.pos)]
+                            r.pos += len(block)
+                        if not block:
+                            break
+                        try:
+                            write_at(block, offset)
+                        except BaseException:
+                            with lock:
+                                r.pos = offset
+                            raise
+                        got += len(block)
+                        report_progress(len(block))
+                        if not self.params.get('noresizebuffer', False):
+                            block_size = self.best_block_size(time.time() - before, len(block))
+                    if not got and r.remaining and not stop.is_set():
+                        raise ContentTooShortError(r.pos, r.end)
+
+        def download_range(r):
+            for retry in RetryManager(self.params.get('retries'), self.report_retry):
+                try:
+                    fetch_range(r)
+                except HTTPError as err:
+                    if err.status < 500 or err.status >= 600:
+                        raise
+                    retry.error = err
+                except (TransportError, ContentTooShortError) as err:
+                    retry.error = err
+            if r.remaining:
+                raise DownloadError(f'Unable to download bytes {r.pos}-{r.end - 1}')
+
+        def worker():
+            while not stop.is_set():
+                r = claim_range()
+                if r is None:
+                    return
+                download_range(r)
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(connections) as pool:
+                futures = [pool.submit(worker) for _ in range(connections)]
+                try:
+                    for future in futures:
+                        future.result()
+                finally:
+                    stop.set()
+        except BaseException:
+            # Keep the ranges that are left for resuming
+            with lock:
+                self._write_range_state(filename, total_bytes, ranges)
+            raise
+        finally:
+            os.close(fd)
+            stream.close()
+
+        self.try_remove(self.ytdl_filename(filename))
+        self.try_rename(tmpfilename, filename)
+        if self.params.get('updatetime'):
+            info_dict['filetime'] = self.try_utime(filename, progress['last_modified'])
+        self._hook_progress({
+            'downloaded_bytes': total_bytes,
+            'total_bytes': total_bytes,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': time.time() - start,
+            'ctx_id': info_dict.get('ctx_id'),
+        }, info_dict)
+        return True
@@ -3,7 +3,6 @@
 
 from .common import FileDownloader
 from . import HlsFD
-from ..extractor.afreecatv import _cloudfront_auth_request
 from ..networking.exceptions import network_exceptions
 
 
@@ -33,6 +32,9 @@ def real_download(self, filename, info_dict):
             stop_event.set()
 
     def _cookie_refresh_thread(self, stop_event, refresh_params, referer_url):
+        # Not needed until a subscription VOD is downloaded
+        from ..extractor.afreecatv import _cloudfront_auth_request
+
         m3u8_url = refresh_params['m3u8_url']
         strm_id = refresh_params['strm_id']
         video_id = refresh_params['video_id']
@@ -0,0 +1,279 @@
+"""
+Host index for picking the extractors that may be suitable for a URL
+
+Most _VALID_URL patterns only match a fixed set of hosts. Instead of trying
+every extractor's regex in turn, the hosts (or domain suffixes) each pattern
+can match are derived from the regex once, and only the extractors indexed
+under a suffix of the URL's host are tried - together with those whose
+patterns could not be analysed, in their original order. Patterns without a
+fixed host (eg. "ytsearch:") are indexed by the literal text they start with.
+
+The keys are derived conservatively: a URL matched by an extractor always
+finds it through the index, so the first-match semantics are unchanged.
+The keys are precomputed into lazy_extractors by devscripts/make_lazy_extractors.py
+"""
+
+import heapq
+import sys
+
+from ..utils import variadic
+
+if sys.version_info >= (3, 11):
+    import re._parser as sre_parse
+else:
+    import sre_parse
+
+# Upper bound on the number of alternatives expanded per pattern
+_MAX_EXPANSIONS = 512
+# Keys for patterns that don't start with a fixed host are the (lowercased)
+# literal start of the pattern up to and including the first ":", eg. "^ytsearch"
+_PREFIX_MARKER = '^'
+_MAX_PREFIX_LENGTH = 16
+
+
+class _Wild:
+    """Any string matched by a part of the pattern that isn't a literal"""
+    __slots__ = ('slash',)
+
+    def __init__(self, slash):
+        self.slash = slash  # whether it can match a "/"
+
+
+_WILD = _Wild(False)
+_WILD_SLASH = _Wild(True)
+# Marks the end of the pattern ("$")
+_END = object()
+
+
+class _Unindexable(Exception):
+    pass
+
+
+def _in_matches_slash(items):
+    negate = bool(items) and items[0][0] is sre_parse.NEGATE
+    found = False
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            found = found or av == ord('/')
+        elif op is sre_parse.RANGE:
+            found = found or av[0] <= ord('/') <= av[1]
+        elif op is sre_parse.CATEGORY:
+            found = found or av in (
+                sre_parse.CATEGORY_NOT_DIGIT, sre_parse.CATEGORY_NOT_SPACE, sre_parse.CATEGORY_NOT_WORD)
+        elif op is not sre_parse.NEGATE:
+            return True
+    return found != negate
+
+
+def _single_literal(items):
+    if len(items) == 1 and items[0][0] is sre_parse.LITERAL:
+        return chr(items[0][1])
+    return None
+
+
+def _expand(pattern, prune=False):
+    """Return the ways `pattern` can match as tuples of characters, _Wild and _END
+
+    With `prune`, matches are only expanded until the host can be read from them
+    """
+    complete, prefixes = [], [()]
+    for op, av in pattern:
+        if op is sre_parse.LITERAL:
+            tokens = [(chr(av),)]
+        elif op is sre_parse.NOT_LITERAL:
+            tokens = [(_WILD if av == ord('/') else _WILD_SLASH,)]
+        elif op is sre_parse.ANY:
+            tokens = [(_WILD_SLASH,)]
+        elif op is sre_parse.IN:
+            char = _single_literal(av)
+            tokens = [(char or (_WILD_SLASH if _in_matches_slash(av) else _WILD),)]
+        elif op is sre_parse.AT:
+            tokens = [(_END,) if av in (sre_parse.AT_END, sre_parse.AT_END_STRING) else ()]
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            tokens = [()]
+        elif op is sre_parse.BRANCH:
+            tokens = [t for branch in av[1] for t in _expand(branch)]
+        elif op is sre_parse.SUBPATTERN:
+            tokens = _expand(av[-1])
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, 'POSSESSIVE_REPEAT', None)):
+            low, high, sub = av
+            if (low, high) == (1, 1):
+                tokens = _expand(sub)
+            elif (low, high) == (0, 1):
+                tokens = [(), *_expand(sub)]
+            else:
+                tokens = [_repeated(_expand(sub))]
+                if low == 0:
+                    tokens.insert(0, ())
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            tokens = _expand(av)
+        else:
+            tokens = [(_WILD_SLASH,)]
+
+        extended = {}
+        for prefix in prefixes:
+            for t in tokens:
+                extended[prefix + t] = None
+        prefixes = []
+        for prefix in extended:
+            (complete if prune and _host_complete(prefix) else prefixes).append(prefix)
+        if len(complete) + len(prefixes) > _MAX_EXPANSIONS:
+            raise _Unindexable
+        if not prefixes:
+            break
+    return complete + prefixes
+
+
+def _repeated(alternatives):
+    """Tokens for one or more repetitions of any of the alternatives"""
+    slash = any((isinstance(t, _Wild) and t.slash) or t == '/' or t is _END for ts in alternatives for t in ts)
+
+    def common(index, min_length):
+        chars = {ts[index] if len(ts) >= min_length else None for ts in alternatives}
+        return tuple(chars) if len(chars) == 1 and isinstance(next(iter(chars)), str) else ()
+
+    # Keep the delimiters of eg. "(?:/[^/]+)*" and "(?:[\w-]+\.)+" so that the host/domain next to them can be used
+    return (*common(0, 1), _WILD_SLASH if slash else _WILD, *common(-1, 2))
+
+
+def _host_complete(tokens):
+    """Whether the tokens already contain everything that's needed to find the host"""
+    try:
+        start = _host_start(tokens)
+    except _Unindexable:
+        # Either the scheme is still incomplete or the pattern can't be indexed
+        return any(not isinstance(t, str) for t in tokens)
+    return any(t == '/' or t is _END for t in tokens[start:])
+
+
+def _host_start(tokens):
+    if tokens[:2] == ('/', '/'):
+        return 2
+    for i, t in enumerate(tokens):
+        if not isinstance(t, str):
+            raise _Unindexable
+        if t == ':' and tokens[i + 1:i + 3] == ('/', '/'):
+            return i + 3
+    raise _Unindexable
+
+
+def _prefix_key(tokens):
+    prefix = []
+    for t in tokens[:_MAX_PREFIX_LENGTH]:
+        if not isinstance(t, str):
+            break
+        prefix.append(t)
+        if t == ':':
+            break
+    if not prefix:
+        raise _Unindexable
+    return _PREFIX_MARKER + ''.join(prefix).lower()
+
+
+def _url_key(tokens):
+    try:
+        start = _host_start(tokens)
+    except _Unindexable:
+        # No fixed scheme; re.match still anchors the pattern to the start of the URL
+        return _prefix_key(tokens)
+
+    host = []
+    for t in tokens[start:]:
+        if t == '/' or t is _END or t in (':', '?', '#'):
+            break
+        if isinstance(t, _Wild) and t.slash:
+            return _prefix_key(tokens)
+        host.append(t)
+    else:
+        # re.match allows anything after the pattern, so the host isn't delimited
+        return _prefix_key(tokens)
+
+    wild = max((i for i, t in enumerate(host) if isinstance(t, _Wild)), default=-1)
+    suffix = ''.join(host[wild + 1:])
+    if wild >= 0:
+        if not suffix.startswith('.'):
+            return _prefix_key(tokens)
+        suffix = suffix[1:]
+    if not suffix:
+        return _prefix_key(tokens)
+    return suffix.lower()
+
+
+def valid_url_keys(valid_url):
+    """Return the keys under which to index the `_VALID_URL` pattern(s), or None if it can't be indexed"""
+    if valid_url is False:
+        return ()
+    try:
+        keys = {
+            _url_key(tokens)
+            for pattern in variadic(valid_url)
+            for tokens in _expand(sre_parse.parse(pattern), prune=True)}
+    except Exception:  # _Unindexable, or anything the regex engine accepts that isn't understood here
+        return None
+    # Every suffix of the host/prefix of the URL is looked up, so eg. "www.example.com" is redundant with "example.com"
+    return tuple(sorted(
+        key for key in keys if not any(
+            key.startswith(other) if key.startswith(_PREFIX_MARKER) else key.endswith(f'.{other}')
+            for other in keys if other != key and other.startswith(_PREFIX_MARKER) == key.startswith(_PREFIX_MARKER))))
+
+
+def ie_url_keys(ie):
+    """Return the keys under which to index the extractor class, or None if it has to be tried for every URL"""
+    # Lazy extractors carry the keys computed from the real class
+    for klass in ie.__mro__:
+        if '_URL_KEYS' in klass.__dict__:
+            return klass._URL_KEYS
+
+    from .common import InfoExtractor
+
+    if (getattr(ie.suitable, '__func__', None) is not InfoExtractor.suitable.__func__
+            or getattr(ie._match_valid_url, '__func__', None) is not InfoExtractor._match_valid_url.__func__):
+        return None
+    return valid_url_keys(ie._VALID_URL)
+
+
+def url_keys(url):
+    """Return all the keys the extractors suitable for this URL may be indexed under"""
+    url = url.lower()
+    prefix = url[:_MAX_PREFIX_LENGTH].partition(':')
+    prefix = prefix[0] + prefix[1]
+    keys = {_PREFIX_MARKER + prefix[:end] for end in range(1, len(prefix) + 1)}
+
+    if url.startswith('//'):
+        rest = url[2:]
+    else:
+        _, sep, rest = url.partition('://')
+        if not sep:
+            return keys
+    segment = rest.partition('/')[0]
+    for end, char in enumerate(f'{segment}\0'):
+        if char in ':?#\0':
+            labels = segment[:end].split('.')
+            keys.update('.'.join(labels[i:]) for i in range(len(labels)))
+    return keys
+
+
+class URLIndex:
+    """Picks the extractors out of an ordered mapping of ie_key -> extractor that may be suitable for a URL"""
+
+    def __init__(self, ies):
+        self._ie_keys = list(ies)
+        self._index = {}
+        self._wildcard = []
+        for position, ie in enumerate(ies.values()):
+            keys = ie_url_keys(ie if isinstance(ie, type) else type(ie))
+            if keys is None:
+                self._wildcard.append(position)
+            for key in keys or ():
+                self._index.setdefault(key, []).append(position)
+
+    def __len__(self):
+        return len(self._ie_keys)
+
+    def candidates(self, url):
+        """Yield the ie_keys of the extractors that may be suitable for the URL, in their original order"""
+        last = None
+        for position in heapq.merge(self._wildcard, *filter(None, map(self._index.get, url_keys(url)))):
+            if position != last:
+                last = position
+                yield self._ie_keys[position]
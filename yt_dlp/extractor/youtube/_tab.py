@@ -1,3 +1,4 @@
+import contextlib
 import functools
 import itertools
 import re
@@ -18,6 +19,7 @@
     parse_count,
     parse_duration,
     parse_qs,
+    read_ahead,
     smuggle_url,
     str_to_int,
     strftime_or_none,
@@ -32,6 +34,9 @@
 
 
 class YoutubeTabBaseInfoExtractor(YoutubeBaseInfoExtractor):
+    # Number of continuation pages that are fetched ahead of the entries being processed
+    _CONTINUATION_READ_AHEAD = 1
+
     @staticmethod
     def passthrough_smuggled_data(func):
         def _smuggle(info, smuggled_data):
@@ -520,6 +525,17 @@ def _extract_entries(self, parent_renderer, continuation_list):
             continuation_list[0] = self._extract_continuation(parent_renderer)
 
     def _entries(self, tab, item_id, ytcfg, delegated_session_id, visitor_data):
+        # The next continuation is fetched while the entries of the current page are processed
+        pages = self._entry_pages(tab, item_id, ytcfg, delegated_session_id, visitor_data)
+        if self.get_param('sync_playlists'):
+            # An unchanged playlist is synced without requesting any continuation
+            yield from next(pages, [])
+        with contextlib.closing(read_ahead(pages, self._CONTINUATION_READ_AHEAD)) as pages:
+            for page in pages:
+                yield from page
+
+    def _entry_pages(self, tab, item_id, ytcfg, delegated_session_id, visitor_data):
+        """Yield the list of entries of each page; the continuation is known once a page is listed"""
         continuation_list = [None]
         extract_entries = lambda x: self._extract_entries(x, continuation_list)
         tab_content = try_get(tab, lambda x: x['content'], dict)
@@ -528,7 +544,7 @@ def _entries(self, tab, item_id, ytcfg, delegated_session_id, visitor_data):
         parent_renderer = (
             try_get(tab_content, lambda x: x['sectionListRenderer'], dict)
             or try_get(tab_content, lambda x: x['richGridRenderer'], dict) or {})
-        yield from extract_entries(parent_renderer)
+        yield list(extract_entries(parent_renderer))
         continuation = continuation_list[0]
         seen_continuations = set()
         for page_num in itertools.count(1):
@@ -582,13 +598,14 @@ def _entries(self, tab, item_id, ytcfg, delegated_session_id, visitor_data):
             continuation_item = traverse_obj(continuation_items, 0, None, expected_type=dict, default={})
 
             video_items_renderer = None
+            page = []
             for key in continuation_item:
                 if key not in known_renderers:
                     continue
                 func, parent_key = known_renderers[key]
                 video_items_renderer = {parent_key: continuation_items} if parent_key else continuation_items
                 continuation_list = [None]
-                yield from func(video_items_renderer)
+                page.extend(func(video_items_renderer))
                 continuation = continuation_list[0] or self._extract_continuation(video_items_renderer)
 
             # In the case only a continuation is returned, try to follow it.
@@ -596,6 +613,7 @@ def _entries(self, tab, item_id, ytcfg, delegated_session_id, visitor_data):
             # may be prioritized over other continuations.
             # see: https://github.com/yt-dlp/yt-dlp/issues/12933
             continuation = continuation or self._extract_continuation({'contents': [continuation_item]})
+            yield page
 
             if not continuation and not video_items_renderer:
                 break
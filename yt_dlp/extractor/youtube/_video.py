@@ -24,7 +24,7 @@
     short_client_name,
 )
 from .jsc._builtin.ejs import _EJS_WIKI_URL
-from .jsc._director import initialize_jsc_director
+from .jsc._director import JsChallengeBatcher, initialize_jsc_director
 from .jsc.provider import JsChallengeRequest, JsChallengeType, NChallengeInput, SigChallengeInput
 from .pot._director import initialize_pot_director
 from .pot.provider import PoTokenContext, PoTokenRequest
@@ -150,6 +150,8 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
     _DEFAULT_AUTHED_CLIENTS = ('tv_downgraded', 'web', 'web_safari')
     # Premium does not require POT (except for subtitles)
     _DEFAULT_PREMIUM_CLIENTS = ('tv_downgraded', 'web_creator', 'web')
+    # Solved n challenges that are kept in the cache per player
+    _MAX_CACHED_N_RESULTS = 1000
 
     _GEO_BYPASS = False
 
@@ -1912,6 +1914,7 @@ def _real_initialize(self):
         super()._real_initialize()
         self._pot_director = initialize_pot_director(self)
         self._jsc_director = initialize_jsc_director(self)
+        self._jsc_batcher = JsChallengeBatcher(self._jsc_director, on_solved=self._store_n_results_to_cache)
 
     def _prepare_live_from_start_formats(self, formats, video_id, live_start_time, url, webpage_url, smuggled_data, is_live):
         lock = threading.Lock()
@@ -2219,6 +2222,33 @@ def _store_player_data_to_cache(self, data, name, player_url, *cache_keys, use_d
             if use_disk_cache:
                 self.cache.store(cache_id[0], join_nonempty(*cache_id[1:]), data)
 
+    def _load_n_results_from_cache(self, player_url):
+        cache_id = ('youtube-jsc', f'n-{self._player_js_cache_key(player_url)}')
+        if cache_id in self._player_cache:
+            return
+        results = self._player_cache[cache_id] = self.cache.load(*cache_id, min_ver='2025.07.21') or {}
+        for challenge, result in results.items():
+            self._store_player_data_to_cache(result, 'n', player_url, challenge)
+
+    def _store_n_results_to_cache(self, results):
+        """Store the n results of a batch of challenges, with at most one write per player"""
+        results_by_player = collections.defaultdict(dict)
+        for (challenge_type, player_url, challenge), result in results.items():
+            if challenge_type == JsChallengeType.N:
+                results_by_player[player_url][challenge] = result
+        for player_url, n_results in results_by_player.items():
+            self._load_n_results_from_cache(player_url)
+            cache_id = ('youtube-jsc', f'n-{self._player_js_cache_key(player_url)}')
+            cached = self._player_cache[cache_id]
+            new_results = {challenge: result for challenge, result in n_results.items() if cached.get(challenge) != result}
+            if not new_results:
+                continue
+            cached.update(new_results)
+            # Only the most recent results are kept
+            for challenge in list(cached)[:-self._MAX_CACHED_N_RESULTS]:
+                cached.pop(challenge, None)
+            self.cache.store(*cache_id, dict(cached))
+
     def _extract_signature_timestamp(self, video_id, player_url, ytcfg=None, fatal=False):
         """
         Extract signatureTimestamp (sts)
@@ -3276,6 +3306,11 @@ def get_manifest_n_challenge(manifest_url):
 
         def solve_js_challenges():
             # Solve all n/sig challenges in bulk and store the results in self._player_cache
+            self._load_n_results_from_cache(player_url)
+            n_challenges.difference_update([
+                challenge for challenge in n_challenges
+                if self._load_player_data_from_cache('n', player_url, challenge)])
+
             challenge_requests = []
             if n_challenges:
                 challenge_requests.append(JsChallengeRequest(
@@ -3297,21 +3332,22 @@ def solve_js_challenges():
                         player_url=player_url)))
 
             if challenge_requests:
-                for _challenge_request, challenge_response in self._jsc_director.bulk_solve(challenge_requests):
-                    if challenge_response.type == JsChallengeType.SIG:
-                        for challenge, result in challenge_response.output.results.items():
-                            spec_id = len(challenge)
-                            self._store_player_data_to_cache(
-                                [ord(c) for c in result], 'sigfuncs',
-                                player_url, spec_id, use_disk_cache=True)
-                            if spec_id in s_challenges:
-                                s_challenges.remove(spec_id)
-
-                    elif challenge_response.type == JsChallengeType.N:
-                        for challenge, result in challenge_response.output.results.items():
-                            self._store_player_data_to_cache(result, 'n', player_url, challenge)
-                            if challenge in n_challenges:
-                                n_challenges.remove(challenge)
+                # The results include those of the other videos that were solved in the same batch
+                solved_n = {}
+                for (challenge_type, challenge_player_url, challenge), result in self._jsc_batcher.solve(challenge_requests).items():
+                    if challenge_type == JsChallengeType.SIG:
+                        spec_id = len(challenge)
+                        self._store_player_data_to_cache(
+                            [ord(c) for c in result], 'sigfuncs',
+                            challenge_player_url, spec_id, use_disk_cache=True)
+                        if challenge_player_url == player_url:
+                            s_challenges.discard(spec_id)
+
+                    elif challenge_type == JsChallengeType.N:
+                        self._store_player_data_to_cache(result, 'n', challenge_player_url, challenge)
+                        if challenge_player_url == player_url and challenge in n_challenges:
+                            solved_n[challenge] = result
+                n_challenges.difference_update(solved_n)
 
                 # Raise warning if any challenge requests remain
                 # Depending on type of challenge request
@@ -111,7 +111,7 @@ def _get_env_options(self) -> dict[str, str]:
 
         return options
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
+    def _bun_options(self):
         # https://bun.com/docs/cli/run
         options = ['--no-addons', '--prefer-offline']
         if self._lib_script.variant == ScriptVariant.BUN_NPM:
@@ -119,7 +119,16 @@ def _run_js_runtime(self, stdin: str, /) -> str:
             options.append('--install=fallback')
         else:
             options.append('--no-install')
-        cmd = [self.runtime_info.path, '--bun', 'run', *options, '-']
+        return options
+
+    def _worker_cmd(self, /):
+        # The npm imports of the lib script can't be evaluated by the worker
+        if self._lib_script.variant == ScriptVariant.BUN_NPM:
+            return None
+        return [self.runtime_info.path, '--bun', 'run', *self._bun_options(), self._worker_script_file()]
+
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        cmd = [self.runtime_info.path, '--bun', 'run', *self._bun_options(), '-']
         self.logger.debug(f'Running bun: {shlex.join(cmd)}')
 
         with Popen(
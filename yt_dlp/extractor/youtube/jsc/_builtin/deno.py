@@ -72,7 +72,16 @@ def _npm_packages_cached(self, stdin: str) -> bool:
             return False
         return True
 
+    def _worker_cmd(self, /):
+        # The npm imports of the lib script can't be evaluated by the worker
+        if self._lib_script.variant == ScriptVariant.DENO_NPM:
+            return None
+        return [self.runtime_info.path, 'run', *self._deno_options(), self._worker_script_file()]
+
     def _run_js_runtime(self, stdin: str, /) -> str:
+        return self._run_deno(stdin, self._deno_options())
+
+    def _deno_options(self):
         options = [*self._DENO_BASE_OPTIONS]
         if self._lib_script.variant == ScriptVariant.DENO_NPM and self._NPM_PACKAGES_CACHED:
             options.append('--cached-only')
@@ -84,7 +93,7 @@ def _run_js_runtime(self, stdin: str, /) -> str:
         # XXX: Convert this extractor-arg into a general option if/when a JSI framework is implemented
         if self.ejs_setting('jitless', ['false']) != ['false']:
             options.append('--v8-flags=--jitless')
-        return self._run_deno(stdin, options)
+        return options
 
     def _get_env_options(self) -> dict[str, str]:
         options = os.environ.copy()  # pass through existing deno env vars
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import collections
+import contextlib
 import dataclasses
 import enum
 import functools
 import hashlib
 import json
+import os
+import queue
+import subprocess
+import tempfile
+import threading
 
-from yt_dlp.dependencies import yt_dlp_ejs as _has_ejs
+from yt_dlp import dependencies
 from yt_dlp.extractor.youtube.jsc._builtin import vendor
 from yt_dlp.extractor.youtube.jsc.provider import (
     JsChallengeProvider,
@@ -21,12 +27,9 @@
 )
 from yt_dlp.extractor.youtube.pot._provider import configuration_arg
 from yt_dlp.extractor.youtube.pot.provider import provider_bug_report_message
-from yt_dlp.utils import version_tuple
+from yt_dlp.utils import Popen, version_tuple
 from yt_dlp.utils._jsruntime import JsRuntimeInfo
 
-if _has_ejs:
-    import yt_dlp_ejs.yt.solver
-
 TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator
@@ -72,6 +75,131 @@ def __str__(self, /):
         return f'<Script {self.type.value!r} v{self.version} (source: {self.source.value}) variant={self.variant.value!r} size={len(self.code)} hash={self.hash[:7]}...>'
 
 
+# Solves the batches of challenges sent on stdin, one JSON message per line, until stdin is closed.
+# The first message carries the solver scripts; the preprocessed players are kept by their key (the player URL)
+_WORKER_SCRIPT = r'''
+const players = new Map();
+const handle = (message) => {
+  if (message.type === 'init') {
+    (0, eval)(message.code);
+    return { type: 'ready' };
+  }
+  for (const key of message.evict) players.delete(key);
+  if (message.player === null || message.preprocessed) {
+    if (message.player !== null) players.set(message.key, message.player);
+    return jsc({ type: 'preprocessed', preprocessed_player: players.get(message.key), requests: message.requests });
+  }
+  const output = jsc({ type: 'player', player: message.player, requests: message.requests, output_preprocessed: true });
+  if (output.preprocessed_player) players.set(message.key, output.preprocessed_player);
+  if (!message.output_preprocessed) delete output.preprocessed_player;
+  return output;
+};
+(async () => {
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for await (const chunk of (globalThis.Deno ? Deno.stdin.readable : process.stdin)) {
+    buffer += decoder.decode(chunk, { stream: true });
+    let end;
+    while ((end = buffer.indexOf('\n')) !== -1) {
+      const line = buffer.slice(0, end);
+      buffer = buffer.slice(end + 1);
+      let output;
+      try {
+        output = handle(JSON.parse(line));
+      } catch (error) {
+        output = { type: 'error', error: error instanceof Error ? `${error.message}\n${error.stack}` : `${error}` };
+      }
+      console.log(JSON.stringify(output));
+    }
+  }
+})();
+'''
+
+
+class _SolverWorkerError(Exception):
+    pass
+
+
+class _SolverWorker:
+    """A long-lived JS runtime process that solves the batches of challenges sent to it"""
+
+    _MAX_PLAYERS = 4
+
+    def __init__(self, cmd, env, init_code, timeout):
+        self.timeout = timeout
+        self.players = collections.OrderedDict()  # Keys of the players the worker has
+        self._stdout = queue.Queue()
+        self._stderr = collections.deque(maxlen=20)
+        self._proc = Popen(
+            cmd, text=True, env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for target, args in ((self._read_stdout, ()), (self._stderr.extend, (self._proc.stderr,))):
+            threading.Thread(target=target, args=args, daemon=True).start()
+        self._call({'type': 'init', 'code': init_code})
+
+    def _read_stdout(self):
+        for line in self._proc.stdout:
+            self._stdout.put(line)
+        self._stdout.put(None)
+
+    def _call(self, message):
+        try:
+            self._proc.stdin.write(f'{json.dumps(message)}\n')
+            self._proc.stdin.flush()
+        except OSError as e:
+            raise _SolverWorkerError(f'Unable to write to the process: {e}{self._stderr_tail()}')
+        while True:
+            try:
+                line = self._stdout.get(timeout=self.timeout)
+            except queue.Empty:
+                raise _SolverWorkerError(f'No response after {self.timeout} seconds{self._stderr_tail()}')
+            if line is None:
+                raise _SolverWorkerError(
+                    f'The process exited (returncode: {self._proc.wait()}){self._stderr_tail()}')
+            try:
+                output = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Printed by the player
+            if output.get('type') == 'error' and message['type'] == 'init':
+                raise _SolverWorkerError(output['error'])
+            return output
+
+    def _stderr_tail(self):
+        stderr = ''.join(self._stderr).strip()
+        return f': {stderr}' if stderr else ''
+
+    def solve(self, key, player, preprocessed, requests, output_preprocessed=False):
+        """Solve the requests with the player, which is only needed if the worker does not have it yet"""
+        evict = []
+        if player is not None:
+            evict = list(self.players)[:max(len(self.players) + 1 - self._MAX_PLAYERS, 0)]
+        output = self._call({
+            'type': 'solve',
+            'key': key,
+            'player': player,
+            'preprocessed': preprocessed,
+            'output_preprocessed': output_preprocessed,
+            'requests': requests,
+            'evict': evict,
+        })
+        for evicted in evict:
+            del self.players[evicted]
+        # The worker does not keep a player it failed to preprocess
+        if player is None or output.get('type') != 'error':
+            self.players[key] = None
+            self.players.move_to_end(key)
+        return output
+
+    def close(self):
+        with contextlib.suppress(OSError):
+            self._proc.stdin.close()
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+
 class EJSBaseJCP(JsChallengeProvider):
     JS_RUNTIME_NAME: str
     _CACHE_SECTION = 'challenge-solver'
@@ -106,9 +234,17 @@ class EJSBaseJCP(JsChallengeProvider):
     # currently disabled as files are large and we do not support rotation
     _ENABLE_PREPROCESSED_PLAYER_CACHE = False
 
+    _WORKER_TIMEOUT = 60
+    # The worker is restarted after it crashed or timed out, but not after this many failures in a row
+    _MAX_WORKER_FAILURES = 3
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._available = True
+        self._worker = None
+        self._worker_failures = 0
+        self._worker_lock = threading.Lock()
+        self._worker_script_fn = None
         self.ejs_settings = self.ie.get_param('extractor_args', {}).get('youtube-ejs', {})
 
         # Note: The following 3 args are for developer use only & intentionally not documented.
@@ -145,29 +281,39 @@ def _run_js_runtime(self, stdin: str, /) -> str:
         """To be implemented by subclasses"""
         raise NotImplementedError
 
+    def _worker_cmd(self, /) -> list[str] | None:
+        """
+        The command that runs _WORKER_SCRIPT, see _worker_script_file()
+
+        To be implemented by subclasses whose runtime can read the script's stdin as a stream.
+        None to run the runtime for each batch of challenges instead
+        """
+        return None
+
+    def _get_env_options(self) -> dict[str, str] | None:
+        return None
+
+    def _worker_script_file(self, /) -> str:
+        if not self._worker_script_fn:
+            with tempfile.NamedTemporaryFile(
+                    mode='w', prefix='yt-dlp-ejs-worker-', suffix='.js', delete=False, encoding='utf-8') as f:
+                f.write(_WORKER_SCRIPT)
+            self._worker_script_fn = f.name
+        return self._worker_script_fn
+
     def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
         grouped: dict[str, list[JsChallengeRequest]] = collections.defaultdict(list)
         for request in requests:
             grouped[request.input.player_url].append(request)
 
         for player_url, grouped_requests in grouped.items():
-            player = None
-            if self._ENABLE_PREPROCESSED_PLAYER_CACHE:
-                player = self.ie.cache.load(self._CACHE_SECTION, f'player:{player_url}')
-
-            if player:
-                cached = True
-            else:
-                cached = False
-                video_id = next((request.video_id for request in grouped_requests), None)
-                player = self._get_player(video_id, player_url)
-
-            # NB: This output belongs after the player request
-            self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
-
-            stdin = self._construct_stdin(player, cached, grouped_requests)
-            stdout = self._run_js_runtime(stdin)
-            output = json.loads(stdout)
+            with self._worker_lock:
+                output = self._solve_with_worker(player_url, grouped_requests)
+            if output is None:
+                player, cached = self._load_player(player_url, grouped_requests)
+                stdin = self._construct_stdin(player, cached, grouped_requests)
+                stdout = self._run_js_runtime(stdin)
+                output = json.loads(stdout)
             if output['type'] == 'error':
                 raise JsChallengeProviderError(output['error'])
 
@@ -182,11 +328,95 @@ def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
                         NChallengeOutput(response_data['data']) if request.type is JsChallengeType.N
                         else SigChallengeOutput(response_data['data']))))
 
-    def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> str:
-        json_requests = [{
+    def _load_player(self, player_url: str, requests: list[JsChallengeRequest], /) -> tuple[str, bool]:
+        """Return the player and whether it is preprocessed"""
+        player = None
+        if self._ENABLE_PREPROCESSED_PLAYER_CACHE:
+            player = self.ie.cache.load(self._CACHE_SECTION, f'player:{player_url}')
+
+        if player:
+            cached = True
+        else:
+            cached = False
+            video_id = next((request.video_id for request in requests), None)
+            player = self._get_player(video_id, player_url)
+
+        # NB: This output belongs after the player request
+        self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
+        return player, cached
+
+    def _solve_with_worker(self, player_url: str, requests: list[JsChallengeRequest], /) -> dict | None:
+        """Solve the requests with the worker, keeping the player for the next requests; None if it is not usable"""
+        while self._worker_failures < self._MAX_WORKER_FAILURES:
+            if not self._worker:
+                cmd = self._worker_cmd()
+                if not cmd:
+                    return None
+                self.logger.debug(f'Starting {self.JS_RUNTIME_NAME} challenge solver worker')
+                try:
+                    self._worker = _SolverWorker(
+                        cmd, self._get_env_options(), self._solver_code(), self._WORKER_TIMEOUT)
+                except (OSError, _SolverWorkerError) as e:
+                    self._worker_failed(e)
+                    continue
+
+            if player_url in self._worker.players:
+                self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
+                player, cached = None, False
+            else:
+                player, cached = self._load_player(player_url, requests)
+            try:
+                result = self._worker.solve(
+                    player_url, player, cached, self._json_requests(requests),
+                    output_preprocessed=self._ENABLE_PREPROCESSED_PLAYER_CACHE and not cached)
+            except _SolverWorkerError as e:
+                self._worker_failed(e)
+                continue
+            # Only consecutive failures disable the worker
+            self._worker_failures = 0
+            return result
+        return None
+
+    def _worker_failed(self, error, /):
+        self._worker_failures += 1
+        if self._worker_failures >= self._MAX_WORKER_FAILURES:
+            self.logger.warning(
+                f'{self.JS_RUNTIME_NAME} challenge solver worker failed: {error}. '
+                'Falling back to running the runtime for each video')
+        else:
+            self.logger.debug(f'{self.JS_RUNTIME_NAME} challenge solver worker failed, restarting it: {error}')
+        self._close_worker()
+
+    def _close_worker(self, /):
+        if self._worker:
+            self._worker.close()
+            self._worker = None
+
+    def close(self):
+        with self._worker_lock:
+            self._close_worker()
+        if self._worker_script_fn:
+            with contextlib.suppress(OSError):
+                os.remove(self._worker_script_fn)
+            self._worker_script_fn = None
+        super().close()
+
+    def _solver_code(self, /) -> str:
+        return f'''\
+        {self._lib_script.code}
+        Object.assign(globalThis, lib);
+        {self._core_script.code}
+        '''
+
+    @staticmethod
+    def _json_requests(requests: list[JsChallengeRequest], /) -> list[dict]:
+        return [{
             'type': request.type.value,
             'challenges': request.input.challenges,
         } for request in requests]
+
+    def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> str:
+        json_requests = self._json_requests(requests)
         data = {
             'type': 'preprocessed',
             'preprocessed_player': player,
@@ -198,9 +428,7 @@ def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsCha
             'output_preprocessed': True,
         }
         return f'''\
-        {self._lib_script.code}
-        Object.assign(globalThis, lib);
-        {self._core_script.code}
+        {self._solver_code()}
         console.log(JSON.stringify(jsc({json.dumps(data)})));
         '''
 
@@ -264,8 +492,10 @@ def _iter_script_sources(self) -> Generator[tuple[ScriptSource, Callable[[Script
             (ScriptSource.WEB, self._web_release_source)]
 
     def _pypackage_source(self, script_type: ScriptType, /) -> Script | None:
-        if not _has_ejs:
+        if not dependencies.yt_dlp_ejs:
             return None
+        import yt_dlp_ejs.yt.solver
+
         try:
             code = yt_dlp_ejs.yt.solver.core() if script_type is ScriptType.CORE else yt_dlp_ejs.yt.solver.lib()
         except Exception as e:
@@ -4,7 +4,7 @@
 import shlex
 import subprocess
 
-from yt_dlp.extractor.youtube.jsc._builtin.ejs import EJSBaseJCP
+from yt_dlp.extractor.youtube.jsc._builtin.ejs import _WORKER_SCRIPT, EJSBaseJCP
 from yt_dlp.extractor.youtube.jsc.provider import (
     JsChallengeProvider,
     JsChallengeProviderError,
@@ -23,7 +23,7 @@ class NodeJCP(EJSBaseJCP, BuiltinIEContentProvider):
 
     _ARGS = ['-']
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
+    def _node_args(self):
         args = []
 
         if self.ejs_setting('jitless', ['false']) != ['false']:
@@ -35,8 +35,13 @@ def _run_js_runtime(self, stdin: str, /) -> str:
             args.append('--no-warnings=ExperimentalWarning')
         else:
             args.append('--permission')
+        return args
+
+    def _worker_cmd(self, /):
+        return [self.runtime_info.path, *self._node_args(), '--eval', _WORKER_SCRIPT]
 
-        cmd = [self.runtime_info.path, *args, *self._ARGS]
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        cmd = [self.runtime_info.path, *self._node_args(), *self._ARGS]
         self.logger.debug(f'Running node: {shlex.join(cmd)}')
         with Popen(
             cmd,
@@ -2,6 +2,7 @@
 
 import collections
 import dataclasses
+import threading
 import typing
 
 from yt_dlp.extractor.youtube.jsc._builtin.ejs import _EJS_WIKI_URL
@@ -199,6 +200,71 @@ def close(self):
             provider.close()
 
 
+class _ChallengeBatch:
+    def __init__(self):
+        self.challenges = collections.defaultdict(dict)  # (type, player_url) -> {challenge: None}
+        self.video_ids = {}  # (type, player_url) -> video_id of the first request
+        self.results = {}  # (type, player_url, challenge) -> result
+        self.done = False
+
+
+class JsChallengeBatcher:
+    """
+    Solves the challenges that are submitted at the same time (eg. by concurrently processed playlist entries)
+    in one bulk solve per player and challenge type
+
+    While a batch is being solved, the challenges submitted in the meantime are collected into the next one.
+    on_solved(results) is called with the results of each batch, once, by the thread that solved it
+    """
+
+    def __init__(self, director: JsChallengeRequestDirector, on_solved=None):
+        self.director = director
+        self._on_solved = on_solved
+        self._cond = threading.Condition()
+        self._batch = _ChallengeBatch()
+        self._solving = False
+
+    def solve(self, requests: list[JsChallengeRequest]) -> dict[tuple[JsChallengeType, str, str], str]:
+        """Return the results by (type, player_url, challenge); unsolved challenges are missing"""
+        with self._cond:
+            batch = self._batch
+            for request in requests:
+                key = request.type, request.input.player_url
+                batch.challenges[key].update(dict.fromkeys(request.input.challenges))
+                batch.video_ids.setdefault(key, request.video_id)
+            while self._solving and not batch.done:
+                self._cond.wait()
+            if batch.done:
+                return batch.results
+            self._batch = _ChallengeBatch()
+            self._solving = True
+
+        try:
+            batch.results = self._solve_batch(batch)
+            if self._on_solved:
+                self._on_solved(batch.results)
+        finally:
+            with self._cond:
+                batch.done = True
+                self._solving = False
+                self._cond.notify_all()
+        return batch.results
+
+    def _solve_batch(self, batch: _ChallengeBatch, /):
+        input_types = {JsChallengeType.N: NChallengeInput, JsChallengeType.SIG: SigChallengeInput}
+        requests = []
+        for (challenge_type, player_url), challenges in batch.challenges.items():
+            requests.append(JsChallengeRequest(
+                type=challenge_type, video_id=batch.video_ids[challenge_type, player_url],
+                input=input_types[challenge_type](challenges=list(challenges), player_url=player_url)))
+
+        results = {}
+        for request, response in self.director.bulk_solve(requests):
+            for challenge, result in response.output.results.items():
+                results[response.type, request.input.player_url, challenge] = result
+        return results
+
+
 EXTRACTOR_ARG_PREFIX = 'youtubejsc'
 
 
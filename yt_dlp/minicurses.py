@@ -120,6 +120,23 @@ def print_at_line(self, text, pos):
         self.write(self._add_line_number(text, pos), '\n')
 
 
+class SharedLinePrinter(MultilinePrinterBase):
+    """Prints every line to one line of a printer that is shared with others"""
+
+    def __init__(self, printer, line):
+        super().__init__(printer.stream)
+        self.printer, self.line = printer, line
+        self.allow_colors = getattr(printer, 'allow_colors', False)
+        self._HAVE_FULLCAP = printer._HAVE_FULLCAP
+
+    def print_at_line(self, text, pos):
+        self.printer.print_at_line(text, self.line)
+
+    def end(self):
+        # The owner of the shared printer ends it
+        pass
+
+
 class MultilinePrinter(MultilinePrinterBase):
     def __init__(self, stream=None, lines=1, preserve_output=True):
         super().__init__(stream, lines)
@@ -1,4 +1,5 @@
 # flake8: noqa: F401
+import functools
 import warnings
 
 from .common import (
@@ -16,23 +17,30 @@
 from . import _urllib
 from ..utils import bug_reports_message
 
-try:
-    from . import _requests
-except ImportError:
-    pass
-except Exception as e:
-    warnings.warn(f'Failed to import "requests" request handler: {e}' + bug_reports_message())
 
-try:
-    from . import _websockets
-except ImportError:
-    pass
-except Exception as e:
-    warnings.warn(f'Failed to import "websockets" request handler: {e}' + bug_reports_message())
+@functools.cache
+def _load_optional_handlers():
+    """Import the request handlers of the optional dependencies, which register themselves
 
-try:
-    from . import _curlcffi
-except ImportError:
-    pass
-except Exception as e:
-    warnings.warn(f'Failed to import "curl_cffi" request handler: {e}' + bug_reports_message())
+    They are imported once the first request director is built, as their libraries are slow to import
+    """
+    try:
+        from . import _requests
+    except ImportError:
+        pass
+    except Exception as e:
+        warnings.warn(f'Failed to import "requests" request handler: {e}' + bug_reports_message())
+
+    try:
+        from . import _websockets
+    except ImportError:
+        pass
+    except Exception as e:
+        warnings.warn(f'Failed to import "websockets" request handler: {e}' + bug_reports_message())
+
+    try:
+        from . import _curlcffi
+    except ImportError:
+        pass
+    except Exception as e:
+        warnings.warn(f'Failed to import "curl_cffi" request handler: {e}' + bug_reports_message())
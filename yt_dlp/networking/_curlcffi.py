@@ -54,6 +54,8 @@ def readable(self):
     def read(self, size=None):
         exception_raised = True
         try:
+            # readinto() may have left a memoryview of the current chunk
+            self._buffer = bytes(self._buffer)
             while self._iterator and (size is None or len(self._buffer) < size):
                 chunk = next(self._iterator, None)
                 if chunk is None:
@@ -77,6 +79,31 @@ def read(self, size=None):
             if exception_raised:
                 self.close()
 
+    def readinto(self, b):
+        exception_raised = True
+        try:
+            # Copy straight from the received chunk instead of joining chunks into one buffer first
+            while self._iterator and not self._buffer:
+                chunk = next(self._iterator, None)
+                if chunk is None:
+                    self._iterator = None
+                    break
+                self._buffer = memoryview(chunk)
+                self.bytes_read += len(chunk)
+
+            view = memoryview(b).cast('B')
+            n = min(len(view), len(self._buffer))
+            view[:n] = self._buffer[:n]
+            self._buffer = self._buffer[n:]
+
+            if not self._iterator and not self._buffer:
+                self.close()
+            exception_raised = False
+            return n
+        finally:
+            if exception_raised:
+                self.close()
+
     def close(self):
         if not self.closed:
             self._response.close()
@@ -95,8 +122,14 @@ def __init__(self, response: curl_cffi.requests.Response):
             status=response.status_code)
 
     def read(self, amt=None):
+        return self._read(self.fp.read, amt)
+
+    def readinto(self, b):
+        return self._read(self.fp.readinto, b)
+
+    def _read(self, read_func, arg):
         try:
-            res = self.fp.read(amt)
+            res = read_func(arg)
             if self.fp.closed:
                 self.close()
             return res
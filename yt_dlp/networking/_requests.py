@@ -156,6 +156,11 @@ def read(self, amt: int | None = None):
             # catch-all for any other urllib3 response exceptions
             raise TransportError(cause=e) from e
 
+    def readinto(self, b):
+        # urllib3's own readinto() also reads into a temporary bytes object first,
+        # so go through read() to keep content decoding and error handling in one place
+        return self._readinto_from_read(b)
+
 
 class RequestsHTTPAdapter(requests.adapters.HTTPAdapter):
     def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, **kwargs):
@@ -561,6 +561,27 @@ def read(self, amt: int | None = None) -> bytes:
         except Exception as e:
             raise TransportError(cause=e) from e
 
+    def readinto(self, b) -> int:
+        """Read up to len(b) bytes into the writable buffer b, returning the number of bytes read.
+
+        This avoids allocating a new bytes object for every read when b is reused.
+        Subclasses should redefine this method with more precise error handling."""
+        if not hasattr(self.fp, 'readinto'):
+            return self._readinto_from_read(b)
+        try:
+            res = self.fp.readinto(b)
+            if self.fp.closed:
+                self.close()
+            return res
+        except Exception as e:
+            raise TransportError(cause=e) from e
+
+    def _readinto_from_read(self, b) -> int:
+        data = self.read(len(b))
+        n = len(data)
+        memoryview(b).cast('B')[:n] = data
+        return n
+
     def close(self):
         if not self.fp.closed:
             self.fp.close()
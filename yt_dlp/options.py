@@ -784,6 +784,24 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--no-download-archive',
         dest='download_archive', action='store_const', const=None,
         help='Do not use archive file (default)')
+    selection.add_option(
+        '--import-download-archive', metavar='FILE',
+        dest='import_download_archive', default=None,
+        help=(
+            'Add the IDs listed in the text archive FILE to the --download-archive. '
+            'Use this to convert a text archive into a SQLite one, by giving --download-archive '
+            'a file with a .db, .sqlite or .sqlite3 extension. SQLite archives are looked up '
+            'on disk instead of being loaded into memory'))
+    selection.add_option(
+        '--claim-downloads',
+        action='store_true', dest='claim_downloads', default=False,
+        help=(
+            'Claim each video in the --download-archive before downloading it, so that other yt-dlp processes '
+            'sharing the archive skip it. The archive must be a SQLite database'))
+    selection.add_option(
+        '--no-claim-downloads',
+        action='store_false', dest='claim_downloads',
+        help='Do not claim videos in the download archive (default)')
     selection.add_option(
         '--max-downloads',
         dest='max_downloads', metavar='NUMBER', type=int, default=None,
@@ -813,6 +831,18 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--skip-playlist-after-errors', metavar='N',
         dest='skip_playlist_after_errors', default=None, type=int,
         help='Number of allowed failures until the rest of the playlist is skipped')
+    selection.add_option(
+        '--sync-playlists',
+        action='store_true', dest='sync_playlists', default=False,
+        help=(
+            'Process only the entries of each playlist that are newer than those processed by the previous run '
+            'with this option, and stop listing the playlist once they are reached. '
+            'Meant for playlists that list their newest entries first, like the uploads of a channel. '
+            'The newest entries of each playlist are remembered in the cache directory'))
+    selection.add_option(
+        '--no-sync-playlists',
+        action='store_false', dest='sync_playlists',
+        help='Process all the entries of the playlists (default)')
 
     authentication = optparse.OptionGroup(parser, 'Authentication Options')
     authentication.add_option(
@@ -1011,6 +1041,48 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '-N', '--concurrent-fragments',
         dest='concurrent_fragment_downloads', metavar='N', default=1, type=int,
         help='Number of fragments of a dash/hlsnative video that should be downloaded concurrently (default is %default)')
+    downloader.add_option(
+        '--decryption-processes',
+        dest='decryption_processes', metavar='N', default=0, type=int,
+        help=(
+            'Number of processes that decrypt AES-128 hlsnative fragments when neither pycryptodomex '
+            'nor a native AES library is available (default is %default, decrypt them in the download threads)'))
+    downloader.add_option(
+        '--concurrent-entries',
+        dest='concurrent_entries', metavar='N', default=1, type=int,
+        help=(
+            'Number of playlist entries that should be extracted and downloaded concurrently (default is %default). '
+            'The download archive, filters, --max-downloads, --break-on-existing and --skip-playlist-after-errors '
+            'behave as when downloading the entries one by one'))
+    downloader.add_option(
+        '--concurrent-formats',
+        action='store_true', dest='concurrent_formats', default=False,
+        help=(
+            'Download the formats that are to be merged (e.g. "-f bv+ba") at the same time. '
+            'They share the --concurrent-fragments and --limit-rate budgets, and their progress is shown as one'))
+    downloader.add_option(
+        '--no-concurrent-formats',
+        action='store_false', dest='concurrent_formats',
+        help='Download the formats that are to be merged one after the other (default)')
+    downloader.add_option(
+        '--stream-merge',
+        action='store_true', dest='stream_merge', default=False,
+        help=(
+            'Merge the formats while they are being downloaded, by piping them into ffmpeg instead of '
+            'writing them to disk first. The formats are downloaded at the same time as with --concurrent-formats. '
+            'Formats that are not downloaded natively over http(s) or DASH, or that need to be resumed, '
+            'are merged after the download instead. Not supported on Windows'))
+    downloader.add_option(
+        '--no-stream-merge',
+        action='store_false', dest='stream_merge',
+        help='Merge the formats only once they have been downloaded (default)')
+    downloader.add_option(
+        '--concurrent-side-downloads',
+        dest='concurrent_side_downloads', metavar='N', default=1, type=int,
+        help=(
+            'Number of subtitles and thumbnails of a video that should be downloaded concurrently (default is %default). '
+            'When more than 1, they are also downloaded while the video is, except with --skip-download, '
+            '--write-info-json, or postprocessors and --print that run "before_dl"'))
     downloader.add_option(
         '-r', '--limit-rate', '--rate-limit',
         dest='ratelimit', metavar='RATE',
@@ -1078,6 +1150,13 @@ def _preset_alias_callback(option, opt_str, value, parser):
         help=(
             'Size of a chunk for chunk-based HTTP downloading, e.g. 10485760 or 10M (default is disabled). '
             'May be useful for bypassing bandwidth throttling imposed by a webserver (experimental)'))
+    downloader.add_option(
+        '--http-connections',
+        dest='http_connections', metavar='N', default=1, type=int,
+        help=(
+            'Number of connections to download a single file over HTTP with, each fetching '
+            'its own byte range (default is %default). May be useful when a webserver limits '
+            'the bandwidth per connection (experimental)'))
     downloader.add_option(
         '--test',
         action='store_true', dest='test', default=False,
@@ -1377,6 +1456,12 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--print-traffic',
         dest='debug_printtraffic', action='store_true', default=False,
         help='Display sent and read HTTP traffic')
+    verbosity.add_option(
+        '--profile-startup',
+        action='store_true', dest='profile_startup', default=False,
+        help=(
+            'Print how long it took to be ready to download, and the time spent importing each module. '
+            'Must be given on the command line, not in a configuration file'))
 
     filesystem = optparse.OptionGroup(parser, 'Filesystem Options')
     filesystem.add_option(
@@ -1570,6 +1655,10 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--cache-stats',
+        action='store_true', dest='cache_stats', default=False,
+        help='Print how often the cached data of each section was found in memory or on disk, or missing')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail Options')
     thumbnail.add_option(
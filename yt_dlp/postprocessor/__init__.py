@@ -1,43 +1,56 @@
 # flake8: noqa: F401
 
+import importlib
+
 from .common import PostProcessor
-from .embedthumbnail import EmbedThumbnailPP
-from .exec import ExecAfterDownloadPP, ExecPP
-from .ffmpeg import (
-    FFmpegConcatPP,
-    FFmpegCopyStreamPP,
-    FFmpegEmbedSubtitlePP,
-    FFmpegExtractAudioPP,
-    FFmpegFixupDuplicateMoovPP,
-    FFmpegFixupDurationPP,
-    FFmpegFixupM3u8PP,
-    FFmpegFixupM4aPP,
-    FFmpegFixupStretchedPP,
-    FFmpegFixupTimestampPP,
-    FFmpegMergerPP,
-    FFmpegMetadataPP,
-    FFmpegPostProcessor,
-    FFmpegSplitChaptersPP,
-    FFmpegSubtitlesConvertorPP,
-    FFmpegThumbnailsConvertorPP,
-    FFmpegVideoConvertorPP,
-    FFmpegVideoRemuxerPP,
-)
-from .metadataparser import (
-    MetadataFromFieldPP,
-    MetadataFromTitlePP,
-    MetadataParserPP,
-)
-from .modify_chapters import ModifyChaptersPP
-from .movefilesafterdownload import MoveFilesAfterDownloadPP
-from .sponsorblock import SponsorBlockPP
-from .xattrpp import XAttrMetadataPP
 from ..globals import plugin_pps, postprocessors
 from ..plugins import PACKAGE_NAME, register_plugin_spec, PluginSpec
 from ..utils import deprecation_warning
 
+# The post-processors are imported from their modules once they are used,
+# since most runs need only a few of them
+_DEFAULT_PPS = {
+    'EmbedThumbnailPP': 'embedthumbnail',
+    'ExecAfterDownloadPP': 'exec',
+    'ExecPP': 'exec',
+    'FFmpegConcatPP': 'ffmpeg',
+    'FFmpegCopyStreamPP': 'ffmpeg',
+    'FFmpegEmbedSubtitlePP': 'ffmpeg',
+    'FFmpegExtractAudioPP': 'ffmpeg',
+    'FFmpegFixupDuplicateMoovPP': 'ffmpeg',
+    'FFmpegFixupDurationPP': 'ffmpeg',
+    'FFmpegFixupM3u8PP': 'ffmpeg',
+    'FFmpegFixupM4aPP': 'ffmpeg',
+    'FFmpegFixupStretchedPP': 'ffmpeg',
+    'FFmpegFixupTimestampPP': 'ffmpeg',
+    'FFmpegMergerPP': 'ffmpeg',
+    'FFmpegMetadataPP': 'ffmpeg',
+    'FFmpegPostProcessor': 'ffmpeg',
+    'FFmpegSplitChaptersPP': 'ffmpeg',
+    'FFmpegSubtitlesConvertorPP': 'ffmpeg',
+    'FFmpegThumbnailsConvertorPP': 'ffmpeg',
+    'FFmpegVideoConvertorPP': 'ffmpeg',
+    'FFmpegVideoRemuxerPP': 'ffmpeg',
+    'MetadataFromFieldPP': 'metadataparser',
+    'MetadataFromTitlePP': 'metadataparser',
+    'MetadataParserPP': 'metadataparser',
+    'ModifyChaptersPP': 'modify_chapters',
+    'MoveFilesAfterDownloadPP': 'movefilesafterdownload',
+    'SponsorBlockPP': 'sponsorblock',
+    'XAttrMetadataPP': 'xattrpp',
+}
+
+
+def _default_pp(name):
+    value = getattr(importlib.import_module(f'.{_DEFAULT_PPS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
 
 def __getattr__(name):
+    if name in _DEFAULT_PPS:
+        return _default_pp(name)
+
     lookup = plugin_pps.value
     if name in lookup:
         deprecation_warning(
@@ -49,7 +62,12 @@ def __getattr__(name):
 
 
 def get_postprocessor(key):
-    return postprocessors.value[key + 'PP']
+    name = key + 'PP'
+    if name in postprocessors.value:
+        return postprocessors.value[name]
+    elif name in _DEFAULT_PPS:
+        return _default_pp(name)
+    raise KeyError(name)
 
 
 register_plugin_spec(PluginSpec(
@@ -59,11 +77,6 @@ def get_postprocessor(key):
     plugin_destination=plugin_pps,
 ))
 
-_default_pps = {
-    name: value
-    for name, value in globals().items()
-    if name.endswith('PP') or name in ('FFmpegPostProcessor', 'PostProcessor')
-}
-postprocessors.value.update(_default_pps)
+postprocessors.value['PostProcessor'] = PostProcessor
 
-__all__ = list(_default_pps.values())
+__all__ = ['PostProcessor', *_DEFAULT_PPS]
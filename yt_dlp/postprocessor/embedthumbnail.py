@@ -5,8 +5,8 @@
 
 from .common import PostProcessor
 from .ffmpeg import FFmpegPostProcessor, FFmpegThumbnailsConvertorPP
+from .. import dependencies
 from ..compat import imghdr
-from ..dependencies import mutagen
 from ..utils import (
     Popen,
     PostProcessingError,
@@ -16,12 +16,6 @@
     shell_quote,
 )
 
-if mutagen:
-    from mutagen.flac import FLAC, Picture
-    from mutagen.mp4 import MP4, MP4Cover
-    from mutagen.oggopus import OggOpus
-    from mutagen.oggvorbis import OggVorbis
-
 
 class EmbedThumbnailPPError(PostProcessingError):
     pass
@@ -115,9 +109,11 @@ def run(self, info):
         elif info['ext'] in ['m4a', 'mp4', 'm4v', 'mov']:
             prefer_atomicparsley = 'embed-thumbnail-atomicparsley' in self.get_param('compat_opts', [])
             # Method 1: Use mutagen
-            if not mutagen or prefer_atomicparsley:
+            if not dependencies.mutagen or prefer_atomicparsley:
                 success = False
             else:
+                from mutagen.mp4 import MP4, MP4Cover
+
                 self._report_run('mutagen', filename)
                 f = {'jpeg': MP4Cover.FORMAT_JPEG, 'png': MP4Cover.FORMAT_PNG}
                 try:
@@ -195,8 +191,11 @@ def run(self, info):
                     raise EmbedThumbnailPPError(f'Unable to embed using ffprobe & ffmpeg; {err}')
 
         elif info['ext'] in ['ogg', 'opus', 'flac']:
-            if not mutagen:
+            if not dependencies.mutagen:
                 raise EmbedThumbnailPPError('module mutagen was not found. Please install using `python3 -m pip install mutagen`')
+            from mutagen.flac import FLAC, Picture
+            from mutagen.oggopus import OggOpus
+            from mutagen.oggvorbis import OggVorbis
 
             self._report_run('mutagen', filename)
             f = {'opus': OggOpus, 'flac': FLAC, 'ogg': OggVorbis}[info['ext']](filename)
@@ -1,11 +1,14 @@
 import collections
+import contextlib
 import contextvars
 import functools
 import itertools
 import json
 import os
 import re
+import select
 import subprocess
+import threading
 import time
 
 from .common import PostProcessor
@@ -329,6 +332,20 @@ def real_run_ffmpeg(self, input_path_opts, output_path_opts, *, expected_retcode
         oldest_mtime = min(
             os.stat(path).st_mtime for path, _ in input_path_opts if path)
 
+        cmd = self._ffmpeg_command(input_path_opts, output_path_opts)
+        self.write_debug(f'ffmpeg command line: {shell_quote(cmd)}')
+        _, stderr, returncode = Popen.run(
+            cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
+        if returncode not in variadic(expected_retcodes):
+            self.write_debug(stderr)
+            raise FFmpegPostProcessorError(stderr.strip().splitlines()[-1])
+        for out_path, _ in output_path_opts:
+            if out_path:
+                self.try_utime(out_path, oldest_mtime, oldest_mtime)
+        return stderr
+
+    def _ffmpeg_command(self, input_path_opts, output_path_opts):
+        """Build the command line of run_ffmpeg_multiple_files"""
         cmd = [self.executable, encodeArgument('-y')]
         # avconv does not have repeat option
         if self.basename == 'ffmpeg':
@@ -351,17 +368,7 @@ def make_args(file, args, name, number):
             cmd += itertools.chain.from_iterable(
                 make_args(path, list(opts), arg_type, i + 1)
                 for i, (path, opts) in enumerate(path_opts) if path)
-
-        self.write_debug(f'ffmpeg command line: {shell_quote(cmd)}')
-        _, stderr, returncode = Popen.run(
-            cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
-        if returncode not in variadic(expected_retcodes):
-            self.write_debug(stderr)
-            raise FFmpegPostProcessorError(stderr.strip().splitlines()[-1])
-        for out_path, _ in output_path_opts:
-            if out_path:
-                self.try_utime(out_path, oldest_mtime, oldest_mtime)
-        return stderr
+        return cmd
 
     def run_ffmpeg(self, path, out_path, opts, **kwargs):
         return self.run_ffmpeg_multiple_files([path], out_path, opts, **kwargs)
@@ -813,10 +820,10 @@ def _get_infojson_opts(self, info, infofn):
 class FFmpegMergerPP(FFmpegPostProcessor):
     SUPPORTED_EXTS = MEDIA_EXTENSIONS.common_video
 
-    @PostProcessor._restrict_to(images=False)
-    def run(self, info):
-        filename = info['filepath']
-        temp_filename = prepend_extension(filename, 'temp')
+    # Interval at which the pipes are emptied once ffmpeg is stopped
+    _DRAIN_INTERVAL = 0.1
+
+    def _merge_args(self, info):
         args = ['-c', 'copy']
         audio_streams = 0
         for (i, fmt) in enumerate(info['requested_formats']):
@@ -828,11 +835,106 @@ def run(self, info):
                 audio_streams += 1
             if fmt.get('vcodec') != 'none':
                 args.extend(['-map', f'{i}:v:0'])
+        return args
+
+    @PostProcessor._restrict_to(images=False)
+    def run(self, info):
+        filename = info['filepath']
+        temp_filename = prepend_extension(filename, 'temp')
+        args = self._merge_args(info)
         self.to_screen(f'Merging formats into "{filename}"')
         self.run_ffmpeg_multiple_files(info['__files_to_merge'], temp_filename, args)
         os.rename(temp_filename, filename)
         return info['__files_to_merge'], info
 
+    def stream_merge(self, info, filename, download):
+        """
+        Merge the formats into filename while they are being downloaded
+
+        A named pipe is created at the 'filepath' of each format, which `download(stopped)` must
+        write the format into; it returns whether all the downloads succeeded. ffmpeg opens the pipes
+        itself, waiting for the downloads that open them late, but can't seek in them: the formats
+        must not need the aac_adtstoasc fixup or an index at the end. The threading.Event `stopped`
+        is set if ffmpeg fails before the downloads are over, and must be set by `download` when one
+        of them fails. ffmpeg is then killed and the pipes are drained, so that the downloads are never blocked
+        """
+        self.check_version()
+        temp_filename = prepend_extension(filename, 'temp')
+        fifos = []
+        stopped, returned, exited_early = threading.Event(), threading.Event(), threading.Event()
+        stderr = []
+        success, error = False, None
+
+        def wait(proc):
+            stderr.append(proc.communicate_or_kill()[1])
+            # ffmpeg exits successfully once all the pipes are closed, which may be before the downloads return
+            if proc.returncode and not stopped.is_set():
+                exited_early.set()
+                stopped.set()
+
+        def drain(proc):
+            stopped.wait()
+            if returned.is_set():
+                return
+            proc.kill()
+            # Opening the reading ends also releases the downloads that wait for ffmpeg to open their pipe
+            read_fds = [os.open(fifo, os.O_RDONLY | os.O_NONBLOCK) for fifo in fifos]
+            try:
+                while not returned.is_set():
+                    readable, _, _ = select.select(read_fds, [], [], self._DRAIN_INTERVAL)
+                    # A pipe that has no writer is always readable
+                    if not sum(len(os.read(fd, 1 << 16)) for fd in readable):
+                        time.sleep(self._DRAIN_INTERVAL)
+            finally:
+                for fd in read_fds:
+                    os.close(fd)
+
+        try:
+            for fmt in info['requested_formats']:
+                os.mkfifo(fmt['filepath'])
+                fifos.append(fmt['filepath'])
+
+            cmd = self._ffmpeg_command([(fifo, []) for fifo in fifos], [(temp_filename, self._merge_args(info))])
+            self.write_debug(f'ffmpeg command line: {shell_quote(cmd)}')
+            self.to_screen(f'Merging formats into "{filename}" while downloading')
+            proc = Popen(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
+            waiter, drainer = (threading.Thread(target=target, args=(proc,), daemon=True) for target in (wait, drain))
+            waiter.start()
+            drainer.start()
+            try:
+                success = download(stopped)
+            except BaseException as e:
+                error = e
+            returned.set()
+            stopped.set()
+            if not success:
+                # ffmpeg may be waiting for a pipe that a failed download never opened
+                proc.kill()
+            drainer.join()
+            while waiter.is_alive():
+                waiter.join(self._DRAIN_INTERVAL)
+                # or for a pipe that the download did not need to write into
+                for fifo in fifos:
+                    with contextlib.suppress(OSError):
+                        os.close(os.open(fifo, os.O_WRONLY | os.O_NONBLOCK))
+        finally:
+            for fifo in fifos:
+                os.remove(fifo)
+
+        if proc.returncode and (success or exited_early.is_set()):
+            self.write_debug(stderr[0])
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_filename)
+            raise FFmpegPostProcessorError(stderr[0].strip().splitlines()[-1]) from error
+        elif not success:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_filename)
+            if error:
+                raise error
+            return False
+        os.replace(temp_filename, filename)
+        return True
+
     def can_merge(self):
         # TODO: figure out merge-capable ffmpeg version
         return True
@@ -26,6 +26,7 @@
 import operator
 import os
 import platform
+import queue
 import random
 import re
 import shlex
@@ -35,6 +36,7 @@
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
 import types
@@ -52,7 +54,6 @@
     compat_expanduser,
     compat_HTMLParseError,
 )
-from ..dependencies import xattr
 from ..globals import IN_CLI, WINDOWS_VT_MODE
 
 __name__ = __name__.rsplit('.', 1)[0]  # noqa: A001 # Pretend to be the parent module
@@ -2404,9 +2405,55 @@ def _getslice(self, start, end):
             yield from page_results
 
 
+def read_ahead(iterable, size=1):
+    """
+    Yield the items of the iterable, while a background thread produces up to `size` items ahead
+
+    An exception raised by the iterable is raised when its turn comes. Once this generator
+    is closed, eg. by breaking out of a loop over it, the thread finishes the item it is
+    producing and closes the iterable, without waiting for it
+    """
+    items = queue.Queue(size)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            with contextlib.suppress(queue.Full):
+                items.put(item, timeout=0.1)
+                return True
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((None, e))
+        else:
+            put((NO_DEFAULT, None))
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+
+    threading.Thread(target=produce, name='read-ahead', daemon=True).start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            elif item is NO_DEFAULT:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
 class PlaylistEntries:
     MissingEntry = object()
     is_exhausted = False
+    reached_known_entry = False
 
     def __init__(self, ydl, info_dict):
         self.ydl = ydl
@@ -2450,7 +2497,8 @@ def parse_playlist_items(cls, string):
                 raise ValueError(f'Step in {segment!r} cannot be zero')
             yield slice(int_or_none(start), float_or_none(end), int_or_none(step)) if has_range else int(start)
 
-    def get_requested_items(self):
+    def get_requested_items(self, stop_at=()):
+        """Yield the requested (index, entry), until an entry whose ID is in stop_at"""
         playlist_items = self.ydl.params.get('playlist_items')
         playlist_start = self.ydl.params.get('playliststart', 1)
         playlist_end = self.ydl.params.get('playlistend')
@@ -2464,6 +2512,9 @@ def get_requested_items(self):
 
         for index in self.parse_playlist_items(playlist_items):
             for i, entry in self[index]:
+                if entry and stop_at and entry.get('id') in stop_at:
+                    self.reached_known_entry = True
+                    return
                 yield i, entry
                 if not entry:
                     continue
@@ -4524,6 +4575,8 @@ def write_xattr(path, key, value):
 
     # UNIX Method 1. Use os.setxattr/xattrs/pyxattrs modules
 
+    from ..dependencies import xattr
+
     setxattr = None
     if callable(getattr(os, 'setxattr', None)):
         setxattr = os.setxattr
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import bisect
+import functools
 import threading
 import time
 
@@ -93,6 +94,48 @@ def _update(self, size: int):
             self.eta.reset()
 
 
+class CombinedProgress:
+    """Merges the progress of downloads running side by side into a single status dict"""
+
+    def __init__(self, count: int, report):
+        self._statuses: list[dict] = [{} for _ in range(count)]
+        self._report = report
+        self._start_time = time.time()
+        self._lock = threading.Lock()
+
+    def hook(self, index: int):
+        """Return the progress hook of the download at `index`"""
+        return functools.partial(self._update, index)
+
+    def _update(self, index: int, status: dict):
+        with self._lock:
+            self._statuses[index] = status
+            # Reported under the lock, so that the combined statuses are seen in order
+            self._report(self.combine(self._statuses, self._start_time))
+
+    @staticmethod
+    def combine(statuses: list[dict], start_time: float) -> dict:
+        finished = [s.get('status') == 'finished' for s in statuses]
+        downloaded = sum(
+            s.get('downloaded_bytes') or (s.get('total_bytes') if done else None) or 0
+            for s, done in zip(statuses, finished, strict=True))
+        totals = [s.get('total_bytes') for s in statuses]
+        estimates = [total or s.get('total_bytes_estimate') for s, total in zip(statuses, totals, strict=True)]
+        running = [s for s, done in zip(statuses, finished, strict=True) if not done]
+        speeds = [s['speed'] for s in running if s.get('speed') is not None]
+        etas = [s['eta'] for s in running if s.get('eta') is not None]
+        return {
+            'status': 'finished' if all(finished) else 'downloading',
+            'downloaded_bytes': downloaded,
+            'total_bytes': downloaded if all(finished) else sum(totals) if all(totals) else None,
+            'total_bytes_estimate': sum(estimates) if all(estimates) else None,
+            'speed': sum(speeds) if speeds else None,
+            # The downloads finish together with the slowest one
+            'eta': max(etas) if etas and len(etas) == len(running) else None,
+            'elapsed': time.time() - start_time,
+        }
+
+
 class SmoothValue:
     def __init__(self, initial: float | None, smoothing: float):
         self.value = self.smooth = self._initial = initial